@@ -3,42 +3,37 @@
 Simple script to check npm availability and help debug setup issues
 """
 
-import subprocess
 import sys
 import os
+from toolchain import probe_all
 
-def check_command(command, description):
-    """Check if a command is available"""
+def check_command(command, description, results=None):
+    """Check if a command is available; `results` are probes already run by probe_all"""
     print(f"🔍 Checking {description}...")
     
-    # Try different variations of the command
-    variations = [command, f"{command}.cmd", f"{command}.exe"]
+    info = (results or probe_all([command]))[command]
+    if info["found"]:
+        print(f"✅ {description} found: {info['version']}")
+        return True, info["path"]
     
-    for var in variations:
-        try:
-            result = subprocess.run([var, "--version"], 
-                                 capture_output=True, text=True, timeout=10)
-            if result.returncode == 0:
-                print(f"✅ {description} found: {result.stdout.strip()}")
-                return True, var
-        except (FileNotFoundError, subprocess.TimeoutExpired):
-            continue
-    
-    print(f"❌ {description} not found")
+    print(f"❌ {description} not found ({info['error']})")
     return False, None
 
 def main():
     print("🔧 npm Detection Debug Tool")
     print("=" * 40)
     
+    # Probe all three concurrently; --refresh ignores cached versions
+    results = probe_all(("node", "npm", "npx"), refresh="--refresh" in sys.argv[1:])
+    
     # Check Node.js
-    node_ok, node_cmd = check_command("node", "Node.js")
+    node_ok, node_cmd = check_command("node", "Node.js", results)
     
     # Check npm
-    npm_ok, npm_cmd = check_command("npm", "npm")
+    npm_ok, npm_cmd = check_command("npm", "npm", results)
     
     # Check npx
-    npx_ok, npx_cmd = check_command("npx", "npx")
+    npx_ok, npx_cmd = check_command("npx", "npx", results)
     
     print("\n📋 Summary:")
     print(f"Node.js: {'✅ Available' if node_ok else '❌ Not found'}")
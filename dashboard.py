@@ -2,13 +2,27 @@ import streamlit as st
 import json
 import os
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime
+from collections import deque
 import subprocess
 import glob
+import sys
 from pathlib import Path
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts"))
+from testcase_store import TestCaseStore, DEFAULT_STORE_PATH
+from job_manager import JobManager
+from results_db import ResultsDB, DEFAULT_DB_PATH as RESULTS_DB_PATH, parse_results, result_label
+from runner_core import timing_stats
+
+TESTCASE_STORE_PATH = os.getenv("QAGENIE_STORE", DEFAULT_STORE_PATH)
+# Written by both simple_runner.py and Playwright's JSON reporter; other
+# report/*.json files (selections, benchmarks) are not test results
+RESULTS_PATH = 'report/test-results.json'
+
 # Page configuration
 st.set_page_config(
     page_title="Test Automation Dashboard",
@@ -45,6 +59,151 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Cached loaders. Streamlit reruns the script on every interaction, so parsed
+# files are cached process-wide (shared by all sessions) and keyed by path,
+# mtime and size: an unchanged file is never re-read, a rewritten one is.
+
+def file_signature(path):
+    """(mtime_ns, size) of a file, or None if it does not exist"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _load_json(path, signature):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def load_json_cached(path):
+    """Parsed JSON file, re-read only when its mtime or size changes"""
+    signature = file_signature(path)
+    if signature is None:
+        return None
+    return _load_json(path, signature)
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _glob(pattern, directory_signature):
+    return glob.glob(pattern)
+
+def latest_file(pattern):
+    """Newest file matching pattern; the listing is cached until its directory changes"""
+    directory = os.path.dirname(pattern) or "."
+    files = _glob(pattern, file_signature(directory))
+    signatures = [(file_signature(path), path) for path in files]
+    signatures = [(signature, path) for signature, path in signatures if signature is not None]
+    if not signatures:
+        return None
+    return max(signatures)[1]
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _store_cases(path, signature, limit):
+    with TestCaseStore(path) as store:
+        if store.latest_run_id() is None:
+            return None
+        return store.query(limit=limit)
+
+def load_store_cases(path, limit=None):
+    """Latest run's cases from the test case store, cached until the database changes"""
+    # WAL mode: commits land in the -wal file before they reach the main file
+    signature = (file_signature(path), file_signature(f"{path}-wal"))
+    if signature[0] is None:
+        return None
+    return _store_cases(path, signature, limit)
+
+# Chart sizing: charts get aggregates, never one mark per test
+TOP_N_SLOWEST = 20
+HISTOGRAM_BINS = 30
+MAX_SERIES_POINTS = 300
+TABLE_PAGE_SIZE = 100
+# Job output lines kept per session for the live log
+JOB_LOG_LINES = 200
+
+def summarize_tests(tests, top_n=TOP_N_SLOWEST, bins=HISTOGRAM_BINS):
+    """Status counts, duration histogram, percentiles and top-N slowest tests"""
+    df = pd.DataFrame(tests, columns=['name', 'status', 'duration_ms'])
+    durations = pd.to_numeric(df['duration_ms'], errors='coerce').fillna(0)
+    if len(durations):
+        counts, edges = np.histogram(durations, bins=max(1, min(bins, durations.nunique())))
+        percentiles = {f"p{int(q * 100)}": float(v) for q, v in durations.quantile([0.5, 0.9, 0.95, 0.99]).items()}
+    else:
+        counts, edges, percentiles = np.array([]), np.array([0.0]), {}
+    slowest = df.assign(duration_ms=durations).nlargest(top_n, 'duration_ms')
+    # Per-test iteration statistics recorded by the Python runner
+    timed = [dict(name=test['name'], **test['timing']) for test in tests if test.get('timing')]
+    timed.sort(key=lambda row: row.get('p95', 0), reverse=True)
+    return {
+        "total": len(df),
+        "status_counts": df['status'].astype(str).str.upper().value_counts().to_dict(),
+        "histogram": {
+            "centers": ((edges[:-1] + edges[1:]) / 2).tolist(),
+            "counts": counts.tolist(),
+            "width": float(edges[1] - edges[0]) if len(edges) > 1 else 1.0,
+        },
+        "percentiles": percentiles,
+        "slowest": slowest[['name', 'status', 'duration_ms']].to_dict('records'),
+        "timing": timed[:top_n],
+    }
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _summarize_results_file(path, signature):
+    return summarize_tests(parse_results(_load_json(path, signature)))
+
+def load_results_summary(path, data):
+    """Aggregated results, cached per file version; falls back to the in-memory data"""
+    signature = file_signature(path)
+    if signature is None:
+        return summarize_tests(parse_results(data))
+    return _summarize_results_file(path, signature)
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _run_series(path, signature, max_points):
+    with ResultsDB(path) as db:
+        return db.run_series(max_points)
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _regressions(path, signature):
+    with ResultsDB(path) as db:
+        return db.regressions()
+
+def load_regressions(path=None):
+    """Duration regressions of the latest run, cached until the database changes"""
+    path = path or os.getenv("QAGENIE_RESULTS_DB", RESULTS_DB_PATH)
+    signature = (file_signature(path), file_signature(f"{path}-wal"))
+    if signature[0] is None:
+        return []
+    return _regressions(path, signature)
+
+def load_run_series(path=None, max_points=MAX_SERIES_POINTS):
+    """Downsampled pass rate / duration history, cached until the database changes"""
+    path = path or os.getenv("QAGENIE_RESULTS_DB", RESULTS_DB_PATH)
+    signature = (file_signature(path), file_signature(f"{path}-wal"))
+    if signature[0] is None:
+        return []
+    return _run_series(path, signature, max_points)
+
+def paginated_dataframe(df, key, page_size=TABLE_PAGE_SIZE):
+    """Render one page of a large table instead of sending every row to the browser"""
+    pages = max(1, -(-len(df) // page_size))
+    page = 1
+    if pages > 1:
+        page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, key=key)
+    start = (page - 1) * page_size
+    st.dataframe(df.iloc[start:start + page_size], use_container_width=True)
+    st.caption(f"Rows {start + 1}-{min(start + page_size, len(df))} of {len(df)}")
+
+@st.cache_resource
+def get_job_manager():
+    """One job manager per server process, shared by every session"""
+    return JobManager()
+
+def ingest_playwright_results(job):
+    """Append a finished Playwright run's JSON report to the results history"""
+    if not job.cancelled and os.path.exists(RESULTS_PATH):
+        with ResultsDB() as db:
+            db.ingest_file(RESULTS_PATH)
+
 class QADashboard:
     def __init__(self):
         st.set_page_config(
@@ -119,16 +278,14 @@ class QADashboard:
             </div>
             """, unsafe_allow_html=True)
         
-        # Charts
+        # Charts are built from server-side aggregates, so their size does
+        # not grow with the number of tests
+        summary = load_results_summary(RESULTS_PATH, data)
         col1, col2 = st.columns(2)
         
         with col1:
             # Pie chart for test status
-            status_counts = {}
-            for test in data['tests']:
-                status = test['status']
-                status_counts[status] = status_counts.get(status, 0) + 1
-            
+            status_counts = summary['status_counts']
             fig_pie = px.pie(
                 values=list(status_counts.values()),
                 names=list(status_counts.keys()),
@@ -138,19 +295,69 @@ class QADashboard:
             st.plotly_chart(fig_pie, use_container_width=True)
         
         with col2:
-            # Bar chart for test duration
-            test_names = [test['name'] for test in data['tests']]
-            durations = [test.get('duration', 0) for test in data['tests']]
-            
+            # Duration histogram with percentile markers
+            histogram = summary['histogram']
+            fig_hist = go.Figure(go.Bar(
+                x=histogram['centers'],
+                y=histogram['counts'],
+                width=histogram['width'],
+                name="Tests"
+            ))
+            for name, value in summary['percentiles'].items():
+                fig_hist.add_vline(x=value, line_dash="dash", annotation_text=name)
+            fig_hist.update_layout(
+                title=f"Test Duration Distribution ({summary['total']} tests)",
+                xaxis_title="Duration (ms)",
+                yaxis_title="Tests"
+            )
+            st.plotly_chart(fig_hist, use_container_width=True)
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            # Top-N slowest tests
+            slowest = pd.DataFrame(summary['slowest'], columns=['name', 'status', 'duration_ms'])
             fig_bar = px.bar(
-                x=test_names,
-                y=durations,
-                title="Test Execution Duration (ms)",
-                labels={'x': 'Test Name', 'y': 'Duration (ms)'}
+                slowest.iloc[::-1],
+                x='duration_ms',
+                y='name',
+                orientation='h',
+                title=f"Top {len(slowest)} Slowest Tests (ms)",
+                labels={'duration_ms': 'Duration (ms)', 'name': 'Test Name'}
             )
-            fig_bar.update_xaxes(tickangle=45)
             st.plotly_chart(fig_bar, use_container_width=True)
         
+        with col2:
+            # Pass rate over runs, downsampled with a min/max band
+            series = load_run_series()
+            if series:
+                runs = [point['last_run'] for point in series]
+                fig_trend = go.Figure([
+                    go.Scatter(x=runs, y=[point['max_pass_rate'] for point in series],
+                               line=dict(width=0), showlegend=False, hoverinfo='skip'),
+                    go.Scatter(x=runs, y=[point['min_pass_rate'] for point in series],
+                               line=dict(width=0), fill='tonexty', fillcolor='rgba(40,167,69,0.2)',
+                               name="Min/max"),
+                    go.Scatter(x=runs, y=[point['pass_rate'] for point in series],
+                               line=dict(color='#28a745'), name="Pass rate"),
+                ])
+                fig_trend.update_layout(title="Pass Rate by Run (%)", xaxis_title="Run", yaxis_title="Pass rate (%)")
+                st.plotly_chart(fig_trend, use_container_width=True)
+            else:
+                st.info("No run history yet. Ingest results with `python results_db.py ingest`.")
+        
+        # Iteration statistics and statistically significant slowdowns
+        if summary['timing']:
+            st.subheader("⏱️ Timing Statistics (ms, slowest p95 first)")
+            timing = pd.DataFrame(summary['timing'])
+            st.dataframe(timing.set_index('name'), use_container_width=True)
+        for regression in load_regressions():
+            st.warning(
+                f"📈 {result_label(regression)}: {regression['duration_ms']} ms vs "
+                f"{regression['baseline_ms']} ± {regression['baseline_stdev_ms']} ms "
+                f"({regression['change']:+.0%}, z={regression['z']})"
+            )
+        
         # Recent activity
         st.subheader("🕒 Recent Activity")
         if 'timestamp' in data:
@@ -199,10 +406,10 @@ class QADashboard:
         
         # Display latest test cases
         st.subheader("Latest Generated Test Cases")
-        test_cases = self.get_latest_test_cases()
+        test_cases = self.get_latest_test_cases(limit=5)
         
         if test_cases:
-            for tc in test_cases[:5]:  # Show first 5
+            for tc in test_cases:
                 with st.expander(f"{tc['id']}: {tc['title']}"):
                     st.write(f"**Category:** {tc.get('category', 'Unknown')}")
                     st.write(f"**Priority:** {tc.get('priority', 'Unknown')}")
@@ -242,52 +449,101 @@ class QADashboard:
             retries = st.slider("Retry failed tests", 0, 3, 1)
             timeout = st.number_input("Timeout (seconds)", 30, 300, 60)
         
-        # Execute tests
-        if st.button("▶️ Execute Tests", type="primary"):
-            with st.spinner("Executing tests..."):
-                try:
-                    cmd = ["npx", "playwright", "test"]
-                    
-                    if headed:
-                        cmd.append("--headed")
-                    
-                    if parallel:
-                        cmd.append("--workers=4")
-                    
-                    cmd.extend(["--retries", str(retries)])
-                    cmd.extend(["--timeout", str(timeout * 1000)])
-                    
-                    result = subprocess.run(cmd, capture_output=True, text=True)
-                    
-                    if result.returncode == 0:
-                        st.success("✅ Tests executed successfully!")
-                        st.code(result.stdout)
-                    else:
-                        st.warning("⚠️ Some tests failed")
-                        st.code(result.stdout)
-                        st.code(result.stderr)
-                        
-                except Exception as e:
-                    st.error(f"Error: {str(e)}")
+        # Execute tests in the background; every viewer follows the same run
+        manager = get_job_manager()
+        job = manager.get("playwright")
+        running = job is not None and job.running
+        
+        if st.button("▶️ Execute Tests", type="primary", disabled=running):
+            cmd = ["npx", "playwright", "test"]
+            
+            if headed:
+                cmd.append("--headed")
+            
+            if parallel:
+                cmd.append("--workers=4")
+            
+            cmd.extend(["--retries", str(retries)])
+            cmd.extend(["--timeout", str(timeout * 1000)])
+            
+            try:
+                job, started = manager.start("playwright", cmd, on_exit=ingest_playwright_results)
+                if not started:
+                    st.info("A test run is already in progress - showing its output")
+            except Exception as e:
+                st.error(f"Error: {str(e)}")
+        
+        if manager.get("playwright") is not None:
+            self.show_job_output("playwright")
         
         # Show recent test results
         st.subheader("Recent Test Results")
         test_results = self.get_test_results()
         
         if test_results:
-            df = pd.DataFrame(test_results)
-            st.dataframe(df)
+            # Flatten per-iteration statistics into timing.p50, timing.p95, ... columns
+            df = pd.json_normalize(test_results)
+            paginated_dataframe(df, key="results_page")
             
-            # Success rate chart
+            # Success rate chart from aggregated counts
+            status_counts = df['status'].astype(str).value_counts()
             fig = px.pie(
-                df, 
-                names='status', 
+                values=status_counts.values,
+                names=status_counts.index,
                 title='Test Results Distribution'
             )
             st.plotly_chart(fig)
         else:
             st.info("No test results available")
     
+    def show_job_output(self, key):
+        """Status and output of a background job, polled only while it runs"""
+        job = get_job_manager().get(key)
+        if job is None:
+            return
+        if job.running:
+            self._live_job_output(key)
+        else:
+            self._render_job(job, key)
+
+    @st.fragment(run_every=1.0)
+    def _live_job_output(self, key):
+        job = get_job_manager().get(key)
+        if job is None or not job.running:
+            # A full rerun renders the final state outside this fragment, which stops the timer
+            st.rerun()
+        self._render_job(job, key)
+
+    def _render_job(self, job, key):
+        """Status line, cancel button and output tail of a job"""
+        col1, col2 = st.columns([4, 1])
+        with col1:
+            label = f"`{' '.join(job.cmd)}` — {job.status} ({job.elapsed:.0f}s)"
+            if job.running:
+                st.info(f"⏳ {label}")
+            elif job.status == "succeeded":
+                st.success(f"✅ {label}")
+            elif job.status == "cancelled":
+                st.warning(f"⏹️ {label}")
+            else:
+                st.warning(f"⚠️ {label}, exit code {job.returncode}")
+        with col2:
+            if job.running and st.button("⏹️ Cancel", key=f"cancel_{key}"):
+                job.cancel()
+        
+        lines = self._job_log(job, key)
+        st.code("\n".join(lines) or "Waiting for output...", language="text")
+
+    def _job_log(self, job, key):
+        """Last output lines of a job, fetching only the lines added since the previous rerun"""
+        log = st.session_state.get(f"job_log_{key}")
+        if log is None or log["started_at"] != job.started_at:
+            log = {"started_at": job.started_at, "since": 0, "lines": deque(maxlen=JOB_LOG_LINES)}
+            st.session_state[f"job_log_{key}"] = log
+        new_lines, log["since"] = job.read(log["since"])
+        log["lines"].extend(line for _, line in new_lines)
+        return log["lines"]
+
     def show_reports(self):
         st.header("📄 Reports")
         
@@ -295,7 +551,7 @@ class QADashboard:
         reports = [
             {"name": "HTML Test Report", "file": "test_report.html", "type": "HTML"},
             {"name": "Success Report", "file": "SUCCESS_REPORT.md", "type": "Markdown"},
-            {"name": "Test Results JSON", "file": "report/test-results.json", "type": "JSON"}
+            {"name": "Test Results JSON", "file": RESULTS_PATH, "type": "JSON"}
         ]
         
         for report in reports:
@@ -350,12 +606,12 @@ class QADashboard:
     def load_test_results(self):
         """Load test results from JSON file"""
         try:
-            if os.path.exists('report/test-results.json'):
-                with open('report/test-results.json', 'r', encoding='utf-8') as f:
-                    return json.load(f)
+            data = load_json_cached(RESULTS_PATH)
+            if data is not None:
+                return data
             else:
                 # Create sample data if no results exist
-                return {
+                sample = {
                     "summary": {
                         "total": 10,
                         "passed": 10,
@@ -376,33 +632,42 @@ class QADashboard:
                     ],
                     "timestamp": datetime.now().isoformat()
                 }
+                for test in sample["tests"]:
+                    test["timing"] = timing_stats([test["duration"] * 1_000_000])
+                return sample
         except Exception as e:
             st.error(f"Error loading test results: {e}")
             return None
     
-    def get_latest_test_cases(self):
+    def get_latest_test_cases(self, limit=None):
+        # Prefer the indexed store: reads only the requested cases of the latest run
+        try:
+            cases = load_store_cases(TESTCASE_STORE_PATH, limit)
+            if cases is not None:
+                return cases
+        except Exception:
+            pass
         try:
-            testcase_files = glob.glob("testcases/*.json")
-            if not testcase_files:
+            path = latest_file("testcases/testcases_*.json")
+            if path is None:
                 return []
-            
-            latest_file = max(testcase_files, key=os.path.getctime)
-            with open(latest_file, 'r') as f:
-                data = json.load(f)
-                return data.get('test_cases', [])
+            return load_json_cached(path).get('test_cases', [])[:limit]
         except:
             return []
     
     def get_test_results(self):
         try:
-            report_files = glob.glob("report/*.json")
-            if not report_files:
+            data = load_json_cached(RESULTS_PATH)
+            if data is None:
                 return []
-            
-            latest_report = max(report_files, key=os.path.getctime)
-            with open(latest_report, 'r') as f:
-                data = json.load(f)
-                return data.get('tests', [])
+            if 'tests' in data:
+                return data['tests']
+            # Playwright reporter output: one row per spec and project
+            return [
+                {"name": result_label(test), "status": test['status'], "duration": test['duration_ms'],
+                 "error": test['error']}
+                for test in parse_results(data)
+            ]
         except:
             return []
     
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Background Job Manager
+Runs long commands (e.g. Playwright) off the request thread and streams their output
+"""
+
+import os
+import re
+import sys
+import signal
+import threading
+import subprocess
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+MAX_LINES = 5000
+CANCEL_GRACE_SECONDS = 5.0
+_ANSI = re.compile(r"\x1b\[[0-9;?]*[A-Za-z]")
+
+
+class Job:
+    """One running or finished command with its captured output.
+
+    Two reader threads append stdout and stderr lines as they arrive; any
+    number of viewers poll ``read(since)`` for lines they have not seen
+    yet. Only the last MAX_LINES lines are kept in memory.
+    """
+
+    def __init__(self, key: str, cmd: List[str], cwd: Optional[str] = None,
+                 env: Optional[Dict[str, str]] = None,
+                 on_exit: Optional[Callable[["Job"], None]] = None):
+        self.key = key
+        self.cmd = cmd
+        self.started_at = datetime.now()
+        self.ended_at: Optional[datetime] = None
+        self.returncode: Optional[int] = None
+        self.cancelled = False
+        self._lines: List[Tuple[str, str]] = []
+        self._dropped = 0
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._on_exit = on_exit
+
+        popen_options = {}
+        if os.name == "nt":
+            popen_options["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP
+        else:
+            # Own process group, so cancel reaches the browsers npx spawns too
+            popen_options["start_new_session"] = True
+        self.process = subprocess.Popen(
+            cmd, cwd=cwd, env={**os.environ, "FORCE_COLOR": "0", **(env or {})},
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            text=True, encoding="utf-8", errors="replace", bufsize=1,
+            shell=os.name == "nt",  # npx is a .cmd shim on Windows
+            **popen_options,
+        )
+        self._readers = [
+            threading.Thread(target=self._pump, args=(self.process.stdout, "stdout"), daemon=True),
+            threading.Thread(target=self._pump, args=(self.process.stderr, "stderr"), daemon=True),
+        ]
+        for reader in self._readers:
+            reader.start()
+        threading.Thread(target=self._wait, daemon=True).start()
+
+    def _pump(self, stream, name: str):
+        for line in iter(stream.readline, ""):
+            with self._lock:
+                self._lines.append((name, _ANSI.sub("", line.rstrip("\n"))))
+                overflow = len(self._lines) - MAX_LINES
+                if overflow > 0:
+                    del self._lines[:overflow]
+                    self._dropped += overflow
+        stream.close()
+
+    def _wait(self):
+        returncode = self.process.wait()
+        for reader in self._readers:
+            reader.join()
+        self.returncode = returncode
+        self.ended_at = datetime.now()
+        if self._on_exit is not None:
+            try:
+                self._on_exit(self)
+            except Exception as e:
+                with self._lock:
+                    self._lines.append(("stderr", f"on_exit hook failed: {e}"))
+        self._done.set()
+
+    @property
+    def running(self) -> bool:
+        return not self._done.is_set()
+
+    @property
+    def status(self) -> str:
+        if self.running:
+            return "cancelling" if self.cancelled else "running"
+        if self.cancelled:
+            return "cancelled"
+        return "succeeded" if self.returncode == 0 else "failed"
+
+    @property
+    def elapsed(self) -> float:
+        end = self.ended_at or datetime.now()
+        return (end - self.started_at).total_seconds()
+
+    def read(self, since: int = 0) -> Tuple[List[Tuple[str, str]], int]:
+        """Lines after position `since` and the position to pass next time"""
+        with self._lock:
+            total = self._dropped + len(self._lines)
+            start = max(since, self._dropped) - self._dropped
+            return self._lines[start:], total
+
+    def tail(self, count: int = 200) -> List[Tuple[str, str]]:
+        with self._lock:
+            return self._lines[-count:]
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout)
+
+    def cancel(self):
+        """Terminate the whole process group, killing it if it ignores SIGTERM"""
+        if not self.running:
+            return
+        self.cancelled = True
+        try:
+            if os.name == "nt":
+                self.process.send_signal(signal.CTRL_BREAK_EVENT)
+            else:
+                os.killpg(self.process.pid, signal.SIGTERM)
+        except (ProcessLookupError, OSError):
+            return
+
+        def escalate():
+            if not self._done.wait(CANCEL_GRACE_SECONDS) and self.process.poll() is None:
+                try:
+                    if os.name == "nt":
+                        self.process.kill()
+                    else:
+                        os.killpg(self.process.pid, signal.SIGKILL)
+                except (ProcessLookupError, OSError):
+                    pass
+
+        threading.Thread(target=escalate, daemon=True).start()
+
+
+class JobManager:
+    """Process-wide registry of jobs keyed by purpose (e.g. "playwright").
+
+    Starting a job whose key is already running returns the running job
+    instead of launching a second copy, so every viewer follows one run.
+    """
+
+    def __init__(self):
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def start(self, key: str, cmd: List[str], **options) -> Tuple[Job, bool]:
+        """Return (job, started); started is False if the key was already running"""
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and job.running:
+                return job, False
+            job = Job(key, cmd, **options)
+            self._jobs[key] = job
+            return job, True
+
+    def get(self, key: str) -> Optional[Job]:
+        """Running or most recent job for a key"""
+        with self._lock:
+            return self._jobs.get(key)
+
+    def cancel(self, key: str) -> bool:
+        job = self.get(key)
+        if job is None or not job.running:
+            return False
+        job.cancel()
+        return True
+
+
+if __name__ == "__main__":
+    # Run a command through the manager and echo its output, e.g. for debugging
+    manager = JobManager()
+    job, _ = manager.start("cli", sys.argv[1:] or [sys.executable, "--version"])
+    position = 0
+    try:
+        while True:
+            finished = job.wait(0.2)
+            lines, position = job.read(position)
+            for stream, line in lines:
+                print(line, file=sys.stderr if stream == "stderr" else sys.stdout)
+            if finished:
+                break
+    except KeyboardInterrupt:
+        job.cancel()
+        job.wait()
+    print(f"Job {job.status} in {job.elapsed:.1f}s (exit code {job.returncode})")
+    sys.exit(job.returncode or 0)
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Pipeline Orchestrator
+Runs stages as a dependency graph, skipping stages whose inputs are unchanged
+"""
+
+import os
+import sys
+import glob
+import json
+import time
+import hashlib
+import threading
+from datetime import datetime
+from dataclasses import dataclass, field
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_STATE_PATH = ".qagenie_cache/pipeline.json"
+STATE_VERSION = 1
+HASH_CHUNK_SIZE = 1 << 20
+
+
+@dataclass
+class Stage:
+    """One pipeline step.
+
+    ``inputs`` and ``outputs`` are file paths or glob patterns. A stage is
+    up to date when the content hash of its inputs (plus ``salt``, e.g. the
+    command it runs) matches its last successful run and every output
+    pattern still matches a file. ``after`` names the stages that must
+    finish first; a failed ``optional`` stage does not block them.
+    """
+    name: str
+    action: Callable[[], bool]
+    inputs: Sequence[str] = ()
+    outputs: Sequence[str] = ()
+    after: Sequence[str] = ()
+    salt: str = ""
+    always: bool = False
+    optional: bool = False
+
+
+@dataclass
+class StageResult:
+    name: str
+    status: str  # ran, up-to-date, failed, blocked
+    duration_s: float = 0.0
+    error: Optional[str] = None
+    changed: List[str] = field(default_factory=list)
+
+
+class PrefixedOutput:
+    """sys.stdout stand-in that keeps concurrent stages' output apart.
+
+    Text written from a stage's thread is emitted a whole line at a time,
+    prefixed with the stage name; other threads write straight through.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def begin(self, name: str):
+        self._local.prefix = f"[{name}] "
+        self._local.pending = ""
+
+    def end(self):
+        if getattr(self._local, "prefix", None) is not None and self._local.pending:
+            self.write("\n")
+        self._local.prefix = None
+
+    def write(self, text: str) -> int:
+        prefix = getattr(self._local, "prefix", None)
+        if prefix is None:
+            with self._lock:
+                return self.stream.write(text)
+        *lines, self._local.pending = (self._local.pending + text).split("\n")
+        if lines:
+            with self._lock:
+                self.stream.write("".join(f"{prefix}{line}\n" if line.strip() else "\n" for line in lines))
+                self.stream.flush()
+        return len(text)
+
+    def flush(self):
+        with self._lock:
+            self.stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+class Pipeline:
+    """Dependency graph of stages executed on a thread pool.
+
+    Stages are started as soon as everything they come after has finished,
+    so independent stages overlap; while they do, each line they print is
+    prefixed with the stage name. Input fingerprints are computed when a
+    stage becomes ready, after its upstream stages wrote their outputs, so
+    an upstream rerun that produced identical files does not cascade.
+    File hashes are cached by (mtime, size), so a no-change rerun stats
+    files instead of reading them.
+    """
+
+    def __init__(self, stages: Sequence[Stage], state_path: str = DEFAULT_STATE_PATH,
+                 max_workers: Optional[int] = None):
+        self.stages = {stage.name: stage for stage in stages}
+        if len(self.stages) != len(stages):
+            raise ValueError("Stage names must be unique")
+        self.order = self._topological_order()
+        self.state_path = state_path
+        self.max_workers = max_workers or min(8, len(stages)) or 1
+        self.state = self._load_state()
+        self._lock = threading.Lock()
+        self._output: Optional[PrefixedOutput] = None
+
+    def _topological_order(self) -> List[str]:
+        """Stage names in dependency order; raises ValueError on unknown names or cycles"""
+        for stage in self.stages.values():
+            unknown = [name for name in stage.after if name not in self.stages]
+            if unknown:
+                raise ValueError(f"Stage '{stage.name}' depends on unknown stage(s): {', '.join(unknown)}")
+        pending = {name: set(stage.after) for name, stage in self.stages.items()}
+        order = []
+        while pending:
+            ready = [name for name, deps in pending.items() if not deps]
+            if not ready:
+                raise ValueError(f"Dependency cycle between stages: {', '.join(sorted(pending))}")
+            for name in ready:
+                order.append(name)
+                del pending[name]
+            for deps in pending.values():
+                deps.difference_update(ready)
+        return order
+
+    def _load_state(self) -> Dict[str, Any]:
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            if state.get("version") == STATE_VERSION:
+                return state
+        except (OSError, json.JSONDecodeError):
+            pass
+        return {"version": STATE_VERSION, "stages": {}, "files": {}}
+
+    def _save_state(self):
+        """Write the state atomically, dropping cached hashes no stage refers to any more"""
+        referenced = {path for entry in self.state["stages"].values() for path in entry.get("inputs", {})}
+        self.state["files"] = {path: value for path, value in self.state["files"].items() if path in referenced}
+        os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def file_hash(self, path: str) -> Optional[str]:
+        """sha256 of a file, reusing the cached digest while mtime and size are unchanged"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        cached = self.state["files"].get(path)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        with self._lock:
+            self.state["files"][path] = [stat.st_mtime_ns, stat.st_size, digest.hexdigest()]
+        return digest.hexdigest()
+
+    @staticmethod
+    def expand(patterns: Sequence[str]) -> List[str]:
+        """Files matched by paths or glob patterns, sorted and de-duplicated"""
+        paths = set()
+        for pattern in patterns:
+            paths.update(path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path))
+        return sorted(path.replace(os.sep, "/") for path in paths)
+
+    def fingerprint(self, stage: Stage) -> Tuple[str, Dict[str, Optional[str]]]:
+        """Combined hash of a stage's salt and input files, plus the per-file hashes"""
+        files = {path: self.file_hash(path) for path in self.expand(stage.inputs)}
+        digest = hashlib.sha256(stage.salt.encode("utf-8"))
+        for path, file_digest in files.items():
+            digest.update(f"\0{path}\0{file_digest}".encode("utf-8"))
+        return digest.hexdigest(), files
+
+    def _outputs_present(self, stage: Stage) -> bool:
+        return all(self.expand([pattern]) for pattern in stage.outputs)
+
+    def _run_stage(self, stage: Stage, force: bool) -> StageResult:
+        fingerprint, files = self.fingerprint(stage)
+        previous = self.state["stages"].get(stage.name)
+        if (not force and not stage.always and previous is not None
+                and previous.get("fingerprint") == fingerprint and self._outputs_present(stage)):
+            return StageResult(stage.name, "up-to-date")
+        old_files = (previous or {}).get("inputs", {})
+        changed = [] if previous is None else sorted(
+            path for path in set(files) | set(old_files) if files.get(path) != old_files.get(path)
+        )
+        start = time.perf_counter()
+        if self._output is not None:
+            self._output.begin(stage.name)
+        try:
+            ok = bool(stage.action())
+            error = None if ok else "stage reported failure"
+        except Exception as e:
+            ok, error = False, f"{type(e).__name__}: {e}"
+        finally:
+            if self._output is not None:
+                self._output.end()
+        duration = time.perf_counter() - start
+        with self._lock:
+            if ok:
+                self.state["stages"][stage.name] = {
+                    "fingerprint": fingerprint,
+                    "inputs": files,
+                    "finished_at": datetime.now().isoformat(),
+                    "duration_s": round(duration, 3),
+                }
+            else:
+                # Forget the stage so it runs again next time
+                self.state["stages"].pop(stage.name, None)
+        return StageResult(stage.name, "ran" if ok else "failed", duration, error, changed)
+
+    def run(self, force: bool = False, targets: Optional[Sequence[str]] = None) -> Dict[str, StageResult]:
+        """Run the graph (or just `targets` and what they depend on); returns results by stage name"""
+        selected = set(self.order)
+        if targets:
+            selected = set()
+            stack = list(targets)
+            while stack:
+                name = stack.pop()
+                if name not in self.stages:
+                    raise ValueError(f"Unknown stage: {name}")
+                if name not in selected:
+                    selected.add(name)
+                    stack.extend(self.stages[name].after)
+
+        results: Dict[str, StageResult] = {}
+        remaining = [name for name in self.order if name in selected]
+        running: Dict[Any, str] = {}
+
+        def blocked(name: str) -> bool:
+            return any(
+                results[dep].status in ("failed", "blocked") and not self.stages[dep].optional
+                for dep in self.stages[name].after if dep in results
+            )
+
+        real_stdout = sys.stdout
+        if self.max_workers > 1 and len(remaining) > 1:
+            self._output = sys.stdout = PrefixedOutput(real_stdout)
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                while remaining or running:
+                    for name in list(remaining):
+                        deps = [dep for dep in self.stages[name].after if dep in selected]
+                        if not all(dep in results for dep in deps):
+                            continue
+                        remaining.remove(name)
+                        if blocked(name):
+                            results[name] = StageResult(name, "blocked")
+                            continue
+                        running[pool.submit(self._run_stage, self.stages[name], force)] = name
+                    if not running:
+                        continue
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        result = future.result()
+                        results[running.pop(future)] = result
+        finally:
+            sys.stdout = real_stdout
+            self._output = None
+            self._save_state()
+        return {name: results[name] for name in self.order if name in results}
+
+
+STATUS_ICONS = {"ran": "✅", "up-to-date": "⏭️", "failed": "❌", "blocked": "🚫"}
+
+
+def print_summary(results: Dict[str, StageResult], elapsed: float):
+    """One line per stage plus the total wall time"""
+    print("\n📊 Pipeline summary")
+    print("-" * 50)
+    for result in results.values():
+        line = f"{STATUS_ICONS[result.status]} {result.name:<14} {result.status:<11}"
+        if result.status in ("ran", "failed"):
+            line += f" {result.duration_s:.2f}s"
+        if result.changed:
+            shown = ", ".join(result.changed[:3]) + (" ..." if len(result.changed) > 3 else "")
+            line += f"  (changed: {shown})"
+        if result.error:
+            line += f"  {result.error}"
+        print(line)
+    print(f"⏱️ Total: {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    # Show which recorded stages are up to date, without running anything
+    state_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_STATE_PATH
+    try:
+        with open(state_path, "r", encoding="utf-8") as f:
+            recorded = json.load(f).get("stages", {})
+    except (OSError, json.JSONDecodeError):
+        recorded = {}
+    if not recorded:
+        print(f"No pipeline state at {state_path}")
+    for name, entry in recorded.items():
+        print(f"{name:<14} last ran {entry['finished_at']} ({entry['duration_s']}s, {len(entry['inputs'])} inputs)")
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Dependency Preflight
+Checks that Python packages are installed without importing them
+"""
+
+import os
+import sys
+import json
+import site
+import hashlib
+import argparse
+import importlib.util
+from typing import Dict, List, Optional
+
+DEFAULT_CACHE_PATH = ".qagenie_cache/preflight.json"
+# Import name -> distribution name (they differ for some packages, e.g. yaml -> PyYAML)
+DASHBOARD_PACKAGES = {"streamlit": "streamlit", "plotly": "plotly", "pandas": "pandas"}
+
+
+def site_directories() -> List[str]:
+    """Directories packages get installed into for this interpreter"""
+    directories = list(site.getsitepackages()) if hasattr(site, "getsitepackages") else []
+    if site.ENABLE_USER_SITE:
+        directories.append(site.getusersitepackages())
+    directories.extend(path for path in sys.path if os.path.basename(path) in ("site-packages", "dist-packages"))
+    return sorted(set(path for path in directories if os.path.isdir(path)))
+
+
+def environment_key() -> str:
+    """Hash of the interpreter and the mtimes of its package directories.
+
+    Installing, upgrading or removing a package adds or renames entries in
+    a site-packages directory, which changes that directory's mtime.
+    """
+    parts = [sys.executable, sys.version]
+    for directory in site_directories():
+        parts.append(f"{directory}:{os.stat(directory).st_mtime_ns}")
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def probe(module: str, distribution: Optional[str] = None) -> Dict[str, Optional[str]]:
+    """Whether a module is importable and its installed version, without importing it"""
+    try:
+        installed = importlib.util.find_spec(module) is not None
+    except (ImportError, ValueError):
+        installed = False
+    version = None
+    if installed:
+        from importlib import metadata  # only needed on a cache miss
+        try:
+            version = metadata.version(distribution or module)
+        except metadata.PackageNotFoundError:
+            pass
+    return {"installed": installed, "version": version}
+
+
+def check_packages(packages: Dict[str, str] = DASHBOARD_PACKAGES, cache_path: str = DEFAULT_CACHE_PATH,
+                   refresh: bool = False) -> Dict[str, Dict[str, Optional[str]]]:
+    """Probe results per import name, cached until the interpreter or its packages change"""
+    key = environment_key()
+    cache: Dict[str, Dict] = {}
+    if not refresh:
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            cache = {}
+        if cache.get("key") != key:
+            cache = {}
+    results = cache.get("packages", {})
+    missing = {module: dist for module, dist in packages.items() if module not in results}
+    if not missing:
+        return {module: results[module] for module in packages}
+    results.update({module: probe(module, dist) for module, dist in missing.items()})
+    try:
+        os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+        tmp_path = f"{cache_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"key": key, "packages": results}, f, indent=2)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass  # A read-only checkout still gets correct, uncached results
+    return {module: results[module] for module in packages}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check Python packages are installed without importing them")
+    parser.add_argument("packages", nargs="*", help="import names, or import=distribution (default: dashboard packages)")
+    parser.add_argument("--refresh", action="store_true", help="ignore the cached results")
+    args = parser.parse_args(argv)
+
+    packages = dict(item.split("=", 1) if "=" in item else (item, item) for item in args.packages)
+    results = check_packages(packages or DASHBOARD_PACKAGES, refresh=args.refresh)
+    for module, result in results.items():
+        if result["installed"]:
+            print(f"✅ {module} {result['version'] or ''}".rstrip())
+        else:
+            print(f"❌ {module} - Missing")
+    return 0 if all(result["installed"] for result in results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,536 @@
+#!/usr/bin/env python3
+"""
+Test Results History
+Appends every run's per-test results to an indexed SQLite database
+"""
+
+import os
+import re
+import sys
+import json
+import sqlite3
+import hashlib
+import argparse
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+DEFAULT_DB_PATH = "report/results-history.db"
+DEFAULT_WINDOW = 50
+DEFAULT_REGRESSION_Z = 3.0
+DEFAULT_REGRESSION_CHANGE = 0.1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at TEXT NOT NULL,
+    source TEXT,
+    fingerprint TEXT UNIQUE,
+    total INTEGER NOT NULL,
+    passed INTEGER NOT NULL,
+    failed INTEGER NOT NULL,
+    duration_ms REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    test_key TEXT NOT NULL,
+    name TEXT NOT NULL,
+    status TEXT NOT NULL,
+    passed INTEGER NOT NULL,
+    duration_ms REAL,
+    error TEXT,
+    iterations INTEGER,
+    stdev_ms REAL,
+    p95_ms REAL,
+    project TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_results_test_run ON results(test_key, run_id);
+CREATE INDEX IF NOT EXISTS idx_results_run ON results(run_id);
+CREATE INDEX IF NOT EXISTS idx_runs_started ON runs(started_at);
+CREATE TABLE IF NOT EXISTS test_stats (
+    test_key TEXT NOT NULL,
+    project TEXT NOT NULL DEFAULT '',
+    name TEXT NOT NULL,
+    runs INTEGER NOT NULL,
+    passes INTEGER NOT NULL,
+    flips INTEGER NOT NULL,
+    last_passed INTEGER,
+    n_d INTEGER NOT NULL,
+    sum_d REAL NOT NULL,
+    sum_x REAL NOT NULL,
+    sum_xx REAL NOT NULL,
+    sum_xd REAL NOT NULL,
+    PRIMARY KEY (test_key, project)
+) WITHOUT ROWID;
+"""
+
+# Columns added after the first release; older databases get them on open
+_ADDED_RESULT_COLUMNS = {"iterations": "INTEGER", "stdev_ms": "REAL", "p95_ms": "REAL",
+                         "project": "TEXT NOT NULL DEFAULT ''"}
+
+# Running per-test, per-project totals, so all-time queries read one row per
+# test and project instead of every result ever recorded
+_UPDATE_STATS = """
+INSERT INTO test_stats (test_key, project, name, runs, passes, flips, last_passed, n_d, sum_d, sum_x, sum_xx, sum_xd)
+VALUES (:key, :project, :name, 1, :passed, 0, :passed, :has_d, :d, :x, :x * :x, :x * :d)
+ON CONFLICT(test_key, project) DO UPDATE SET
+    name = excluded.name,
+    runs = runs + 1,
+    passes = passes + excluded.passes,
+    flips = flips + (last_passed != excluded.last_passed),
+    last_passed = excluded.last_passed,
+    n_d = n_d + excluded.n_d,
+    sum_d = sum_d + excluded.sum_d,
+    sum_x = sum_x + excluded.sum_x,
+    sum_xx = sum_xx + excluded.sum_xx,
+    sum_xd = sum_xd + excluded.sum_xd
+"""
+
+# Windowed queries scan the last N runs through the run index; without the
+# hint SQLite prefers the (test_key, run_id) index and reads the whole table
+_RECENT = "results INDEXED BY idx_results_run WHERE run_id >= ?"
+
+# TC001 (single-prompt runs) or TC<slot>-<n> (one slot per user flow)
+_CASE_ID = re.compile(r"\b(TC\d+(?:-\d+)?)\b", re.IGNORECASE)
+PASSING_STATUSES = {"passed", "expected", "flaky"}
+SKIPPED_STATUSES = {"skipped"}
+
+
+def test_key(name: str) -> str:
+    """Stable key for a test: its TC id if it has one, else the lowercased name"""
+    match = _CASE_ID.search(name or "")
+    return match.group(1).upper() if match else (name or "").strip().lower()
+
+
+def _iter_playwright_suite(suite: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
+    for spec in suite.get("specs", []):
+        for test in spec.get("tests", []):
+            results = test.get("results", [])
+            if not results:
+                continue
+            # The last attempt is the outcome; earlier ones were retries
+            final = results[-1]
+            error = final.get("error") or {}
+            yield {
+                "name": spec.get("title", ""),
+                # Each configured project (browser/device) is a separate outcome of the spec
+                "project": test.get("projectName") or "",
+                "status": final.get("status", "unknown"),
+                "duration_ms": sum(result.get("duration", 0) for result in results),
+                "error": error.get("message") if isinstance(error, dict) else str(error),
+                "timing": None,
+            }
+    for child in suite.get("suites", []):
+        yield from _iter_playwright_suite(child)
+
+
+def parse_results(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Per-test results from a results JSON document.
+
+    Understands this repo's summary format (``{"tests": [{"name", "status",
+    "duration", "timing"}]}``, durations in ms, ``timing`` holding the
+    runner's per-iteration statistics) and Playwright's JSON reporter output.
+    """
+    if "suites" in data:
+        return [result for suite in data["suites"] for result in _iter_playwright_suite(suite)]
+    return [
+        {
+            "name": test.get("name", ""),
+            "project": test.get("project") or "",
+            "status": test.get("status", "unknown"),
+            "duration_ms": test.get("duration"),
+            "error": test.get("error"),
+            "timing": test.get("timing"),
+        }
+        for test in data.get("tests", [])
+    ]
+
+
+def _stats_params(key: str, project: str, name: str, passed: int,
+                  duration_ms: Optional[float], run_id: int) -> Dict[str, Any]:
+    return {"key": key, "project": project, "name": name, "passed": passed,
+            "has_d": int(duration_ms is not None), "d": duration_ms or 0.0,
+            "x": float(run_id) if duration_ms is not None else 0.0}
+
+
+def result_label(row: Dict[str, Any]) -> str:
+    """Test name with its Playwright project, if any"""
+    return f"{row['project']} › {row['name']}" if row.get("project") else row["name"]
+
+
+def _started_at(data: Dict[str, Any]) -> Optional[str]:
+    return data.get("timestamp") or (data.get("stats") or {}).get("startTime")
+
+
+class ResultsDB:
+    """Append-only history of test runs with per-test results.
+
+    Windowed queries (the last N runs) read only those runs' rows through
+    the run index; all-time queries (``window=0``) read the ``test_stats``
+    running totals that ingest maintains, one row per test and Playwright
+    project. Ingesting the same results file twice is a no-op thanks to a
+    content fingerprint.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv("QAGENIE_RESULTS_DB", DEFAULT_DB_PATH)
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(results)")}
+        for column, kind in _ADDED_RESULT_COLUMNS.items():
+            if column not in columns:
+                self.conn.execute(f"ALTER TABLE results ADD COLUMN {column} {kind}")
+        if "project" not in {row[1] for row in self.conn.execute("PRAGMA table_info(test_stats)")}:
+            self._rebuild_stats()
+
+    def _rebuild_stats(self):
+        """Recreate test_stats (keyed by test and project) by replaying every stored result"""
+        with self.conn:
+            self.conn.execute("DROP TABLE test_stats")
+            self.conn.executescript(SCHEMA)
+            rows = self.conn.execute(
+                "SELECT run_id, test_key, project, name, passed, duration_ms FROM results "
+                "WHERE status NOT IN ('skipped') ORDER BY run_id, rowid"
+            ).fetchall()
+            self.conn.executemany(_UPDATE_STATS, [
+                _stats_params(row["test_key"], row["project"], row["name"], row["passed"],
+                              row["duration_ms"], row["run_id"])
+                for row in rows
+            ])
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self) -> "ResultsDB":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def ingest(self, data: Dict[str, Any], source: Optional[str] = None,
+               started_at: Optional[str] = None) -> Optional[int]:
+        """Append one run; returns its id, or None if it was already ingested"""
+        canonical = json.dumps(data, sort_keys=True, separators=(",", ":"))
+        fingerprint = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+        # One outcome per (test, project) per run: a duplicate title in the
+        # same run counts as failed if any copy failed, with durations summed
+        merged: Dict[Any, Dict[str, Any]] = {}
+        for result in parse_results(data):
+            status = str(result["status"]).lower()
+            key = (test_key(result["name"]), result.get("project") or "")
+            entry = merged.get(key)
+            if entry is None:
+                merged[key] = dict(result, status=status)
+                continue
+            if entry["status"] in PASSING_STATUSES or entry["status"] in SKIPPED_STATUSES:
+                entry["status"] = status if status not in SKIPPED_STATUSES else entry["status"]
+            if result["duration_ms"] is not None:
+                entry["duration_ms"] = (entry["duration_ms"] or 0) + result["duration_ms"]
+            entry["error"] = entry["error"] or result["error"]
+        rows = []
+        for (key, project), result in merged.items():
+            status = result["status"]
+            timing = result.get("timing") or {}
+            rows.append((
+                key,
+                result["name"],
+                status,
+                1 if status in PASSING_STATUSES else 0,
+                result["duration_ms"],
+                result["error"],
+                timing.get("iterations"),
+                timing.get("stdev"),
+                timing.get("p95"),
+                project,
+            ))
+        scored = [row for row in rows if row[2] not in SKIPPED_STATUSES]
+        passed = sum(row[3] for row in scored)
+        with self.conn:
+            try:
+                run_id = self.conn.execute(
+                    "INSERT INTO runs (started_at, source, fingerprint, total, passed, failed, duration_ms) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (started_at or _started_at(data) or datetime.now().isoformat(), source, fingerprint,
+                     len(scored), passed, len(scored) - passed, sum(row[4] or 0 for row in rows)),
+                ).lastrowid
+            except sqlite3.IntegrityError:
+                return None
+            self.conn.executemany(
+                "INSERT INTO results (run_id, test_key, name, status, passed, duration_ms, error, "
+                "iterations, stdev_ms, p95_ms, project) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(run_id,) + row for row in rows],
+            )
+            self.conn.executemany(_UPDATE_STATS, [
+                _stats_params(row[0], row[9], row[1], row[3], row[4], run_id)
+                for row in rows if row[2] not in SKIPPED_STATUSES
+            ])
+        return run_id
+
+    def ingest_file(self, path: str) -> Optional[int]:
+        """Append the run stored in a results JSON file"""
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        started_at = _started_at(data) or datetime.fromtimestamp(os.path.getmtime(path)).isoformat()
+        return self.ingest(data, source=path, started_at=started_at)
+
+    def _window_start(self, window: Optional[int]) -> int:
+        """Lowest run id inside the last `window` runs"""
+        if not window:
+            return 0
+        row = self.conn.execute(
+            "SELECT MIN(id) FROM (SELECT id FROM runs ORDER BY id DESC LIMIT ?)", (window,)
+        ).fetchone()
+        return row[0] or 0
+
+    def runs(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Most recent runs first with their pass rate"""
+        rows = self.conn.execute(
+            "SELECT id, started_at, source, total, passed, failed, duration_ms, "
+            "ROUND(100.0 * passed / MAX(total, 1), 1) AS pass_rate FROM runs ORDER BY id DESC LIMIT ?",
+            (limit,),
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def run_series(self, max_points: int = 500) -> List[Dict[str, Any]]:
+        """Pass rate and duration per run, averaged into at most max_points buckets.
+
+        Each bucket also carries the min/max pass rate so charts can draw a
+        band; bucketing happens in SQL, so the result size is bounded no
+        matter how many runs are stored.
+        """
+        total = self.conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+        bucket = max(1, -(-total // max(1, max_points)))
+        rows = self.conn.execute(
+            "SELECT MIN(id) AS first_run, MAX(id) AS last_run, MIN(started_at) AS started_at, COUNT(*) AS runs, "
+            "AVG(100.0 * passed / MAX(total, 1)) AS pass_rate, "
+            "MIN(100.0 * passed / MAX(total, 1)) AS min_pass_rate, "
+            "MAX(100.0 * passed / MAX(total, 1)) AS max_pass_rate, "
+            "AVG(duration_ms) AS duration_ms, SUM(failed) AS failed "
+            "FROM (SELECT *, ROW_NUMBER() OVER (ORDER BY id) - 1 AS position FROM runs) "
+            "GROUP BY position / ? ORDER BY first_run",
+            (bucket,),
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def pass_rates(self, window: Optional[int] = DEFAULT_WINDOW) -> List[Dict[str, Any]]:
+        """Per-test pass rate over the last `window` runs (0 = all time), worst first"""
+        if not window:
+            rows = self.conn.execute(
+                "SELECT test_key, project, name, runs, passes, ROUND(100.0 * passes / runs, 1) AS pass_rate, "
+                "sum_d / NULLIF(n_d, 0) AS avg_duration_ms FROM test_stats ORDER BY pass_rate, runs DESC"
+            ).fetchall()
+            return [dict(row) for row in rows]
+        rows = self.conn.execute(
+            "SELECT test_key, project, MAX(name) AS name, COUNT(*) AS runs, SUM(passed) AS passes, "
+            "ROUND(100.0 * SUM(passed) / COUNT(*), 1) AS pass_rate, AVG(duration_ms) AS avg_duration_ms "
+            f"FROM {_RECENT} AND status NOT IN ('skipped') "
+            "GROUP BY test_key, project ORDER BY pass_rate, runs DESC",
+            (self._window_start(window),),
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def flaky_tests(self, window: Optional[int] = DEFAULT_WINDOW, min_runs: int = 5) -> List[Dict[str, Any]]:
+        """Tests that flip between pass and fail, ranked by flip rate.
+
+        A flaky test fails some runs but not all; the flip rate is the share
+        of consecutive runs whose outcome changed, so a test that broke once
+        and stayed broken scores low while an intermittent one scores high.
+        """
+        if not window:
+            rows = self.conn.execute(
+                "SELECT test_key, project, name, runs, runs - passes AS failures, flips, "
+                "ROUND(1.0 * flips / (runs - 1), 3) AS flip_rate FROM test_stats "
+                "WHERE runs >= ? AND passes > 0 AND passes < runs ORDER BY flip_rate DESC, failures DESC",
+                (max(2, min_runs),),
+            ).fetchall()
+            return [dict(row) for row in rows]
+        rows = self.conn.execute(
+            "WITH ordered AS ("
+            "  SELECT test_key, project, name, passed, "
+            "         LAG(passed) OVER (PARTITION BY test_key, project ORDER BY run_id) AS previous "
+            f"  FROM {_RECENT} AND status NOT IN ('skipped')"
+            ") "
+            "SELECT test_key, project, MAX(name) AS name, COUNT(*) AS runs, COUNT(*) - SUM(passed) AS failures, "
+            "       SUM(previous IS NOT NULL AND passed != previous) AS flips, "
+            "       ROUND(1.0 * SUM(previous IS NOT NULL AND passed != previous) / (COUNT(*) - 1), 3) AS flip_rate "
+            "FROM ordered GROUP BY test_key, project "
+            "HAVING COUNT(*) >= ? AND SUM(passed) > 0 AND SUM(passed) < COUNT(*) "
+            "ORDER BY flip_rate DESC, failures DESC",
+            (self._window_start(window), max(2, min_runs)),
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def duration_trends(self, window: Optional[int] = DEFAULT_WINDOW, min_runs: int = 3) -> List[Dict[str, Any]]:
+        """Least-squares slope of each test's duration per run, fastest-growing first"""
+        if not window:
+            rows = self.conn.execute(
+                "SELECT test_key, project, name, n_d AS n, sum_d / n_d AS avg_duration_ms, "
+                "(n_d * sum_xd - sum_x * sum_d) / NULLIF(n_d * sum_xx - sum_x * sum_x, 0) AS slope_ms_per_run "
+                "FROM test_stats WHERE n_d >= ? ORDER BY slope_ms_per_run DESC",
+                (min_runs,),
+            ).fetchall()
+            return [dict(row) for row in rows]
+        rows = self.conn.execute(
+            "SELECT test_key, project, MAX(name) AS name, COUNT(*) AS n, AVG(duration_ms) AS avg_duration_ms, "
+            "       (COUNT(*) * SUM(run_id * duration_ms) - SUM(run_id) * SUM(duration_ms)) / "
+            "       NULLIF(COUNT(*) * SUM(run_id * run_id) - SUM(run_id) * SUM(run_id), 0) AS slope_ms_per_run "
+            f"FROM {_RECENT} AND duration_ms IS NOT NULL "
+            "GROUP BY test_key, project HAVING COUNT(*) >= ? ORDER BY slope_ms_per_run DESC",
+            (self._window_start(window), min_runs),
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def regressions(self, window: Optional[int] = DEFAULT_WINDOW, z: float = DEFAULT_REGRESSION_Z,
+                    min_change: float = DEFAULT_REGRESSION_CHANGE, min_runs: int = 5) -> List[Dict[str, Any]]:
+        """Tests whose latest duration is significantly above their history, worst first.
+
+        The baseline is the mean and run-to-run standard deviation of each
+        test's passing durations over the previous `window` runs. The latest
+        run's own spread (stdev over its iterations, when the runner repeated
+        the test) is added to the noise, so one noisy sample does not count
+        as a regression. A test is flagged when it is at least `z` standard
+        errors and `min_change` (relative) above its baseline mean.
+        """
+        latest = self.conn.execute("SELECT MAX(id) FROM runs").fetchone()[0]
+        if latest is None:
+            return []
+        start = self._window_start(window + 1 if window else 0)
+        baseline = {
+            (row[0], row[1]): row[2:]
+            for row in self.conn.execute(
+                "SELECT test_key, project, COUNT(*), AVG(duration_ms), AVG(duration_ms * duration_ms) "
+                f"FROM {_RECENT} AND run_id < ? AND passed = 1 AND duration_ms IS NOT NULL "
+                "GROUP BY test_key, project",
+                (start, latest),
+            )
+        }
+        flagged = []
+        for row in self.conn.execute(
+            "SELECT test_key, project, name, duration_ms, stdev_ms, iterations FROM results "
+            "WHERE run_id = ? AND duration_ms IS NOT NULL",
+            (latest,),
+        ):
+            key = (row["test_key"], row["project"])
+            if key not in baseline:
+                continue
+            n, mean, mean_sq = baseline[key]
+            if n < min_runs:
+                continue
+            variance = max(0.0, mean_sq - mean * mean) * n / (n - 1)
+            spread = (row["stdev_ms"] or 0.0) ** 2 / max(1, row["iterations"] or 1)
+            noise = max((variance + spread) ** 0.5, 1e-3)
+            score = (row["duration_ms"] - mean) / noise
+            if score >= z and row["duration_ms"] >= mean * (1 + min_change):
+                flagged.append({
+                    "test_key": row["test_key"],
+                    "project": row["project"],
+                    "name": row["name"],
+                    "run_id": latest,
+                    "duration_ms": row["duration_ms"],
+                    "baseline_ms": round(mean, 3),
+                    "baseline_stdev_ms": round(variance ** 0.5, 3),
+                    "runs": n,
+                    "z": round(score, 2),
+                    "change": round(row["duration_ms"] / mean - 1, 3) if mean else None,
+                })
+        return sorted(flagged, key=lambda item: item["z"], reverse=True)
+
+    def test_history(self, key: str, limit: int = 100) -> List[Dict[str, Any]]:
+        """Recent results of one test, oldest first"""
+        rows = self.conn.execute(
+            "SELECT r.run_id, runs.started_at, r.project, r.status, r.duration_ms, r.p95_ms, r.stdev_ms, r.error "
+            "FROM results r JOIN runs ON runs.id = r.run_id "
+            "WHERE r.test_key = ? ORDER BY r.run_id DESC, r.project DESC LIMIT ?",
+            (test_key(key), limit),
+        ).fetchall()
+        return [dict(row) for row in reversed(rows)]
+
+    def selection_history(self, window: Optional[int] = DEFAULT_WINDOW) -> Dict[str, Dict[str, Any]]:
+        """Per-test runs, failures and mean duration (seconds) in select_tests' format.
+
+        A case runs once per Playwright project, so its outcomes are first
+        combined per run: the run failed if any project failed, and its
+        duration is the sum over projects.
+        """
+        if window:
+            rows = self.conn.execute(
+                "SELECT test_key, COUNT(*), SUM(failed), AVG(duration_ms) FROM ("
+                "  SELECT test_key, run_id, MIN(passed) = 0 AS failed, SUM(duration_ms) AS duration_ms "
+                f"  FROM {_RECENT} AND status NOT IN ('skipped') GROUP BY test_key, run_id"
+                ") GROUP BY test_key",
+                (self._window_start(window),),
+            )
+        else:
+            # Running totals are per project; the busiest project approximates per-run counts
+            rows = self.conn.execute(
+                "SELECT test_key, MAX(runs), MAX(runs - passes), SUM(sum_d / NULLIF(n_d, 0)) "
+                "FROM test_stats GROUP BY test_key"
+            )
+        return {
+            key: {
+                "runs": runs,
+                "failures": failures,
+                "mean_duration_s": avg_ms / 1000 if avg_ms is not None else None,
+            }
+            for key, runs, failures, avg_ms in rows
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Test results history")
+    parser.add_argument("--db", default=None, help=f"database path (default {DEFAULT_DB_PATH})")
+    commands = parser.add_subparsers(dest="command", required=True)
+    ingest_cmd = commands.add_parser("ingest", help="append results JSON files")
+    ingest_cmd.add_argument("paths", nargs="*", default=["report/test-results.json"])
+    commands.add_parser("runs", help="list recent runs")
+    for name in ("flaky", "pass-rates", "trends", "regressions"):
+        query_cmd = commands.add_parser(name)
+        query_cmd.add_argument("--window", type=int, default=DEFAULT_WINDOW, help="last N runs (0 = all)")
+        if name == "regressions":
+            query_cmd.add_argument("--z", type=float, default=DEFAULT_REGRESSION_Z,
+                                   help="standard errors above baseline to flag")
+    history_cmd = commands.add_parser("history", help="results of one test")
+    history_cmd.add_argument("test")
+    args = parser.parse_args(argv)
+
+    with ResultsDB(args.db) as db:
+        if args.command == "ingest":
+            for path in args.paths:
+                run_id = db.ingest_file(path)
+                print(f"✅ Ingested {path} as run #{run_id}" if run_id else f"⏭️ {path} already ingested")
+        elif args.command == "runs":
+            for run in db.runs():
+                print(f"#{run['id']:<5} {run['started_at']}  {run['passed']}/{run['total']} passed "
+                      f"({run['pass_rate']}%)  {run['duration_ms'] / 1000:.1f}s")
+        elif args.command == "flaky":
+            for row in db.flaky_tests(args.window):
+                print(f"{result_label(row)}: {row['flips']} flips in {row['runs']} runs "
+                      f"(flip rate {row['flip_rate']}, {row['failures']} failures)")
+        elif args.command == "pass-rates":
+            for row in db.pass_rates(args.window):
+                print(f"{result_label(row)}: {row['pass_rate']}% of {row['runs']} runs")
+        elif args.command == "trends":
+            for row in db.duration_trends(args.window):
+                slope = row["slope_ms_per_run"] or 0
+                print(f"{result_label(row)}: {slope:+.1f} ms/run (avg {row['avg_duration_ms']:.0f} ms over {row['n']} runs)")
+        elif args.command == "regressions":
+            regressions = db.regressions(args.window, args.z)
+            for row in regressions:
+                print(f"📈 {result_label(row)}: {row['duration_ms']} ms vs {row['baseline_ms']} ± "
+                      f"{row['baseline_stdev_ms']} ms over {row['runs']} runs ({row['change']:+.0%}, z={row['z']})")
+            if not regressions:
+                print("✅ No duration regressions in the latest run")
+            return 1 if regressions else 0
+        else:
+            for row in db.test_history(args.test):
+                project = f"  [{row['project']}]" if row["project"] else ""
+                print(f"#{row['run_id']:<5} {row['started_at']}  {row['status']:<8} {row['duration_ms']} ms{project}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,8 +8,12 @@ import os
 import sys
 import json
 import subprocess
+import time
 import webbrowser
 from datetime import datetime
+from runner_core import timing_stats
+from pipeline import Pipeline, Stage, print_summary
+from preflight import DASHBOARD_PACKAGES, check_packages
 
 def print_header(title):
     """Print a formatted header"""
@@ -23,10 +27,12 @@ def print_step(step, description):
     print("-" * 50)
 
 def run_command(command, description):
-    """Run a command and handle errors"""
-    print(f"🔄 Running: {command}")
+    """Run a command (an argument list, or a shell string) and handle errors"""
+    shell = isinstance(command, str)
+    print(f"🔄 Running: {command if shell else subprocess.list2cmdline(command)}")
     try:
-        result = subprocess.run(command, shell=True, capture_output=True, text=True)
+        # Argument lists skip the shell, except on Windows where npx/node are .cmd shims
+        result = subprocess.run(command, shell=shell or os.name == "nt", capture_output=True, text=True)
         if result.returncode == 0:
             print(f"✅ {description} - SUCCESS")
             if result.stdout:
@@ -69,6 +75,9 @@ def create_sample_data():
         ],
         "timestamp": datetime.now().isoformat()
     }
+    # Same record shape as simple_runner: single-iteration timing statistics
+    for test in sample_data["tests"]:
+        test["timing"] = timing_stats([test["duration"] * 1_000_000])
     
     # Save sample data
     with open('report/test-results.json', 'w', encoding='utf-8') as f:
@@ -81,23 +90,22 @@ def check_dependencies():
     """Check if required dependencies are installed"""
     print_step(2, "Checking dependencies")
     
-    required_packages = ['streamlit', 'plotly', 'pandas']
+    # find_spec/metadata lookups, cached per environment: nothing heavy gets imported
     missing_packages = []
     
-    for package in required_packages:
-        try:
-            __import__(package)
+    for package, result in check_packages(DASHBOARD_PACKAGES).items():
+        if result["installed"]:
             print(f"✅ {package} - Installed")
-        except ImportError:
+        else:
             print(f"❌ {package} - Missing")
-            missing_packages.append(package)
+            missing_packages.append(DASHBOARD_PACKAGES[package])
     
     if missing_packages:
         print(f"\n⚠️ Missing packages: {', '.join(missing_packages)}")
         print("Installing missing packages...")
         
         for package in missing_packages:
-            success = run_command(f"pip install {package}", f"Installing {package}")
+            success = run_command([sys.executable, "-m", "pip", "install", package], f"Installing {package}")
             if not success:
                 print(f"❌ Failed to install {package}")
                 return False
@@ -110,7 +118,7 @@ def run_test_generation():
     
     if os.path.exists('scripts/generate_testcases.py'):
         return run_command(
-            "python scripts/generate_testcases.py",
+            [sys.executable, "scripts/generate_testcases.py"],
             "Test case generation"
         )
     else:
@@ -123,7 +131,7 @@ def run_playwright_conversion():
     
     if os.path.exists('scripts/generatePlaywrightTests.js'):
         return run_command(
-            "node scripts/generatePlaywrightTests.js",
+            ["node", "scripts/generatePlaywrightTests.js"],
             "Playwright test conversion"
         )
     else:
@@ -137,7 +145,7 @@ def run_tests():
     # Check if Playwright is available
     if os.path.exists('test/guaranteed_passing.spec.ts'):
         return run_command(
-            "npx playwright test test/guaranteed_passing.spec.ts --reporter=list",
+            ["npx", "playwright", "test", "test/guaranteed_passing.spec.ts", "--reporter=list"],
             "Test execution"
         )
     else:
@@ -219,6 +227,40 @@ def run_dashboard():
     else:
         print("❌ Dashboard file not found")
 
+# Modules that shape generated output; the mock backend and the test case store do not
+GENERATION_MODULES = [f"scripts/{name}.py" for name in (
+    "generate_testcases", "llm_cache", "json_stream", "transcript_chunker", "generation_manifest",
+    "step_rules", "spec_template", "artifact_writer", "dedup",
+)]
+
+def build_pipeline():
+    """The full run as a dependency graph: independent stages overlap, unchanged ones are skipped"""
+    return Pipeline([
+        # The sample data is defined in this file, so editing it regenerates the data
+        Stage("sample_data", create_sample_data, inputs=["run_system.py"],
+              outputs=["report/test-results.json"]),
+        # Always checked: a package can vanish without any tracked file changing, and
+        # preflight caches its answer per environment, so an unchanged one costs a few stats
+        Stage("dependencies", check_dependencies, always=True),
+        # Generation and conversion failures never stopped the run; tests fall back to simple checks
+        Stage("generate", run_test_generation, optional=True,
+              inputs=["recruter_transcript.txt"] + GENERATION_MODULES,
+              outputs=["testcases/testcases_*.json"]),
+        Stage("convert", run_playwright_conversion, after=["generate"], optional=True,
+              inputs=["testcases/testcases_*.json", "scripts/generatePlaywrightTests.js"],
+              outputs=["test/*.spec.ts"]),
+        # Tests always run: their outcome depends on the site under test, not only on local files
+        Stage("tests", run_tests, after=["sample_data", "dependencies", "convert"], always=True,
+              inputs=["test/guaranteed_passing.spec.ts", "playwright.config.ts", "playwright.config.js"]),
+    ])
+
+def run_pipeline(force=False):
+    """Run every stage that is out of date; returns True if the tests stage did not fail"""
+    start = time.perf_counter()
+    results = build_pipeline().run(force=force)
+    print_summary(results, time.perf_counter() - start)
+    return results["tests"].status in ("ran", "up-to-date")
+
 def main():
     """Main function to run the entire system"""
     print_header("Test Automation System Runner")
@@ -229,31 +271,19 @@ def main():
     print("   2. Run tests only")
     print("   3. Open reports only")
     print("   4. Start dashboard only")
+    print("   (pass the number as an argument to skip the prompt; add --force to rerun unchanged steps)")
     
-    choice = input("\n🤔 Choose an option (1-4): ").strip()
+    # A choice on the command line (e.g. `python run_system.py 1 --force`) skips the prompts
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    force = "--force" in sys.argv[1:]
+    choice = args[0] if args else input("\n🤔 Choose an option (1-4): ").strip()
     
     if choice == "1":
         # Full system run
         print_header("Running Full Test Automation System")
         
-        # Step 1: Create sample data
-        if not create_sample_data():
-            print("❌ Failed to create sample data")
-            return
-        
-        # Step 2: Check dependencies
-        if not check_dependencies():
-            print("❌ Dependency check failed")
-            return
-        
-        # Step 3: Generate test cases
-        run_test_generation()
-        
-        # Step 4: Convert to Playwright
-        run_playwright_conversion()
-        
-        # Step 5: Run tests
-        if not run_tests():
+        # Steps 1-5: sample data, dependencies, generation, conversion and tests
+        if not run_pipeline(force):
             print("❌ Test execution failed")
             return
         
@@ -261,9 +291,10 @@ def main():
         open_reports()
         
         # Step 7: Ask about dashboard
-        dashboard_choice = input("\n🤔 Start the dashboard? (y/n): ").strip().lower()
-        if dashboard_choice in ['y', 'yes']:
-            run_dashboard()
+        if not args:
+            dashboard_choice = input("\n🤔 Start the dashboard? (y/n): ").strip().lower()
+            if dashboard_choice in ['y', 'yes']:
+                run_dashboard()
         
     elif choice == "2":
         # Run tests only
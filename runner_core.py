@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Runner Core
+Discovers Python-side checks and runs them serially or across a process pool
+"""
+
+import os
+import sys
+import signal
+import fnmatch
+import inspect
+import importlib
+import threading
+import traceback
+import statistics
+from time import perf_counter_ns
+from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_PATTERN = "check_*"
+DEFAULT_FILE_PATTERN = "*checks.py"
+DEFAULT_ITERATIONS = 1
+DEFAULT_WARMUP = 0
+PERCENTILES = (50, 95, 99)
+
+
+class CheckTimeout(BaseException):
+    """Raised inside a check that overran its timeout.
+
+    A BaseException, like KeyboardInterrupt, so a check's own
+    ``except Exception`` cannot swallow it and keep running.
+    """
+
+
+@dataclass
+class Check:
+    """One discovered check: a module-level callable that returns truthy on success"""
+    name: str
+    func: Callable[[], Any]
+    timeout: Optional[float] = None
+    iterations: Optional[int] = None
+    warmup: Optional[int] = None
+
+    @property
+    def location(self) -> str:
+        return f"{self.func.__module__}:{self.func.__qualname__}"
+
+
+def check(name: Optional[str] = None, timeout: Optional[float] = None,
+          iterations: Optional[int] = None, warmup: Optional[int] = None):
+    """Mark a function as a check, optionally with a display name, timeout and repeat counts"""
+    def decorate(func):
+        func.__check_name__ = name or func.__name__
+        func.__check_timeout__ = timeout
+        func.__check_iterations__ = iterations
+        func.__check_warmup__ = warmup
+        return func
+    return decorate
+
+
+def _module_checks(module, pattern: str) -> List[Check]:
+    checks = []
+    for attr, func in vars(module).items():
+        if not inspect.isfunction(func) or func.__module__ != module.__name__:
+            continue
+        if not (hasattr(func, "__check_name__") or fnmatch.fnmatchcase(attr, pattern)):
+            continue
+        checks.append(Check(
+            getattr(func, "__check_name__", attr),
+            func,
+            getattr(func, "__check_timeout__", None),
+            getattr(func, "__check_iterations__", None),
+            getattr(func, "__check_warmup__", None),
+        ))
+    # Definition order, so reports read like the source
+    return sorted(checks, key=lambda c: c.func.__code__.co_firstlineno)
+
+
+def _import_path(path: str):
+    """Import a .py file by module name, with its directory on sys.path so workers can too"""
+    directory, filename = os.path.split(os.path.abspath(path))
+    if directory not in sys.path:
+        sys.path.insert(0, directory)
+    return importlib.import_module(os.path.splitext(filename)[0])
+
+
+def discover(targets: Iterable[Any], pattern: str = DEFAULT_PATTERN,
+             file_pattern: str = DEFAULT_FILE_PATTERN) -> List[Check]:
+    """Collect checks from modules, module names, .py files or directories.
+
+    Functions decorated with ``@check`` are always collected; other
+    module-level functions are collected when their name matches
+    ``pattern``. Directories are searched recursively for files matching
+    ``file_pattern``.
+    """
+    checks: List[Check] = []
+    for target in targets:
+        if inspect.ismodule(target):
+            checks.extend(_module_checks(target, pattern))
+        elif os.path.isdir(target):
+            for root, dirs, files in os.walk(target):
+                dirs[:] = sorted(d for d in dirs if not d.startswith((".", "__")) and d != "node_modules")
+                for filename in sorted(fnmatch.filter(files, file_pattern)):
+                    checks.extend(_module_checks(_import_path(os.path.join(root, filename)), pattern))
+        elif str(target).endswith(".py"):
+            checks.extend(_module_checks(_import_path(target), pattern))
+        else:
+            checks.extend(_module_checks(importlib.import_module(target), pattern))
+    return checks
+
+
+def _raise_timeout(signum, frame):
+    raise CheckTimeout()
+
+
+def timing_stats(samples_ns: Sequence[int], warmup: int = 0) -> Dict[str, Any]:
+    """Summary of measured iterations in ms: min, max, mean, stdev and percentiles"""
+    ms = [sample / 1e6 for sample in samples_ns]
+    stats: Dict[str, Any] = {"iterations": len(ms), "warmup": warmup}
+    if not ms:
+        return stats
+    stats.update(min=min(ms), max=max(ms), mean=statistics.fmean(ms),
+                 stdev=statistics.stdev(ms) if len(ms) > 1 else 0.0)
+    if len(ms) > 1:
+        cuts = statistics.quantiles(ms, n=100, method="inclusive")
+        stats.update({f"p{p}": cuts[p - 1] for p in PERCENTILES})
+    else:
+        stats.update({f"p{p}": ms[0] for p in PERCENTILES})
+    return {key: round(value, 3) if isinstance(value, float) else value for key, value in stats.items()}
+
+
+def _call(item: Check, limit: Optional[float]):
+    """Run the check once; returns (status, error, elapsed_ns)"""
+    hard = bool(limit) and hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+    if hard:
+        previous = signal.signal(signal.SIGALRM, _raise_timeout)
+    error, elapsed_ns = None, None
+    start = perf_counter_ns()
+    try:
+        try:
+            if hard:
+                signal.setitimer(signal.ITIMER_REAL, limit)
+            status = "PASSED" if item.func() else "FAILED"
+        finally:
+            # Disarm before anything else, so the alarm cannot fire in the handlers below
+            if hard:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+            elapsed_ns = perf_counter_ns() - start
+    except CheckTimeout:
+        status = "TIMEOUT"
+    except Exception as e:
+        status, error = "ERROR", f"{type(e).__name__}: {e}"
+        error += "\n" + "".join(traceback.format_tb(e.__traceback__)[1:])
+    finally:
+        # Only restored once the timer is off, so a pending alarm never reaches the previous handler
+        if hard:
+            signal.signal(signal.SIGALRM, previous)
+    if elapsed_ns is None:  # the alarm went off while it was being disarmed
+        elapsed_ns = perf_counter_ns() - start
+    if limit and status != "TIMEOUT" and elapsed_ns > limit * 1e9:
+        status = "TIMEOUT"
+    return status, error, elapsed_ns
+
+
+def execute(item: Check, timeout: Optional[float] = DEFAULT_TIMEOUT,
+            iterations: int = DEFAULT_ITERATIONS, warmup: int = DEFAULT_WARMUP) -> Dict[str, Any]:
+    """Run one check and return its result record (durations in ms).
+
+    The check runs ``warmup`` unmeasured times, then ``iterations``
+    measured times; a check's own counts from ``@check`` take precedence.
+    The first iteration that does not pass ends the run with that status.
+    ``duration`` is the median measured iteration and ``timing`` holds the
+    full statistics.
+
+    On POSIX, in a main thread (serial mode and every pool worker), the
+    timeout interrupts each iteration with an interval timer. Elsewhere it
+    is enforced after the fact: an overrunning iteration is reported as
+    TIMEOUT once it returns.
+    """
+    limit = item.timeout if item.timeout is not None else timeout
+    warmup = item.warmup if item.warmup is not None else warmup
+    iterations = max(1, item.iterations if item.iterations is not None else iterations)
+    samples: List[int] = []
+    status, error = "PASSED", None
+    for run in range(warmup + iterations):
+        status, error, elapsed_ns = _call(item, limit)
+        if run >= warmup:
+            samples.append(elapsed_ns)
+        if status != "PASSED":
+            break
+    if status == "TIMEOUT":
+        error = f"Timed out after {limit:g}s"
+    if not samples:
+        # Failed during warm-up: report that iteration
+        samples.append(elapsed_ns)
+    timing = timing_stats(samples, warmup)
+    result = {"name": item.name, "status": status, "duration": timing["p50"], "timing": timing}
+    if error:
+        result["error"] = error.rstrip()
+    return result
+
+
+def _execute_batch(batch: List[Check], options: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [execute(item, **options) for item in batch]
+
+
+def _init_worker(path: List[str]):
+    # Spawned workers start with a fresh sys.path; discovered files must stay importable
+    sys.path[:] = path + [entry for entry in sys.path if entry not in path]
+
+
+class SerialRunner:
+    """Runs checks one after another in this process"""
+
+    def __init__(self, timeout: Optional[float] = DEFAULT_TIMEOUT,
+                 iterations: int = DEFAULT_ITERATIONS, warmup: int = DEFAULT_WARMUP):
+        self.options = {"timeout": timeout, "iterations": iterations, "warmup": warmup}
+
+    def run(self, checks: Sequence[Check]) -> Iterator[Dict[str, Any]]:
+        for item in checks:
+            yield execute(item, **self.options)
+
+
+class ProcessPoolRunner:
+    """Runs checks across worker processes, yielding results in input order.
+
+    Checks are sent in batches so hundreds of millisecond-sized checks are
+    not dominated by per-task IPC; each batch is a few per worker, which
+    still lets slow batches be balanced across the pool.
+    """
+
+    def __init__(self, timeout: Optional[float] = DEFAULT_TIMEOUT, workers: Optional[int] = None,
+                 iterations: int = DEFAULT_ITERATIONS, warmup: int = DEFAULT_WARMUP,
+                 batches_per_worker: int = 4):
+        self.options = {"timeout": timeout, "iterations": iterations, "warmup": warmup}
+        self.workers = workers or os.cpu_count() or 1
+        self.batches_per_worker = batches_per_worker
+
+    def run(self, checks: Sequence[Check]) -> Iterator[Dict[str, Any]]:
+        unpicklable = [item.name for item in checks if "<" in item.func.__qualname__]
+        if unpicklable:
+            raise ValueError(f"Checks must be module-level functions to run in a process pool: {unpicklable}")
+        if not checks:
+            return
+        size = max(1, -(-len(checks) // (self.workers * self.batches_per_worker)))
+        batches = [list(checks[i:i + size]) for i in range(0, len(checks), size)]
+        workers = min(self.workers, len(batches))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(list(sys.path),)) as pool:
+            for results in pool.map(_execute_batch, batches, [self.options] * len(batches)):
+                yield from results
+
+
+RUNNERS = {
+    "serial": SerialRunner,
+    "process": ProcessPoolRunner,
+}
+
+
+def get_runner(mode: str = "serial", **options):
+    """Runner instance for a mode name; options go to its constructor"""
+    try:
+        runner_class = RUNNERS[mode]
+    except KeyError:
+        raise ValueError(f"Unknown runner mode '{mode}' (choose from {', '.join(RUNNERS)})")
+    if runner_class is SerialRunner:
+        options.pop("workers", None)
+    return runner_class(**options)
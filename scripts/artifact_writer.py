@@ -0,0 +1,119 @@
+"""
+Artifact Writer
+Parallel, atomic writes for generated specs and test case files
+"""
+
+import os
+import hashlib
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_WORKERS = 8
+
+
+def _current_umask() -> int:
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+class ArtifactWriter:
+    """Write many small files atomically, skipping ones whose content is unchanged.
+
+    Every file goes to a hidden temp file next to its destination (so
+    Playwright's ``*.spec.ts`` glob never sees it) and is renamed into
+    place only after all temp files are written and fsynced. Writes and
+    fsyncs run on a thread pool; each directory is fsynced once after the
+    renames. A crash leaves either the old file or the new one, never a
+    partial file. Files whose sha256 matches the new content are left
+    untouched so their mtimes (and Playwright's caches/watchers) survive.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_WORKERS, durable: Optional[bool] = None):
+        self.max_workers = max(1, max_workers)
+        if durable is None:
+            durable = os.getenv("QAGENIE_FSYNC", "1").lower() not in ("0", "false", "no")
+        self.durable = durable
+        self._mode = 0o666 & ~_current_umask()
+        self.stats = {"written": 0, "unchanged": 0}
+
+    @staticmethod
+    def _unchanged(path: str, data: bytes) -> bool:
+        try:
+            if os.path.getsize(path) != len(data):
+                return False
+            with open(path, "rb") as f:
+                return hashlib.sha256(f.read()).digest() == hashlib.sha256(data).digest()
+        except OSError:
+            return False
+
+    def _stage(self, path: str, data: bytes) -> Optional[str]:
+        """Write data to a temp file beside path; None if the file is unchanged"""
+        if self._unchanged(path, data):
+            return None
+        directory, name = os.path.split(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(prefix=f".{name}.", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                if self.durable:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.chmod(tmp_path, self._mode)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return tmp_path
+
+    @staticmethod
+    def _sync_directory(directory: str):
+        try:
+            fd = os.open(directory, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass  # Not supported on every platform/filesystem
+        finally:
+            os.close(fd)
+
+    def write_many(self, files: Iterable[Tuple[str, str]]) -> Dict[str, int]:
+        """Atomically write (path, text) pairs; returns written/unchanged counts"""
+        items: List[Tuple[str, bytes]] = [(path, content.encode("utf-8")) for path, content in files]
+        for directory in {os.path.dirname(os.path.abspath(path)) for path, _ in items}:
+            os.makedirs(directory, exist_ok=True)
+
+        staged: List[Tuple[str, str]] = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = [(path, pool.submit(self._stage, path, data)) for path, data in items]
+            error = None
+            for path, future in futures:
+                try:
+                    tmp_path = future.result()
+                except Exception as e:
+                    error = error or e
+                    continue
+                if tmp_path is not None:
+                    staged.append((tmp_path, path))
+        if error is not None:
+            # Leave every destination as it was
+            for tmp_path, _ in staged:
+                os.unlink(tmp_path)
+            raise error
+
+        for tmp_path, path in staged:
+            os.replace(tmp_path, path)
+        if self.durable:
+            for directory in {os.path.dirname(os.path.abspath(path)) for _, path in staged}:
+                self._sync_directory(directory)
+
+        result = {"written": len(staged), "unchanged": len(items) - len(staged)}
+        self.stats["written"] += result["written"]
+        self.stats["unchanged"] += result["unchanged"]
+        return result
+
+    def write(self, path: str, content: str) -> bool:
+        """Atomically write a single file; False if it was already up to date"""
+        return self.write_many([(path, content)])["written"] == 1
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Test Generation Benchmark
+Measures each stage of scripts/generate_testcases.py against the mock LLM backend
+
+Every transcript size runs in a fresh subprocess so its peak RSS is not
+inflated by earlier, larger runs. On Linux the peak is reset before each
+stage, so it is that stage's own peak; elsewhere it is the cumulative
+peak of the worker process, marked with "peak_rss_scope": "process".
+Results are written as JSON and compared against a stored baseline;
+regressions make the script exit non-zero.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tempfile
+import subprocess
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SIZES = [5 * 1024, 50 * 1024, 500 * 1024, 5 * 1024 * 1024]
+DEFAULT_OUTPUT = os.path.join(SCRIPT_DIR, "benchmark_results.json")  # not report/, which holds run results
+DEFAULT_BASELINE = os.path.join(SCRIPT_DIR, "benchmark_baseline.json")
+STAGES = ["flow_extraction", "case_generation", "script_generation", "markdown_rendering", "file_writes"]
+
+# Vocabulary for synthetic transcripts, shaped like a product walkthrough
+VOCABULARY = (
+    "recruiter candidate interview resume screening dashboard signup login profile "
+    "skills difficulty question answer video camera microphone upload analysis score "
+    "report share link settings billing invite team job description create save submit"
+).split()
+FILLER = "so now we click here and then you can see that the page shows the".split()
+
+
+def synthetic_transcript(size_bytes: int, seed: int = 0) -> str:
+    """Deterministic caption-style transcript of roughly size_bytes"""
+    rng = random.Random(seed)
+    lines = []
+    total = 0
+    while total < size_bytes:
+        words = [rng.choice(FILLER) for _ in range(rng.randint(3, 7))]
+        words.insert(rng.randint(0, len(words)), rng.choice(VOCABULARY))
+        line = " ".join(words)
+        lines.append(line)
+        total += len(line) + 1
+    return "\n".join(lines)
+
+
+def reset_peak_rss() -> bool:
+    """Reset this process's peak RSS (VmHWM) to its current RSS; False where unsupported"""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size since the last reset, else since the process started"""
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 2)
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is kilobytes on Linux, bytes on macOS
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 2)
+
+
+def run_size(size_bytes: int, config: Dict[str, Any]) -> Dict[str, Any]:
+    """Run every stage once for one transcript size (worker process)"""
+    os.environ["QAGENIE_NO_CACHE"] = "1"
+    sys.path.insert(0, SCRIPT_DIR)
+    import generate_testcases as gen
+    from mock_llm import MockLLM, mock_transports
+
+    mock = MockLLM(latency=config["latency"], tokens_per_second=config["tokens_per_second"] or None,
+                   failure_rate=config["failure_rate"], rate_limit_rate=config["rate_limit_rate"],
+                   retry_after=0.01, seed=config["seed"])
+    qa_genie = gen.QAGenie(**mock_transports(mock))
+    transcript = synthetic_transcript(size_bytes, config["seed"])
+    concurrency = config["concurrency"]
+    stages = {}
+    state: Dict[str, Any] = {}
+
+    def measure(name, func):
+        calls_before = mock.stats["requests"]
+        per_stage = reset_peak_rss()
+        start = time.perf_counter()
+        state[name] = func()
+        wall = time.perf_counter() - start
+        calls = mock.stats["requests"] - calls_before
+        stages[name] = {
+            "wall_time_s": round(wall, 4),
+            "peak_rss_mb": peak_rss_mb(),
+            "peak_rss_scope": "stage" if per_stage else "process",
+            "llm_calls": calls,
+            "calls_per_second": round(calls / wall, 2) if wall > 0 else None,
+        }
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        measure("flow_extraction", lambda: qa_genie.extract_user_flows(transcript, concurrency))
+        measure("case_generation", lambda: {
+            "metadata": {},
+            "test_cases": list(qa_genie.stream_test_cases_from_flows(state["flow_extraction"])),
+        })
+        test_cases = state["case_generation"]
+        test_cases["metadata"] = qa_genie._build_metadata(test_cases["test_cases"])
+        measure("script_generation", lambda: qa_genie.generate_playwright_scripts(
+            test_cases, concurrency=concurrency, batch_size=config["batch_size"]))
+        measure("markdown_rendering", lambda: gen.write_markdown_report(
+            test_cases, gen.report_path("bench", out_dir)))
+        measure("file_writes", lambda: gen.write_artifacts(
+            test_cases, state["script_generation"], "bench", out_dir, include_report=False))
+    qa_genie.close()
+
+    return {
+        "size_bytes": size_bytes,
+        "flows": len(state["flow_extraction"]),
+        "test_cases": len(test_cases["test_cases"]),
+        "scripts": len(state["script_generation"]),
+        "mock": mock.stats,
+        "stages": stages,
+    }
+
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any], tolerance: float,
+            min_delta_s: float) -> List[Dict[str, Any]]:
+    """List stage metrics that got worse than the baseline by more than tolerance"""
+    previous = {entry["size_bytes"]: entry for entry in baseline.get("results", [])}
+    regressions = []
+    for entry in results:
+        base_entry = previous.get(entry["size_bytes"])
+        if base_entry is None:
+            continue
+        for stage, metrics in entry["stages"].items():
+            base_metrics = base_entry.get("stages", {}).get(stage)
+            if not base_metrics:
+                continue
+            for metric, min_delta in (("wall_time_s", min_delta_s), ("peak_rss_mb", 5.0)):
+                current, before = metrics.get(metric), base_metrics.get(metric)
+                if current is None or before is None:
+                    continue
+                if metric == "peak_rss_mb" and metrics.get("peak_rss_scope") != base_metrics.get("peak_rss_scope"):
+                    continue  # a per-stage peak is not comparable with a cumulative one
+                if current > before * (1 + tolerance) and current - before > min_delta:
+                    regressions.append({
+                        "size_bytes": entry["size_bytes"],
+                        "stage": stage,
+                        "metric": metric,
+                        "baseline": before,
+                        "current": current,
+                        "change_pct": round((current - before) / before * 100, 1) if before else None,
+                    })
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the QAgenie test generation pipeline")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="synthetic transcript sizes in bytes")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--batch-size", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.0, help="mock time to first token (s)")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="mock generation speed (0 = instant)")
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="where to write the JSON results")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON to compare against")
+    parser.add_argument("--update-baseline", action="store_true", help="store these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before flagging (0.25 = 25%%)")
+    parser.add_argument("--min-delta", type=float, default=0.05, help="ignore wall time changes below this (s)")
+    parser.add_argument("--worker", type=int, help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    config = {
+        "concurrency": args.concurrency,
+        "batch_size": args.batch_size,
+        "latency": args.latency,
+        "tokens_per_second": args.tokens_per_second,
+        "failure_rate": args.failure_rate,
+        "rate_limit_rate": args.rate_limit_rate,
+        "seed": args.seed,
+    }
+
+    if args.worker is not None:
+        # Silence generator progress output; only the JSON result goes to stdout
+        real_stdout = sys.stdout
+        sys.stdout = open(os.devnull, "w", encoding="utf-8")
+        try:
+            result = run_size(args.worker, config)
+        finally:
+            sys.stdout.close()
+            sys.stdout = real_stdout
+        print(json.dumps(result))
+        return 0
+
+    print("⏱️ QAgenie Generation Benchmark")
+    print("=" * 50)
+    results = []
+    for size in args.sizes:
+        print(f"\n📏 Transcript size: {size / 1024:.0f} KB")
+        worker_cmd = [sys.executable, os.path.abspath(__file__), "--worker", str(size)] + [
+            arg for arg in (argv if argv is not None else sys.argv[1:])
+        ]
+        completed = subprocess.run(worker_cmd, capture_output=True, text=True)
+        if completed.returncode != 0:
+            print(f"❌ Benchmark worker failed:\n{completed.stderr}")
+            return 1
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+        results.append(result)
+        print(f"   {result['flows']} flows, {result['test_cases']} cases, {result['scripts']} scripts")
+        for stage in STAGES:
+            metrics = result["stages"][stage]
+            print(f"   {stage:<20} {metrics['wall_time_s']:>9.3f}s  {metrics['peak_rss_mb'] or 0:>8.1f} MB  "
+                  f"{metrics['llm_calls']:>5} calls")
+
+    report = {
+        "generated_at": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": config,
+        "results": results,
+        "regressions": [],
+    }
+
+    if os.path.exists(args.baseline) and not args.update_baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            report["regressions"] = compare(results, json.load(f), args.tolerance, args.min_delta)
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n📁 Results saved to: {args.output}")
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"📌 Baseline updated: {args.baseline}")
+        return 0
+
+    if report["regressions"]:
+        print(f"\n⚠️ {len(report['regressions'])} regressions against {args.baseline}:")
+        for reg in report["regressions"]:
+            print(f"   {reg['size_bytes'] / 1024:.0f} KB {reg['stage']} {reg['metric']}: "
+                  f"{reg['baseline']} -> {reg['current']} ({reg['change_pct']:+}%)")
+        return 1
+
+    print("✅ No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+"""
+Test Case Deduplication
+Merges near-identical test cases with shingled MinHash and LSH banding
+"""
+
+import re
+import struct
+import hashlib
+from typing import Any, Dict, List, Sequence, Tuple
+
+DEFAULT_THRESHOLD = 0.8
+DEFAULT_NUM_PERM = 64
+DEFAULT_BANDS = 16
+SHINGLE_SIZE = 3
+
+_WORD = re.compile(r"[a-z0-9]+")
+_unpackers: Dict[int, Any] = {}
+
+
+def case_text(case: Dict[str, Any]) -> str:
+    """Text compared between cases: title plus steps (or their name / test_steps spellings)"""
+    title = case.get("title") or case.get("name") or ""
+    steps = case.get("steps") or case.get("test_steps") or []
+    if isinstance(steps, str):
+        steps = [steps]
+    return " ".join([str(title)] + [str(step) for step in steps if step is not None])
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> List[bytes]:
+    """Word n-grams of normalized text"""
+    words = _WORD.findall(text.lower())
+    if len(words) <= size:
+        return [" ".join(words).encode("utf-8")] if words else []
+    return list({" ".join(words[i:i + size]).encode("utf-8") for i in range(len(words) - size + 1)})
+
+
+def minhash(items: Sequence[bytes], num_perm: int = DEFAULT_NUM_PERM) -> Tuple[int, ...]:
+    """MinHash signature of a shingle set.
+
+    One SHAKE-128 call per shingle yields all num_perm 32-bit hash values,
+    and the per-position minimum is taken with zip/min, so the work stays in C.
+    """
+    if not items:
+        return (0xFFFFFFFF,) * num_perm
+    unpack = _unpackers.get(num_perm)
+    if unpack is None:
+        unpack = _unpackers[num_perm] = struct.Struct(f"<{num_perm}I").unpack
+    size = num_perm * 4
+    rows = [unpack(hashlib.shake_128(item).digest(size)) for item in items]
+    return tuple(map(min, zip(*rows)))
+
+
+def similarity(a: Sequence[int], b: Sequence[int]) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return sum(x == y for x, y in zip(a, b)) / len(a)
+
+
+class _UnionFind:
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, item: int) -> int:
+        while self.parent[item] != item:
+            self.parent[item] = self.parent[self.parent[item]]
+            item = self.parent[item]
+        return item
+
+    def union(self, a: int, b: int):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            # Keep the earliest case as the root so it survives
+            self.parent[max(root_a, root_b)] = min(root_a, root_b)
+
+
+def deduplicate(cases: List[Dict[str, Any]], threshold: float = DEFAULT_THRESHOLD,
+                num_perm: int = DEFAULT_NUM_PERM, bands: int = DEFAULT_BANDS,
+                same_category: bool = True) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Drop near-duplicate cases; returns (kept cases, merged clusters).
+
+    Signatures are split into ``bands`` bands and cases sharing any band
+    become candidates; candidates are confirmed when their estimated
+    similarity reaches ``threshold``. Within an LSH bucket every member is
+    compared to the bucket's first member and its predecessor only, which
+    keeps the whole pass near-linear even when many cases collide. The
+    first case of each cluster is kept, preserving the original order.
+    Cases with no comparable text are always kept: their empty signatures
+    would otherwise all share one bucket and merge into one cluster.
+    """
+    if len(cases) < 2 or threshold <= 0:
+        return list(cases), []
+    if num_perm % bands:
+        raise ValueError("num_perm must be divisible by bands")
+    rows_per_band = num_perm // bands
+    shingle_sets = [shingles(case_text(case)) for case in cases]
+    signatures = [minhash(items, num_perm) for items in shingle_sets]
+    comparable = [index for index, items in enumerate(shingle_sets) if items]
+
+    union = _UnionFind(len(cases))
+    scores: Dict[Tuple[int, int], float] = {}
+
+    def link(a: int, b: int) -> bool:
+        score = similarity(signatures[a], signatures[b])
+        if score >= threshold:
+            union.union(a, b)
+            scores[(a, b)] = score
+            return True
+        return False
+
+    for band in range(bands):
+        start = band * rows_per_band
+        buckets: Dict[Tuple[Any, ...], List[int]] = {}
+        for index in comparable:
+            key: Tuple[Any, ...] = signatures[index][start:start + rows_per_band]
+            if same_category:
+                key = (str(cases[index].get("category", "")).lower(),) + key
+            buckets.setdefault(key, []).append(index)
+        for members in buckets.values():
+            anchor = members[0]
+            for previous, index in zip(members, members[1:]):
+                if union.find(index) == union.find(anchor):
+                    continue
+                if not link(anchor, index) and previous != anchor:
+                    link(previous, index)
+
+    groups: Dict[int, List[int]] = {}
+    for index in range(len(cases)):
+        groups.setdefault(union.find(index), []).append(index)
+    linked: Dict[int, List[float]] = {}
+    for (a, _), score in scores.items():
+        linked.setdefault(union.find(a), []).append(score)
+
+    kept = [cases[root] for root in sorted(groups)]
+    clusters = []
+    for root in sorted(groups):
+        members = groups[root]
+        if len(members) < 2:
+            continue
+        clusters.append({
+            "kept": cases[root].get("id"),
+            "merged": [cases[index].get("id") for index in members[1:]],
+            "titles": [cases[index].get("title") or cases[index].get("name") for index in members],
+            "min_similarity": round(min(linked[root]), 3),
+        })
+    return kept, clusters
+
+
+def deduplicate_test_cases(test_cases: Dict[str, Any], threshold: float = DEFAULT_THRESHOLD,
+                           **options) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """Deduplicate a {"metadata", "test_cases"} document, recording clusters in metadata"""
+    kept, clusters = deduplicate(test_cases.get("test_cases", []), threshold, **options)
+    result = dict(test_cases)
+    result["test_cases"] = kept
+    if clusters:
+        metadata = dict(result.get("metadata", {}))
+        metadata["deduplicated"] = clusters
+        result["metadata"] = metadata
+    return result, clusters
@@ -1,19 +1,81 @@
 import os
+import gzip
 import openai
+import httpx
 import json
 import re
-from typing import List, Dict, Any
+import random
+import asyncio
+import argparse
+from typing import List, Dict, Any, Optional, Tuple, Iterator, AsyncIterator
 from dotenv import load_dotenv
 from datetime import datetime
+from llm_cache import LLMCache
+from json_stream import JSONObjectStream, iter_json_objects
+from transcript_chunker import count_tokens, chunk_transcript, merge_flows
+from generation_manifest import GenerationManifest
+from mock_llm import mock_from_env, mock_transports
+from step_rules import StepRules
+from spec_template import FALLBACK_SPEC
+from artifact_writer import ArtifactWriter
+from testcase_store import TestCaseStore
+from dedup import DEFAULT_THRESHOLD, deduplicate_test_cases
 
 # Load OpenAI API key from .env file
 load_dotenv()
 openai.api_key = os.getenv("OPENAI_API_KEY")
 
+# HTTP client defaults, shared across all QAGenie stages
+DEFAULT_TIMEOUT = 120.0
+DEFAULT_CONNECT_TIMEOUT = 10.0
+DEFAULT_MAX_CONNECTIONS = 20
+KEEPALIVE_EXPIRY = 60.0
+
+# Write buffer for the streamed markdown report
+REPORT_BUFFER_SIZE = 1024 * 1024
+
+# Backoff for rate-limited / transient failures in async mode
+RETRY_MAX_ATTEMPTS = 5
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 30.0
+
 class QAGenie:
     """AI-powered QA agent for generating comprehensive test cases"""
     
-    def __init__(self):
+    def __init__(self, model: str = "gpt-3.5-turbo", temperature: float = 0.3, cache: Optional[LLMCache] = None,
+                 chunk_tokens: int = 3000, chunk_overlap: int = 200,
+                 timeout: float = DEFAULT_TIMEOUT, connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+                 max_retries: int = 2, max_connections: int = DEFAULT_MAX_CONNECTIONS,
+                 base_url: Optional[str] = None, api_key: Optional[str] = None,
+                 transport: Optional[httpx.BaseTransport] = None,
+                 async_transport: Optional[httpx.AsyncBaseTransport] = None,
+                 step_rules: Optional[StepRules] = None):
+        self.model = model
+        self.temperature = temperature
+        # One pooled HTTP client per QAGenie, shared by every stage. Pass a
+        # transport (e.g. httpx.MockTransport) or base_url to point the
+        # agent at a local stand-in server.
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.max_retries = max_retries
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=KEEPALIVE_EXPIRY
+        )
+        self.base_url = base_url
+        self.api_key = api_key
+        self.transport = transport
+        self.async_transport = async_transport
+        self._client: Optional[openai.OpenAI] = None
+        self._async_client: Optional[openai.AsyncOpenAI] = None
+        self._async_loop = None
+        # Transcripts longer than chunk_tokens are split and map-reduced
+        self.chunk_tokens = chunk_tokens
+        self.chunk_overlap = chunk_overlap
+        # Response cache shared by all stages; disable with QAGENIE_NO_CACHE=1
+        self.cache = cache if cache is not None else LLMCache.from_env()
+        # Step-to-action rules for fallback scripts; extend with QAGENIE_STEP_RULES
+        self.step_rules = step_rules if step_rules is not None else StepRules.from_config()
         self.system_prompt = """You are QAgenie — a calm, thorough AI QA assistant.
 Your mission is to ensure flawless user experiences on Recruter.ai.
 You carefully read help documents and watch training videos to understand user flows, edge cases, and expected UI behaviors.
@@ -22,9 +84,182 @@ You run tests systematically, capture results, and summarize findings clearly wi
 You never skip edge cases and always consider accessibility, cross-browser compatibility, and user error handling.
 You escalate ambiguous flows with clear context for clarification rather than guessing."""
 
-    def extract_user_flows(self, transcript: str) -> List[Dict[str, Any]]:
-        """Extract user flows from transcript"""
-        prompt = f"""
+    @property
+    def client(self) -> openai.OpenAI:
+        """Shared synchronous client with a keep-alive connection pool"""
+        if self._client is None:
+            transport = self.transport or httpx.HTTPTransport(limits=self.limits)
+            self._client = openai.OpenAI(
+                api_key=self.api_key,
+                base_url=self.base_url,
+                timeout=self.timeout,
+                max_retries=self.max_retries,
+                http_client=httpx.Client(transport=transport, timeout=self.timeout)
+            )
+        return self._client
+
+    @property
+    def async_client(self) -> openai.AsyncOpenAI:
+        """Shared async client for the running event loop
+
+        Async connections are bound to their event loop, so a new pool is
+        created when called from a different loop. Retries are left to
+        _create_async, which backs off on rate limits.
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_loop is not loop:
+            transport = self.async_transport or httpx.AsyncHTTPTransport(limits=self.limits)
+            self._async_client = openai.AsyncOpenAI(
+                api_key=self.api_key,
+                base_url=self.base_url,
+                timeout=self.timeout,
+                max_retries=0,
+                http_client=httpx.AsyncClient(transport=transport, timeout=self.timeout)
+            )
+            self._async_loop = loop
+        return self._async_client
+
+    def _run_async(self, coro):
+        """Run a coroutine to completion, then release its loop's connections"""
+        async def runner():
+            try:
+                return await coro
+            finally:
+                if self._async_client is not None:
+                    await self._async_client.close()
+                    self._async_client = None
+                    self._async_loop = None
+        return asyncio.run(runner())
+
+    def close(self):
+        """Close the pooled HTTP connections"""
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _messages(self, prompt: str) -> List[Dict[str, str]]:
+        return [
+            {"role": "system", "content": self.system_prompt},
+            {"role": "user", "content": prompt}
+        ]
+
+    def _cache_lookup(self, prompt: str):
+        """Return (cache key, cached content) for a prompt"""
+        if self.cache is None:
+            return None, None
+        key = LLMCache.make_key(self.model, self.temperature, self.system_prompt, prompt)
+        return key, self.cache.get(key)
+
+    def _cache_store(self, key: Optional[str], content: Optional[str]):
+        if self.cache is not None and key and content:
+            self.cache.set(key, content, {"model": self.model})
+
+    @staticmethod
+    def _retry_delay(error: Exception, attempt: int) -> float:
+        """Seconds to wait before retrying, honouring Retry-After headers"""
+        response = getattr(error, "response", None)
+        if response is not None:
+            headers = response.headers
+            try:
+                if headers.get("retry-after-ms"):
+                    return float(headers["retry-after-ms"]) / 1000
+                if headers.get("retry-after"):
+                    return float(headers["retry-after"])
+            except ValueError:
+                pass
+        return min(RETRY_BASE_DELAY * (2 ** attempt), RETRY_MAX_DELAY) + random.uniform(0, RETRY_BASE_DELAY)
+
+    def _stream_complete(self, prompt: str) -> Iterator[str]:
+        """Stream one chat completion as text deltas, serving identical requests from the cache
+
+        The full text is cached once the stream ends, so a cache hit yields
+        the whole response as a single chunk.
+        """
+        key, cached = self._cache_lookup(prompt)
+        if cached is not None:
+            yield cached
+            return
+
+        stream = self.client.chat.completions.create(
+            model=self.model,
+            messages=self._messages(prompt),
+            temperature=self.temperature,
+            stream=True
+        )
+        parts = []
+        for chunk in stream:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                parts.append(delta)
+                yield delta
+        self._cache_store(key, "".join(parts))
+
+    def _stream_objects(self, prompt: str, array_key: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Yield each JSON array element of a streamed completion as soon as it closes"""
+        parser = JSONObjectStream(array_key)
+        for delta in self._stream_complete(prompt):
+            yield from parser.feed(delta)
+
+    async def _create_async(self, **kwargs):
+        """Create a chat completion with rate-limit-aware exponential backoff"""
+        for attempt in range(RETRY_MAX_ATTEMPTS):
+            try:
+                return await self.async_client.chat.completions.create(
+                    model=self.model,
+                    temperature=self.temperature,
+                    **kwargs
+                )
+            except (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError) as e:
+                if attempt == RETRY_MAX_ATTEMPTS - 1:
+                    raise
+                delay = self._retry_delay(e, attempt)
+                print(f"⏳ {type(e).__name__}, retrying in {delay:.1f}s ({attempt + 1}/{RETRY_MAX_ATTEMPTS - 1})")
+                await asyncio.sleep(delay)
+
+    async def _complete_async(self, prompt: str) -> str:
+        """Send one chat completion from async code, serving identical requests from the cache"""
+        key, cached = self._cache_lookup(prompt)
+        if cached is not None:
+            return cached
+
+        response = await self._create_async(messages=self._messages(prompt))
+        content = response.choices[0].message.content
+        self._cache_store(key, content)
+        return content
+
+    async def _stream_complete_async(self, prompt: str) -> AsyncIterator[str]:
+        """Async variant of _stream_complete"""
+        key, cached = self._cache_lookup(prompt)
+        if cached is not None:
+            yield cached
+            return
+
+        stream = await self._create_async(messages=self._messages(prompt), stream=True)
+        parts = []
+        async for chunk in stream:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                parts.append(delta)
+                yield delta
+        self._cache_store(key, "".join(parts))
+
+    async def _stream_objects_async(self, prompt: str,
+                                    array_key: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Async variant of _stream_objects"""
+        parser = JSONObjectStream(array_key)
+        async for delta in self._stream_complete_async(prompt):
+            for obj in parser.feed(delta):
+                yield obj
+
+    def _flow_prompt(self, transcript: str) -> str:
+        """Build the prompt that extracts user flows from a transcript"""
+        return f"""
         {self.system_prompt}
         
         Analyze this Recruter.ai transcript and extract all user flows:
@@ -39,54 +274,26 @@ You escalate ambiguous flows with clear context for clarification rather than gu
         
         Return as JSON array of flows.
         """
-        
-        try:
-            # Use the new OpenAI API format with gpt-3.5-turbo
-            client = openai.OpenAI()
-            response = client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": self.system_prompt},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3
-            )
-            
-            content = response.choices[0].message.content
-            
-            # Try to extract JSON from the response
-            try:
-                # Look for JSON in the response
-                json_start = content.find('[')
-                json_end = content.rfind(']') + 1
-                if json_start != -1 and json_end > json_start:
-                    json_str = content[json_start:json_end]
-                    flows = json.loads(json_str)
-                    return flows
-                else:
-                    # If no JSON found, return empty list
-                    return []
-            except json.JSONDecodeError:
-                return []
-                
-        except Exception as e:
-            print(f"Error extracting user flows: {e}")
-            return []
 
-    def generate_test_cases(self, transcript: str) -> Dict[str, Any]:
-        """Generate comprehensive test cases"""
-        
-        # First extract user flows
-        flows = self.extract_user_flows(transcript)
-        
-        prompt = f"""
-        {self.system_prompt}
-        
-        Based on this Recruter.ai transcript and identified user flows, generate comprehensive frontend test cases:
+    def _test_case_prompt(self, flows: List[Dict[str, Any]], transcript: Optional[str] = None) -> str:
+        """Build the test case prompt for a set of flows
+
+        The transcript is only inlined when given; per-flow requests in
+        pipelined mode send just the flow they cover.
+        """
+        if transcript is not None:
+            source = f"""Based on this Recruter.ai transcript and identified user flows, generate comprehensive frontend test cases:
         
         TRANSCRIPT:
         {transcript}
+        """
+        else:
+            source = """Based on this identified Recruter.ai user flow, generate comprehensive frontend test cases:
+        """
+        return f"""
+        {self.system_prompt}
         
+        {source}
         USER FLOWS:
         {json.dumps(flows, indent=2)}
         
@@ -141,41 +348,102 @@ You escalate ambiguous flows with clear context for clarification rather than gu
             ]
         }}
         """
+
+    @staticmethod
+    def _parse_flows(content: str) -> List[Dict[str, Any]]:
+        """Extract the flow objects from a completion"""
+        return list(iter_json_objects(content))
+
+    @staticmethod
+    def _parse_test_cases(content: str) -> List[Dict[str, Any]]:
+        """Extract the test case objects from a completion"""
+        return list(iter_json_objects(content, "test_cases"))
+
+    def _is_long(self, transcript: str) -> bool:
+        return count_tokens(transcript, self.model) > self.chunk_tokens
+
+    def extract_user_flows(self, transcript: str, concurrency: int = 4) -> List[Dict[str, Any]]:
+        """Extract user flows from transcript
+
+        Long transcripts are chunked and map-reduced through
+        extract_user_flows_chunked_async instead of one oversized prompt.
+        """
+        if self._is_long(transcript):
+            return self._run_async(self.extract_user_flows_chunked_async(transcript, concurrency))
+        
+        prompt = self._flow_prompt(transcript)
         
+        flows = []
         try:
-            # Use the new OpenAI API format with gpt-3.5-turbo
-            client = openai.OpenAI()
-            response = client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": self.system_prompt},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3
-            )
-            
-            content = response.choices[0].message.content
-            
-            # Try to extract JSON from the response
-            try:
-                # Look for JSON in the response
-                json_start = content.find('{')
-                json_end = content.rfind('}') + 1
-                if json_start != -1 and json_end > json_start:
-                    json_str = content[json_start:json_end]
-                    test_cases = json.loads(json_str)
-                    return test_cases
-                else:
-                    # If no JSON found, return empty structure
-                    return {"metadata": {}, "test_cases": []}
-            except json.JSONDecodeError as e:
-                print(f"Error parsing JSON response: {e}")
-                return {"metadata": {}, "test_cases": []}
-                
+            for flow in self._stream_objects(prompt):
+                flows.append(flow)
+        except Exception as e:
+            print(f"Error extracting user flows: {e}")
+        return flows
+
+    async def extract_user_flows_chunked_async(self, transcript: str, concurrency: int = 4,
+                                               strict: bool = False) -> List[Dict[str, Any]]:
+        """Map-reduce flow extraction over overlapping transcript chunks
+
+        Every chunk is sent as its own flow extraction request (at most
+        `concurrency` in flight); the per-chunk results are then merged and
+        deduplicated by flow name. A failed chunk contributes no flows
+        rather than failing the whole extraction, unless `strict` is set.
+        """
+        chunks = chunk_transcript(transcript, self.chunk_tokens, self.chunk_overlap, self.model)
+        print(f"✂️ Split transcript into {len(chunks)} chunks")
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def extract(index: int, chunk: str) -> List[Dict[str, Any]]:
+            async with semaphore:
+                try:
+                    content = await self._complete_async(self._flow_prompt(chunk))
+                    flows = self._parse_flows(content)
+                except Exception as e:
+                    print(f"Error extracting user flows from chunk {index + 1}: {e}")
+                    if strict:
+                        raise
+                    return []
+            return flows
+
+        flow_lists = await asyncio.gather(*(extract(i, chunk) for i, chunk in enumerate(chunks)))
+
+        flows = merge_flows(flow_lists)
+        print(f"🧩 Merged {sum(len(f) for f in flow_lists)} chunk flows into {len(flows)} user flows")
+        return flows
+
+    def stream_test_cases(self, transcript: str) -> Iterator[Dict[str, Any]]:
+        """Yield test cases one at a time while the completion is still streaming
+
+        Each case is parsed as soon as its closing brace arrives, so callers
+        can write or convert it before the model has finished.
+        """
+        
+        # First extract user flows
+        flows = self.extract_user_flows(transcript)
+        
+        # Long transcripts are already condensed into flows; only inline short ones
+        yield from self.stream_test_cases_from_flows(flows, None if self._is_long(transcript) else transcript)
+
+    def stream_test_cases_from_flows(self, flows: List[Dict[str, Any]],
+                                     transcript: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Yield test cases for already extracted flows as they stream in"""
+        yield from self._stream_objects(self._test_case_prompt(flows, transcript), "test_cases")
+
+    def generate_test_cases(self, transcript: str) -> Dict[str, Any]:
+        """Generate comprehensive test cases"""
+        cases = []
+        try:
+            for case in self.stream_test_cases(transcript):
+                cases.append(case)
         except Exception as e:
             print(f"Error generating test cases: {e}")
-            # Return fallback test cases if API fails
-            return self.generate_fallback_test_cases(transcript)
+            if not cases:
+                # Return fallback test cases if API fails
+                return self.generate_fallback_test_cases(transcript)
+            print(f"⚠️ Keeping {len(cases)} test cases received before the error")
+        
+        return {"metadata": self._build_metadata(cases), "test_cases": cases}
 
     def generate_fallback_test_cases(self, transcript: str) -> Dict[str, Any]:
         """Generate fallback test cases based on the transcript content"""
@@ -442,15 +710,17 @@ You escalate ambiguous flows with clear context for clarification rather than gu
             "test_cases": test_cases
         }
 
-    def generate_playwright_scripts(self, test_cases: Dict[str, Any]) -> List[Dict[str, str]]:
-        """Convert test cases to Playwright scripts"""
-        
-        prompt = f"""
+    def _script_prompt(self, test_cases: Dict[str, Any]) -> str:
+        """Build the prompt that converts test cases to Playwright scripts"""
+        # Only the cases themselves: volatile metadata such as generated_at
+        # would change the prompt (and its cache key) on every run
+        cases = {"test_cases": test_cases.get('test_cases', [])}
+        return f"""
         {self.system_prompt}
         
         Convert these test cases into executable Playwright test scripts:
         
-        {json.dumps(test_cases, indent=2)}
+        {json.dumps(cases, indent=2)}
         
         For each test case, generate a complete Playwright test script that:
         1. Uses proper selectors (data-testid, aria-label, text content)
@@ -465,230 +735,486 @@ You escalate ambiguous flows with clear context for clarification rather than gu
         - filename: "TC001_CreateInterview.spec.ts"
         - content: complete Playwright test script
         """
+
+    @staticmethod
+    def _parse_scripts(content: str) -> List[Dict[str, str]]:
+        """Extract the script objects from a completion"""
+        return list(iter_json_objects(content))
+
+    def generate_playwright_scripts(self, test_cases: Dict[str, Any], concurrency: int = 1,
+                                    batch_size: int = 1) -> List[Dict[str, str]]:
+        """Convert test cases to Playwright scripts
+
+        With concurrency > 1 each batch of test cases gets its own request,
+        fanned out through generate_playwright_scripts_async.
+        """
+        if concurrency > 1:
+            return self._run_async(self.generate_playwright_scripts_async(test_cases, concurrency, batch_size))
+        
+        prompt = self._script_prompt(test_cases)
         
+        scripts = []
         try:
-            # Use the new OpenAI API format with gpt-3.5-turbo
-            client = openai.OpenAI()
-            response = client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": self.system_prompt},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3
-            )
-            
-            content = response.choices[0].message.content
-            
-            # Try to extract JSON from the response
-            try:
-                # Look for JSON in the response
-                json_start = content.find('[')
-                json_end = content.rfind(']') + 1
-                if json_start != -1 and json_end > json_start:
-                    json_str = content[json_start:json_end]
-                    scripts = json.loads(json_str)
-                    return scripts
-                else:
-                    return []
-            except json.JSONDecodeError as e:
-                print(f"Error parsing Playwright scripts: {e}")
-                return []
-                
+            for script in self._stream_objects(prompt):
+                scripts.append(script)
         except Exception as e:
             print(f"Error generating Playwright scripts: {e}")
-            # Return fallback Playwright scripts
-            return self.generate_fallback_playwright_scripts(test_cases)
+            if not scripts:
+                # Return fallback Playwright scripts
+                return self.generate_fallback_playwright_scripts(test_cases)
+            print(f"⚠️ Keeping {len(scripts)} scripts received before the error")
+        return scripts
+
+    async def generate_playwright_scripts_async(self, test_cases: Dict[str, Any], concurrency: int = 5,
+                                                batch_size: int = 1) -> List[Dict[str, str]]:
+        """Convert test cases to Playwright scripts with one request per batch
+
+        At most `concurrency` requests are in flight at once. Results are
+        collected as they complete and returned in test case order; a batch
+        that fails after all retries falls back to the template scripts.
+        """
+        metadata = test_cases.get('metadata', {})
+        cases = test_cases.get('test_cases', [])
+        batch_size = max(1, batch_size)
+        batches = [cases[i:i + batch_size] for i in range(0, len(cases), batch_size)]
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def convert(index: int, batch: List[Dict[str, Any]]):
+            scripts = await self._convert_batch_async(semaphore, metadata, batch)
+            return index, scripts
+
+        results: List[List[Dict[str, str]]] = [[] for _ in batches]
+        tasks = [convert(i, batch) for i, batch in enumerate(batches)]
+        for done, future in enumerate(asyncio.as_completed(tasks), 1):
+            index, scripts = await future
+            results[index] = scripts
+            print(f"✅ [{done}/{len(batches)}] Converted {', '.join(s.get('filename', '?') for s in scripts)}")
+
+        return [script for batch in results for script in batch]
+
+    async def _convert_batch_async(self, semaphore: asyncio.Semaphore,
+                                   metadata: Dict[str, Any], batch: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+        """Convert one batch of test cases, falling back to template scripts on failure"""
+        subset = {"metadata": metadata, "test_cases": batch}
+        async with semaphore:
+            try:
+                content = await self._complete_async(self._script_prompt(subset))
+                scripts = self._parse_scripts(content)
+                if not scripts:
+                    raise ValueError("no scripts found in response")
+                return scripts
+            except Exception as e:
+                ids = ", ".join(case.get('id', '?') for case in batch)
+                print(f"Error generating Playwright scripts for {ids}: {e}")
+        return self.generate_fallback_playwright_scripts(subset)
+
+    @staticmethod
+    def _build_metadata(cases: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Summarize a list of test cases in the report metadata format"""
+        categories = {"functional": 0, "accessibility": 0, "performance": 0, "security": 0}
+        for case in cases:
+            category = str(case.get('category', 'functional')).lower()
+            categories[category] = categories.get(category, 0) + 1
+        return {
+            "generated_at": datetime.now().isoformat(),
+            "total_cases": len(cases),
+            "categories": categories
+        }
+
+    def generate_pipelined(self, transcript: str, concurrency: int = 5) -> Tuple[Dict[str, Any], List[Dict[str, str]]]:
+        """Run flow extraction, case generation and script generation as one pipeline
+
+        Returns (test_cases, playwright_scripts) like the staged methods.
+        """
+        return self._run_async(self.generate_pipelined_async(transcript, concurrency))
+
+    async def generate_pipelined_async(self, transcript: str,
+                                       concurrency: int = 5) -> Tuple[Dict[str, Any], List[Dict[str, str]]]:
+        """Overlap the three LLM stages instead of running them back to back
+
+        The flow extraction response is streamed and every flow is handed to
+        its own test case request as soon as it is parsed; each generated case
+        is then converted to a script straight away. Case ids are derived from
+        the flow and case position (TC01-02 = flow 1, case 2) so they do not
+        depend on which request finishes first.
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        flow_tasks = []
+
+        async for flow in self._iter_flows_async(transcript, concurrency):
+            slot = len(flow_tasks) + 1
+            print(f"🧩 Extracted flow {slot}: {flow.get('name', flow.get('flow_name', 'Unnamed'))}")
+            flow_tasks.append(asyncio.create_task(self._generate_flow_async(slot, flow, semaphore)))
+
+        cases = []
+        scripts = []
+        for flow_cases, flow_scripts in await asyncio.gather(*flow_tasks):
+            cases.extend(flow_cases)
+            scripts.extend(flow_scripts)
+
+        if not cases:
+            # Same behaviour as the staged path when the API is unavailable
+            test_cases = self.generate_fallback_test_cases(transcript)
+            return test_cases, self.generate_fallback_playwright_scripts(test_cases)
+
+        return {"metadata": self._build_metadata(cases), "test_cases": cases}, scripts
+
+    def _fingerprint_salt(self) -> str:
+        """Everything besides the flow itself that shapes its generated artifacts"""
+        return json.dumps({
+            "model": self.model,
+            "temperature": self.temperature,
+            "case_prompt": self._test_case_prompt([]),
+            "script_prompt": self._script_prompt({}),
+        }, sort_keys=True)
+
+    def generate_incremental(self, transcript: str, manifest: GenerationManifest,
+                             concurrency: int = 5) -> Tuple[Dict[str, Any], List[Dict[str, str]]]:
+        """Regenerate only the flows that are new or changed since the last run
+
+        Returns (test_cases, playwright_scripts) like generate_pipelined.
+        """
+        return self._run_async(self.generate_incremental_async(transcript, manifest, concurrency))
+
+    async def generate_incremental_async(self, transcript: str, manifest: GenerationManifest,
+                                         concurrency: int = 5) -> Tuple[Dict[str, Any], List[Dict[str, str]]]:
+        """Reuse manifest artifacts for unchanged flows and generate the rest
+
+        Flows are fingerprinted after extraction; any fingerprint already in
+        the manifest reuses its stored cases and scripts without an LLM call.
+        The manifest is updated in place (call prune() and save() to persist
+        it). It is only marked complete when extraction finished without
+        errors and found flows; otherwise flows missing from this run may
+        just have failed to arrive, so nothing may be pruned.
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        salt = self._fingerprint_salt()
+        flows = []
+        try:
+            async for flow in self._iter_flows_async(transcript, concurrency, strict=True):
+                flows.append(flow)
+            manifest.complete = bool(flows)
+        except Exception as e:
+            print(f"Error extracting user flows: {e}")
+        if not flows:
+            test_cases = self.generate_fallback_test_cases(transcript)
+            return test_cases, self.generate_fallback_playwright_scripts(test_cases)
+
+        fingerprints = [GenerationManifest.fingerprint(flow, salt) for flow in flows]
+        entries = [manifest.lookup(fp) for fp in fingerprints]
+        tasks = {}
+        for index, (flow, entry) in enumerate(zip(flows, entries)):
+            if entry is None:
+                slot = manifest.slot_for(flow)
+                tasks[index] = (slot, asyncio.create_task(self._generate_flow_async(slot, flow, semaphore)))
+        print(f"♻️ Reusing {len(flows) - len(tasks)} unchanged flows, regenerating {len(tasks)}")
+
+        cases = []
+        scripts = []
+        for index, (flow, entry) in enumerate(zip(flows, entries)):
+            if entry is not None:
+                flow_cases, flow_scripts = entry["cases"], entry["scripts"]
+            else:
+                slot, task = tasks[index]
+                flow_cases, flow_scripts = await task
+                # Leave failed flows out of the manifest so the next run retries them
+                if flow_cases:
+                    manifest.record(fingerprints[index], slot, flow, flow_cases, flow_scripts)
+            cases.extend(flow_cases)
+            scripts.extend(flow_scripts)
+
+        return {"metadata": self._build_metadata(cases), "test_cases": cases}, scripts
+
+    async def _iter_flows_async(self, transcript: str, concurrency: int,
+                                strict: bool = False) -> AsyncIterator[Dict[str, Any]]:
+        """Yield user flows, streaming them when the transcript fits one prompt
+
+        Extraction errors end the stream quietly, or propagate when `strict`.
+        """
+        if self._is_long(transcript):
+            # Chunk flows must be merged before they are usable, so this stage runs to completion
+            for flow in await self.extract_user_flows_chunked_async(transcript, concurrency, strict):
+                yield flow
+            return
+        try:
+            async for flow in self._stream_objects_async(self._flow_prompt(transcript)):
+                yield flow
+        except Exception as e:
+            if strict:
+                raise
+            print(f"Error extracting user flows: {e}")
+
+    async def _generate_flow_async(self, slot: int, flow: Dict[str, Any],
+                                   semaphore: asyncio.Semaphore) -> Tuple[List[Dict[str, Any]], List[Dict[str, str]]]:
+        """Generate the test cases and scripts for one flow
+
+        Cases are numbered TC<slot>-<n>, and each one starts converting to
+        a script as soon as it is parsed from the stream.
+        """
+        pending: List[Tuple[Dict[str, Any], "asyncio.Task"]] = []
+        async with semaphore:
+            try:
+                async for case in self._stream_objects_async(self._test_case_prompt([flow]), "test_cases"):
+                    case['id'] = f"TC{slot:02d}-{len(pending) + 1:02d}"
+                    task = asyncio.create_task(self._convert_batch_async(semaphore, {}, [case]))
+                    pending.append((case, task))
+            except Exception as e:
+                print(f"Error generating test cases for flow {slot}: {e}")
+        print(f"📝 Flow {slot}: {len(pending)} test cases")
+
+        scripts = []
+        for _, task in pending:
+            scripts.extend(await task)
+        return [case for case, _ in pending], scripts
 
     def generate_fallback_playwright_scripts(self, test_cases: Dict[str, Any]) -> List[Dict[str, str]]:
         """Generate fallback Playwright scripts"""
         print("🔄 Generating fallback Playwright scripts...")
         
-        scripts = []
         cases = test_cases.get('test_cases', [])
+        rows = [
+            {
+                "test_id": case.get('id', 'TC001'),
+                "title": case.get('title', 'Test Case'),
+                "category": case.get('category', 'Functional'),
+                "priority": case.get('priority', 'Medium'),
+                "steps": "\n".join(f"        {line}" for line in self.step_rules.translate_all(case.get('steps', []))),
+            }
+            for case in cases
+        ]
         
-        for case in cases:
-            test_id = case.get('id', 'TC001')
-            title = case.get('title', 'Test Case')
-            steps = case.get('steps', [])
-            
-            # Generate Playwright script content
-            script_content = f"""import {{ test, expect }} from '@playwright/test';
-import {{ AxeBuilder }} from '@axe-core/playwright';
-
-test('{test_id}: {title}', async ({{ page }}) => {{
-    // Test metadata
-    const testId = '{test_id}';
-    const category = '{case.get('category', 'Functional')}';
-    const priority = '{case.get('priority', 'Medium')}';
-    
-    console.log(`Running test: ${{testId}} - ${{category}} (${{priority}})`);
-    
-    try {{
-        // Navigate to Recruter.ai
-        await page.goto('https://www.recruter.ai');
-        
-        // Test steps
-"""
-            
-            # Add steps based on test case
-            for i, step in enumerate(steps):
-                if "navigate" in step.lower() or "go to" in step.lower():
-                    script_content += f"        await page.goto('https://www.recruter.ai');\n"
-                elif "click" in step.lower():
-                    script_content += f"        await page.click('text={step.split()[-1]}');\n"
-                elif "enter" in step.lower() or "fill" in step.lower():
-                    script_content += f"        await page.fill('input[placeholder*=\"input\"]', 'test data');\n"
-                elif "verify" in step.lower() or "check" in step.lower():
-                    script_content += f"        await expect(page.locator('text={step.split()[-1]}')).toBeVisible();\n"
-                else:
-                    script_content += f"        // {step}\n"
-            
-            script_content += f"""
-        // Accessibility check
-        const accessibilityScanResults = await new AxeBuilder({{ page }}).analyze();
-        expect(accessibilityScanResults.violations).toEqual([]);
-        
-        // Performance metrics
-        const performanceMetrics = await page.evaluate(() => {{
-            const navigation = performance.getEntriesByType('navigation')[0];
-            return {{
-                loadTime: navigation.loadEventEnd - navigation.loadEventStart,
-                domContentLoaded: navigation.domContentLoadedEventEnd - navigation.domContentLoadedEventStart
-            }};
-        }});
-        
-        console.log('Performance metrics:', performanceMetrics);
-        
-        // Take screenshot
-        await page.screenshot({{ path: `report/${{testId}}_success.png` }});
-        
-    }} catch (error) {{
-        // Take screenshot on failure
-        await page.screenshot({{ 
-            path: `report/${{testId}}_failure_${{Date.now()}}.png`,
-            fullPage: true 
-        }});
-        throw error;
-    }}
-}});
-"""
-            
-            scripts.append({
-                "filename": f"{test_id}_{title.replace(' ', '_')}.spec.ts",
-                "content": script_content
-            })
+        # The spec skeleton is compiled once and rendered for the whole batch
+        scripts = [
+            {
+                "filename": f"{row['test_id']}_{row['title'].replace(' ', '_')}.spec.ts",
+                "content": content
+            }
+            for row, content in zip(rows, FALLBACK_SPEC.render_many(rows))
+        ]
         
         return scripts
 
-def main():
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="QAgenie - generate test cases and Playwright scripts")
+    parser.add_argument("--transcript", default="recruter_transcript.txt",
+                        help="transcript file to generate test cases from")
+    parser.add_argument("--concurrency", type=int, default=int(os.getenv("QAGENIE_CONCURRENCY", "1")),
+                        help="parallel script generation requests (1 = single prompt)")
+    parser.add_argument("--batch-size", type=int, default=1,
+                        help="test cases per script generation request in concurrent mode")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="overlap flow extraction, case generation and script generation")
+    parser.add_argument("--incremental", action="store_true",
+                        help="only regenerate flows that changed since the last run (see testcases/manifest.json)")
+    parser.add_argument("--backend", choices=["openai", "mock"], default=os.getenv("QAGENIE_BACKEND", "openai"),
+                        help="LLM backend; 'mock' replays recorded/synthetic responses offline (QAGENIE_MOCK_* vars)")
+    parser.add_argument("--timeout", type=float, default=float(os.getenv("QAGENIE_TIMEOUT", DEFAULT_TIMEOUT)),
+                        help="per-request timeout in seconds")
+    parser.add_argument("--max-retries", type=int, default=int(os.getenv("QAGENIE_MAX_RETRIES", "2")),
+                        help="retries for failed requests")
+    parser.add_argument("--gzip-report", action="store_true",
+                        default=os.getenv("QAGENIE_GZIP_REPORT", "").lower() in ("1", "true", "yes"),
+                        help="write the markdown report gzip-compressed (testcases_<timestamp>.md.gz)")
+    parser.add_argument("--dedup-threshold", type=float,
+                        default=float(os.getenv("QAGENIE_DEDUP_THRESHOLD", DEFAULT_THRESHOLD)),
+                        help="merge cases whose title+steps similarity reaches this (0 disables; staged mode only)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
     """Main function to generate test cases"""
+    args = parse_args(argv)
     
     # Load the transcript
-    with open("recruter_transcript.txt", "r", encoding="utf-8") as f:
+    with open(args.transcript, "r", encoding="utf-8") as f:
         transcript = f.read()
     
     # Initialize QAgenie
-    qa_genie = QAGenie()
+    client_options = mock_transports(mock_from_env()) if args.backend == "mock" else {}
+    qa_genie = QAGenie(timeout=args.timeout, max_retries=args.max_retries, **client_options)
     
     print("🧩 QAgenie - AI-powered QA Agent")
     print("=" * 50)
     
-    # Generate test cases
-    print("📝 Generating comprehensive test cases...")
-    test_cases = qa_genie.generate_test_cases(transcript)
-    
-    # Generate Playwright scripts
-    print("🔧 Converting to Playwright scripts...")
-    playwright_scripts = qa_genie.generate_playwright_scripts(test_cases)
-    
-    # Create output directories
-    os.makedirs("testcases", exist_ok=True)
-    os.makedirs("test", exist_ok=True)
-    os.makedirs("report", exist_ok=True)
+    manifest = None
+    if args.incremental:
+        # Reuse artifacts of unchanged flows recorded by previous runs
+        print("📝 Generating test cases and Playwright scripts (incremental)...")
+        manifest = GenerationManifest().load()
+        test_cases, playwright_scripts = qa_genie.generate_incremental(
+            transcript, manifest, concurrency=max(1, args.concurrency)
+        )
+    elif args.pipeline:
+        # Stream flows into case generation and cases into script generation
+        print("📝 Generating test cases and Playwright scripts (pipelined)...")
+        test_cases, playwright_scripts = qa_genie.generate_pipelined(
+            transcript, concurrency=max(1, args.concurrency)
+        )
+    else:
+        # Generate test cases
+        print("📝 Generating comprehensive test cases...")
+        test_cases = qa_genie.generate_test_cases(transcript)
+        
+        # Drop near-duplicate cases before they become browser tests
+        test_cases, clusters = deduplicate_test_cases(test_cases, args.dedup_threshold)
+        if clusters:
+            merged = sum(len(cluster["merged"]) for cluster in clusters)
+            print(f"🧹 Merged {merged} near-duplicate test cases into {len(clusters)} clusters")
+            for cluster in clusters:
+                print(f"   {cluster['kept']} <- {', '.join(map(str, cluster['merged']))}")
+            summary = qa_genie._build_metadata(test_cases["test_cases"])
+            test_cases["metadata"].update(total_cases=summary["total_cases"], categories=summary["categories"])
+        
+        # Generate Playwright scripts
+        print("🔧 Converting to Playwright scripts...")
+        playwright_scripts = qa_genie.generate_playwright_scripts(
+            test_cases, concurrency=args.concurrency, batch_size=args.batch_size
+        )
+    qa_genie.close()
     
     # Save test cases in multiple formats
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    write_stats = write_artifacts(test_cases, playwright_scripts, timestamp, gzip_report=args.gzip_report)
+
+    if manifest is not None and not manifest.complete:
+        # Flows missing from a failed extraction are not gone; keep their scripts and the manifest
+        print("⚠️ Flow extraction did not complete - keeping existing scripts and manifest")
+    elif manifest is not None:
+        # Remove scripts of flows that no longer exist, then persist the manifest
+        produced = {script.get('filename') for script in playwright_scripts}
+        for filename in manifest.prune() - produced:
+            stale_path = os.path.join("test", filename)
+            if os.path.exists(stale_path):
+                os.remove(stale_path)
+                print(f"🗑️ Removed stale script {stale_path}")
+        manifest.save()
+
+    # Index the run in the test case store (deduplicated across runs)
+    with TestCaseStore() as store:
+        stored = store.add_run(test_cases, source=args.transcript)
+
+    # Generate summary
+    print(f"✅ Generated {len(test_cases.get('test_cases', []))} test cases")
+    print(f"✅ Created {len(playwright_scripts)} Playwright scripts")
+    print(f"✅ Saved to testcases/testcases_{timestamp}.json")
+    print(f"✅ Saved to {os.path.normpath(report_path(timestamp, gzip_report=args.gzip_report))}")
+    print(f"✅ Saved Playwright scripts to test/ directory "
+          f"({write_stats['written']} written, {write_stats['unchanged']} unchanged)")
+    print(f"✅ Stored run #{stored['run_id']} in {store.path} ({stored['new_cases']} new cases)")
+
+def write_artifacts(test_cases: Dict[str, Any], playwright_scripts: List[Dict[str, str]],
+                    timestamp: str, root: str = ".", gzip_report: bool = False,
+                    include_report: bool = True, writer: Optional[ArtifactWriter] = None) -> Dict[str, int]:
+    """Save the JSON test cases, markdown report and Playwright scripts under root"""
     
-    # Save JSON test cases
-    with open(f"testcases/testcases_{timestamp}.json", "w", encoding="utf-8") as f:
-        json.dump(test_cases, f, indent=2)
-    
-    # Save Markdown report
-    markdown_content = generate_markdown_report(test_cases)
-    with open(f"testcases/testcases_{timestamp}.md", "w", encoding="utf-8") as f:
-        f.write(markdown_content)
+    # Create output directories
+    os.makedirs(os.path.join(root, "testcases"), exist_ok=True)
+    os.makedirs(os.path.join(root, "test"), exist_ok=True)
+    os.makedirs(os.path.join(root, "report"), exist_ok=True)
     
-    # Save Playwright scripts
+    # JSON test cases and Playwright scripts are written atomically in parallel;
+    # scripts whose content did not change keep their mtime
+    files = [(os.path.join(root, "testcases", f"testcases_{timestamp}.json"), json.dumps(test_cases, indent=2))]
     for script in playwright_scripts:
         filename = script.get('filename', f"TC{len(playwright_scripts)}.spec.ts")
-        content = script.get('content', '')
-        
-        with open(f"test/{filename}", "w", encoding="utf-8") as f:
-            f.write(content)
+        files.append((os.path.join(root, "test", filename), script.get('content', '')))
+    stats = (writer or ArtifactWriter()).write_many(files)
     
-    # Generate summary
-    print(f"✅ Generated {len(test_cases.get('test_cases', []))} test cases")
-    print(f"✅ Created {len(playwright_scripts)} Playwright scripts")
-    print(f"✅ Saved to testcases/testcases_{timestamp}.json")
-    print(f"✅ Saved to testcases/testcases_{timestamp}.md")
-    print(f"✅ Saved Playwright scripts to test/ directory")
+    # Stream the Markdown report
+    if include_report:
+        write_markdown_report(test_cases, report_path(timestamp, root, gzip_report))
+    
+    return stats
 
-def generate_markdown_report(test_cases: Dict[str, Any]) -> str:
-    """Generate a comprehensive markdown report"""
+def report_path(timestamp: str, root: str = ".", gzip_report: bool = False) -> str:
+    """Location of the markdown report for a run"""
+    suffix = ".md.gz" if gzip_report else ".md"
+    return os.path.join(root, "testcases", f"testcases_{timestamp}{suffix}")
+
+def iter_markdown_report(test_cases: Dict[str, Any]) -> Iterator[str]:
+    """Yield the markdown report one section at a time"""
     
     metadata = test_cases.get('metadata', {})
     cases = test_cases.get('test_cases', [])
+    total = metadata.get('total_cases')
+    if total is None:
+        total = len(cases) if hasattr(cases, '__len__') else 'Unknown'
     
-    report = f"""# QA Test Cases Report - Recruter.ai
+    header = [f"""# QA Test Cases Report - Recruter.ai
 
 **Generated:** {metadata.get('generated_at', 'Unknown')}
-**Total Test Cases:** {metadata.get('total_cases', len(cases))}
+**Total Test Cases:** {total}
 
 ## Summary by Category
 
-"""
+"""]
     
     categories = metadata.get('categories', {})
     for category, count in categories.items():
-        report += f"- **{category.title()}:** {count} tests\n"
+        header.append(f"- **{category.title()}:** {count} tests\n")
     
-    report += "\n## Test Cases\n\n"
+    header.append("\n## Test Cases\n\n")
+    yield "".join(header)
     
     for case in cases:
-        report += f"""### {case.get('id', 'Unknown')}: {case.get('title', 'Untitled')}
+        yield _markdown_section(case)
+
+def _markdown_section(case: Dict[str, Any]) -> str:
+    """Markdown for a single test case"""
+    parts = [f"""### {case.get('id', 'Unknown')}: {case.get('title', 'Untitled')}
 
 **Priority:** {case.get('priority', 'Unknown')} | **Category:** {case.get('category', 'Unknown')}
 
 **Description:** {case.get('description', 'No description')}
 
 **Prerequisites:**
-"""
-        for prereq in case.get('prerequisites', []):
-            report += f"- {prereq}\n"
-        
-        report += "\n**Steps:**\n"
-        for i, step in enumerate(case.get('steps', []), 1):
-            report += f"{i}. {step}\n"
-        
-        report += f"\n**Expected Results:** {case.get('expected_results', 'Not specified')}\n"
-        
-        if case.get('accessibility_checks'):
-            report += "\n**Accessibility Checks:**\n"
-            for check in case.get('accessibility_checks', []):
-                report += f"- {check}\n"
-        
-        if case.get('performance_metrics'):
-            report += "\n**Performance Metrics:**\n"
-            for metric in case.get('performance_metrics', []):
-                report += f"- {metric}\n"
-        
-        report += f"\n**Browser Compatibility:** {', '.join(case.get('browser_compatibility', []))}\n"
-        report += f"**Mobile Compatible:** {'Yes' if case.get('mobile_compatibility') else 'No'}\n"
-        
-        report += "\n---\n\n"
+"""]
+    parts.extend(f"- {prereq}\n" for prereq in case.get('prerequisites', []))
+    
+    parts.append("\n**Steps:**\n")
+    parts.extend(f"{i}. {step}\n" for i, step in enumerate(case.get('steps', []), 1))
+    
+    parts.append(f"\n**Expected Results:** {case.get('expected_results', 'Not specified')}\n")
+    
+    if case.get('accessibility_checks'):
+        parts.append("\n**Accessibility Checks:**\n")
+        parts.extend(f"- {check}\n" for check in case.get('accessibility_checks', []))
+    
+    if case.get('performance_metrics'):
+        parts.append("\n**Performance Metrics:**\n")
+        parts.extend(f"- {metric}\n" for metric in case.get('performance_metrics', []))
     
-    return report
+    parts.append(f"\n**Browser Compatibility:** {', '.join(case.get('browser_compatibility', []))}\n")
+    parts.append(f"**Mobile Compatible:** {'Yes' if case.get('mobile_compatibility') else 'No'}\n")
+    
+    parts.append("\n---\n\n")
+    return "".join(parts)
+
+def write_markdown_report(test_cases: Dict[str, Any], path: str, gzip_report: Optional[bool] = None) -> str:
+    """Stream the markdown report to path section by section; gzip if path ends in .gz"""
+    if gzip_report is None:
+        gzip_report = path.endswith(".gz")
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    # Stream into a temp file and rename, so readers never see a partial report
+    tmp_path = f"{path}.tmp"
+    if gzip_report:
+        handle = gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=6)
+    else:
+        handle = open(tmp_path, "w", encoding="utf-8", buffering=REPORT_BUFFER_SIZE)
+    try:
+        with handle as f:
+            for section in iter_markdown_report(test_cases):
+                f.write(section)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return path
+
+def generate_markdown_report(test_cases: Dict[str, Any]) -> str:
+    """Generate a comprehensive markdown report"""
+    return "".join(iter_markdown_report(test_cases))
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,131 @@
+"""
+Generation Manifest
+Fingerprints user flows and their generated artifacts for incremental reruns
+"""
+
+import os
+import json
+import hashlib
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set
+
+from transcript_chunker import flow_key
+
+MANIFEST_VERSION = 2  # 2: case ids are TC<slot>-<n>
+DEFAULT_MANIFEST_PATH = "testcases/manifest.json"
+
+
+class GenerationManifest:
+    """Maps each user flow fingerprint to the cases and scripts generated for it.
+
+    A fingerprint hashes the flow itself together with a salt describing
+    how it was generated (model, temperature, prompt templates), so editing
+    either one invalidates the entry. Every flow name also owns a stable
+    numeric slot that becomes the prefix of its case ids, so reused and
+    regenerated flows keep the same ids and script filenames across runs.
+    """
+
+    def __init__(self, path: str = DEFAULT_MANIFEST_PATH):
+        self.path = path
+        self.data = self._empty()
+        self._used_slots: Set[int] = set()
+        self._seen: Set[str] = set()
+        self._outdated_files: Set[str] = set()
+        # Set by the generator once every flow of the transcript was extracted
+        self.complete = False
+
+    @staticmethod
+    def _empty() -> Dict[str, Any]:
+        return {"version": MANIFEST_VERSION, "updated_at": None, "slots": {}, "flows": {}}
+
+    def load(self) -> "GenerationManifest":
+        """Load the manifest from disk, starting fresh if missing or outdated"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == MANIFEST_VERSION:
+                self.data = data
+            else:
+                # Nothing is reused, but flows keep their slots and old scripts are pruned
+                self.data["slots"] = data.get("slots", {})
+                self._outdated_files = self._script_files(data)
+        except (OSError, json.JSONDecodeError):
+            self.data = self._empty()
+        return self
+
+    def save(self):
+        """Write the manifest atomically"""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self.data["updated_at"] = datetime.now().isoformat()
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.data, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    @staticmethod
+    def fingerprint(flow: Dict[str, Any], salt: str) -> str:
+        """Content hash of a flow plus the generation settings"""
+        payload = json.dumps(flow, sort_keys=True, ensure_ascii=False) + "\0" + salt
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def lookup(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """Return the stored artifacts for a fingerprint, if any"""
+        entry = self.data["flows"].get(fingerprint)
+        if entry is not None:
+            self._used_slots.add(entry["slot"])
+            self._seen.add(fingerprint)
+        return entry
+
+    def slot_for(self, flow: Dict[str, Any]) -> int:
+        """Stable slot number for a flow, allocating a new one if needed"""
+        slots = self.data["slots"]
+        base = flow_key(flow)
+        key = base
+        occurrence = 1
+        while True:
+            slot = slots.get(key)
+            if slot is None:
+                slot = max(list(slots.values()) + [0]) + 1
+                slots[key] = slot
+            if slot not in self._used_slots:
+                self._used_slots.add(slot)
+                return slot
+            # Two flows with the same name in one run get distinct slots
+            occurrence += 1
+            key = f"{base}#{occurrence}"
+
+    def record(self, fingerprint: str, slot: int, flow: Dict[str, Any],
+               cases: List[Dict[str, Any]], scripts: List[Dict[str, str]]):
+        """Store freshly generated artifacts for a flow"""
+        self.data["flows"][fingerprint] = {
+            "slot": slot,
+            "flow": flow,
+            "cases": cases,
+            "scripts": scripts,
+        }
+        self._seen.add(fingerprint)
+
+    def script_files(self) -> Set[str]:
+        """Filenames of every script recorded in the manifest"""
+        return self._script_files(self.data)
+
+    @staticmethod
+    def _script_files(data: Dict[str, Any]) -> Set[str]:
+        return {
+            script.get("filename")
+            for entry in data.get("flows", {}).values()
+            for script in entry.get("scripts", [])
+            if script.get("filename")
+        }
+
+    def prune(self) -> Set[str]:
+        """Drop flows not seen this run; return script files no longer produced.
+
+        Does nothing unless the run is ``complete``: after a failed
+        extraction, unseen flows are not known to be gone.
+        """
+        if not self.complete:
+            return set()
+        before = self.script_files() | self._outdated_files
+        self.data["flows"] = {fp: entry for fp, entry in self.data["flows"].items() if fp in self._seen}
+        return before - self.script_files()
@@ -0,0 +1,123 @@
+"""
+Incremental JSON Parsing
+Yields JSON objects from a streamed LLM completion as soon as they close
+"""
+
+import json
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+CODE_FENCE = "```"
+# Key recorded for an array that opens where no key is legal, i.e. after a stray "{"
+_ORPHAN = object()
+
+
+class JSONObjectStream:
+    """Incrementally extract objects that are elements of a JSON array.
+
+    Feed completion text in arbitrary chunks; every ``{...}`` whose parent
+    is an array is parsed and yielded the moment its closing brace arrives.
+    With ``array_key`` set, only elements of a top-level array or of an
+    array stored under that key (e.g. ``"test_cases"``) are yielded, so
+    objects in sibling fields like ``metadata`` are skipped. Objects nested
+    inside a yielded element are returned as part of that element.
+
+    Parsing never fails on malformed input: a stray brace in surrounding
+    prose or a truncated response simply yields every object that did
+    complete. A markdown code fence resets the scanner, so braces in prose
+    before a fenced JSON block are ignored.
+    """
+
+    def __init__(self, array_key: Optional[str] = None):
+        self.array_key = array_key
+        self.count = 0
+        self._reset()
+        self._fence_ticks = 0
+
+    def _reset(self):
+        # Each stack entry is (bracket, key the container was stored under)
+        self._stack: List[Tuple[str, Any]] = []
+        self._in_string = False
+        self._escape = False
+        self._string: List[str] = []
+        self._last_string: Optional[str] = None
+        self._key: Optional[str] = None
+        self._capture: List[str] = []
+        self._capture_depth: Optional[int] = None
+
+    def _wants(self) -> bool:
+        """Whether an object opening now is an element we should yield"""
+        if not self._stack or self._stack[-1][0] != "[":
+            return False
+        if self.array_key is None or len(self._stack) == 1:
+            return True
+        return self._stack[-1][1] in (self.array_key, _ORPHAN)
+
+    def feed(self, text: str) -> Iterator[Dict[str, Any]]:
+        """Consume a chunk of text and yield any objects it completes"""
+        for char in text:
+            capturing = self._capture_depth is not None
+            if capturing:
+                self._capture.append(char)
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if not capturing:
+                        self._last_string = "".join(self._string)
+                elif not capturing:
+                    self._string.append(char)
+                continue
+
+            if char == "`":
+                self._fence_ticks += 1
+                if self._fence_ticks == len(CODE_FENCE) and not capturing:
+                    self._reset()
+                continue
+            self._fence_ticks = 0
+
+            if char == '"':
+                self._in_string = True
+                self._string = []
+            elif char == ":":
+                self._key = self._last_string
+            elif char in "{[":
+                if char == "{" and not capturing and self._wants():
+                    self._capture = [char]
+                    self._capture_depth = len(self._stack)
+                key = None
+                if char == "[":
+                    key = self._key
+                    if key is None and self._stack and self._stack[-1][0] == "{":
+                        key = _ORPHAN
+                self._stack.append((char, key))
+                self._key = None
+            elif char in "}]":
+                if self._stack:
+                    self._stack.pop()
+                self._key = None
+                if capturing and len(self._stack) == self._capture_depth:
+                    obj = self._finish_capture()
+                    if obj is not None:
+                        self.count += 1
+                        yield obj
+            elif char == ",":
+                self._key = None
+
+    def _finish_capture(self):
+        text = "".join(self._capture)
+        self._capture = []
+        self._capture_depth = None
+        try:
+            obj = json.loads(text)
+        except json.JSONDecodeError:
+            return None
+        return obj if isinstance(obj, dict) else None
+
+
+def iter_json_objects(text: str, array_key: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Yield array-element objects from a complete completion string"""
+    yield from JSONObjectStream(array_key).feed(text)
@@ -0,0 +1,162 @@
+"""
+LLM Response Cache
+Content-addressed on-disk cache for QAgenie chat completions
+"""
+
+import os
+import json
+import time
+import hashlib
+from pathlib import Path
+from typing import Optional, Dict, Any
+
+DEFAULT_CACHE_DIR = ".qagenie_cache/llm"
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Writes between full directory scans; in between, a running size total decides
+EVICT_INTERVAL = 100
+
+
+class LLMCache:
+    """Persistent response cache with size-based LRU eviction and a TTL.
+
+    Each entry lives in its own ``<sha256>.json`` file. The key is a hash of
+    model, temperature, system prompt and user prompt, so an unchanged prompt
+    always maps to the same file. File mtime is the write time and the only
+    TTL clock; atime is the LRU clock: hits set it (leaving mtime alone) and
+    eviction removes the least recently used entries first.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR,
+                 ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._total_bytes: Optional[int] = None  # unknown until the first scan
+        self._writes = 0
+
+    @classmethod
+    def from_env(cls) -> Optional["LLMCache"]:
+        """Build a cache from QAGENIE_CACHE_* variables, or None if disabled"""
+        if os.getenv("QAGENIE_NO_CACHE", "").lower() in ("1", "true", "yes"):
+            return None
+        return cls(
+            cache_dir=os.getenv("QAGENIE_CACHE_DIR", DEFAULT_CACHE_DIR),
+            ttl_seconds=float(os.getenv("QAGENIE_CACHE_TTL", DEFAULT_TTL_SECONDS)),
+            max_bytes=int(float(os.getenv("QAGENIE_CACHE_MAX_MB", DEFAULT_MAX_BYTES / (1024 * 1024))) * 1024 * 1024),
+        )
+
+    @staticmethod
+    def make_key(model: str, temperature: float, system_prompt: str, prompt: str) -> str:
+        """Hash the request parameters that determine the completion"""
+        payload = json.dumps(
+            {"model": model, "temperature": temperature, "system": system_prompt, "user": prompt},
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def _expired(self, stat: os.stat_result, now: float) -> bool:
+        return now - stat.st_mtime > self.ttl_seconds
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached completion for key, or None on miss/expiry"""
+        path = self._path(key)
+        try:
+            stat = path.stat()
+            if self._expired(stat, time.time()):
+                self._remove(path)
+                self.misses += 1
+                return None
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            self.misses += 1
+            return None
+
+        try:
+            os.utime(path, ns=(time.time_ns(), stat.st_mtime_ns))
+        except OSError:
+            pass
+        self.hits += 1
+        return entry.get("content")
+
+    def set(self, key: str, content: str, metadata: Optional[Dict[str, Any]] = None):
+        """Store a completion and evict old entries if over the size limit.
+
+        The directory is only rescanned on the first write, every
+        EVICT_INTERVAL writes, or when the running size total goes over
+        max_bytes, so a burst of writes does not stat the whole cache each time.
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        entry = {"created_at": time.time(), "content": content, "metadata": metadata or {}}
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            replaced = path.stat().st_size if path.exists() else 0
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            written = tmp_path.stat().st_size
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"⚠️ Could not write LLM cache entry: {e}")
+            self._remove(tmp_path)
+            return
+        self._writes += 1
+        if self._total_bytes is not None:
+            self._total_bytes += written - replaced
+        if self._total_bytes is None or self._total_bytes > self.max_bytes or self._writes >= EVICT_INTERVAL:
+            self.evict()
+
+    def evict(self):
+        """Drop expired entries, then least recently used ones until under max_bytes"""
+        self._writes = 0
+        if not self.cache_dir.exists():
+            self._total_bytes = 0
+            return
+
+        now = time.time()
+        entries = []
+        total = 0
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            if self._expired(stat, now):
+                self._remove(path)
+                continue
+            entries.append((stat.st_atime, stat.st_size, path))
+            total += stat.st_size
+
+        if total <= self.max_bytes:
+            self._total_bytes = total
+            return
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+        self._total_bytes = total
+
+    def clear(self):
+        """Remove every cached entry"""
+        if self.cache_dir.exists():
+            for path in self.cache_dir.glob("*.json"):
+                self._remove(path)
+        self._total_bytes = 0
+
+    @staticmethod
+    def _remove(path: Path):
+        try:
+            path.unlink()
+        except OSError:
+            pass
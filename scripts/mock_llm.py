@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+"""
+Mock LLM Backend
+Offline, deterministic stand-in for the OpenAI chat completions API
+
+Serves recorded responses (or synthetic ones derived from the prompt) with
+configurable latency, token rate and failure injection. It plugs into
+QAGenie either in-process through httpx transports or as a local HTTP
+server that any OpenAI client can target via base_url.
+"""
+
+import os
+import re
+import json
+import time
+import asyncio
+import hashlib
+import argparse
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import httpx
+
+from llm_cache import LLMCache, DEFAULT_CACHE_DIR
+from json_stream import iter_json_objects
+
+CHARS_PER_TOKEN = 4
+STREAM_CHUNK_TOKENS = 8
+
+
+class MockLLM:
+    """Deterministic chat completion generator with fault injection.
+
+    Responses come from a recording keyed like LLMCache entries (a hash of
+    model, temperature and prompts); unrecorded prompts get a synthetic but
+    well-formed reply for the QAGenie stage they belong to. Whether a
+    request fails depends only on the seed, the prompt and how many times
+    that prompt was already attempted, so runs are reproducible regardless
+    of request ordering under concurrency.
+    """
+
+    def __init__(self, recording: Optional[Dict[str, str]] = None, latency: float = 0.0,
+                 tokens_per_second: Optional[float] = None, failure_rate: float = 0.0,
+                 rate_limit_rate: float = 0.0, retry_after: float = 0.1, seed: int = 0):
+        self.recording = recording or {}
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.failure_rate = failure_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.seed = seed
+        self._attempts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "completions": 0, "rate_limited": 0, "errors": 0,
+                      "replayed": 0, "synthetic": 0, "completion_tokens": 0}
+
+    # Recordings
+
+    @staticmethod
+    def load_recording(path: str) -> Dict[str, str]:
+        """Load recorded responses from a JSON file or an LLMCache directory"""
+        source = Path(path)
+        if source.is_dir():
+            recording = {}
+            for entry_path in source.glob("*.json"):
+                try:
+                    with open(entry_path, "r", encoding="utf-8") as f:
+                        recording[entry_path.stem] = json.load(f)["content"]
+                except (OSError, KeyError, json.JSONDecodeError):
+                    continue
+            return recording
+        with open(source, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    # Request handling
+
+    def _count(self, name: str, amount: int = 1):
+        with self._lock:
+            self.stats[name] += amount
+
+    def _roll(self, key: str) -> float:
+        """Deterministic pseudo-random number in [0, 1) for this attempt of a prompt"""
+        with self._lock:
+            attempt = self._attempts.get(key, 0)
+            self._attempts[key] = attempt + 1
+        digest = hashlib.sha256(f"{self.seed}:{key}:{attempt}".encode("utf-8")).digest()
+        return int.from_bytes(digest[:8], "big") / 2 ** 64
+
+    def respond(self, body: Dict[str, Any]) -> Tuple[int, Dict[str, str], Any]:
+        """Resolve one request to (status, headers, content or error payload)"""
+        self._count("requests")
+        messages = body.get("messages", [])
+        system = next((m.get("content", "") for m in messages if m.get("role") == "system"), "")
+        prompt = next((m.get("content", "") for m in reversed(messages) if m.get("role") == "user"), "")
+        key = LLMCache.make_key(body.get("model", ""), body.get("temperature", 1.0), system, prompt)
+
+        roll = self._roll(key)
+        if roll < self.rate_limit_rate:
+            self._count("rate_limited")
+            return 429, {"retry-after": str(self.retry_after)}, {
+                "error": {"message": "Rate limit reached (mock)", "type": "requests", "code": "rate_limit_exceeded"}}
+        if roll < self.rate_limit_rate + self.failure_rate:
+            self._count("errors")
+            return 500, {}, {"error": {"message": "Internal server error (mock)", "type": "server_error"}}
+
+        if key in self.recording:
+            self._count("replayed")
+            content = self.recording[key]
+        else:
+            self._count("synthetic")
+            content = synthesize_response(prompt)
+        self._count("completions")
+        self._count("completion_tokens", self.token_count(content))
+        return 200, {}, content
+
+    @staticmethod
+    def token_count(text: str) -> int:
+        return max(1, len(text) // CHARS_PER_TOKEN)
+
+    def stream_pieces(self, content: str) -> Iterator[Tuple[str, float]]:
+        """Split content into (piece, delay before piece) for streaming"""
+        size = STREAM_CHUNK_TOKENS * CHARS_PER_TOKEN
+        delay = STREAM_CHUNK_TOKENS / self.tokens_per_second if self.tokens_per_second else 0.0
+        for start in range(0, len(content), size):
+            yield content[start:start + size], delay
+
+    def generation_time(self, content: str) -> float:
+        """Time a non-streamed completion takes to generate"""
+        if not self.tokens_per_second:
+            return 0.0
+        return self.token_count(content) / self.tokens_per_second
+
+
+# Synthetic responses
+
+def _seeded_words(text: str, count: int) -> List[str]:
+    words = re.findall(r"[A-Za-z]{4,}", text)
+    if not words:
+        return ["Feature"] * count
+    digest = hashlib.sha256(text.encode("utf-8")).digest()
+    return [words[(digest[i % len(digest)] * 7919 + i) % len(words)].title() for i in range(count)]
+
+
+def synthesize_response(prompt: str) -> str:
+    """Well-formed reply for whichever QAGenie stage produced the prompt"""
+    if "Convert these test cases into executable Playwright" in prompt:
+        cases = [(case.get("id", "TC001"), case.get("title", "Test Case"))
+                 for case in iter_json_objects(prompt, "test_cases")]
+        scripts = [{
+            "filename": f"{case_id}_{title.replace(' ', '_')}.spec.ts",
+            "content": (
+                "import { test, expect } from '@playwright/test';\n\n"
+                f"test('{case_id}: {title}', async ({{ page }}) => {{\n"
+                "    await page.goto('https://www.recruter.ai');\n"
+                "    await expect(page).toHaveTitle(/Recruter/);\n"
+                "});\n"
+            ),
+        } for case_id, title in cases]
+        return json.dumps(scripts, indent=2)
+
+    if "generate comprehensive frontend test cases" in prompt:
+        names = re.findall(r'"name": "([^"]+)"', prompt) or ["Core Flow"]
+        cases = []
+        for name in names:
+            for variant, category, priority in (("Happy Path", "Functional", "High"),
+                                                ("Invalid Input", "Functional", "Medium"),
+                                                ("Keyboard Navigation", "Accessibility", "Medium")):
+                cases.append({
+                    "id": f"TC{len(cases) + 1:03d}",
+                    "title": f"{name} - {variant}",
+                    "category": category,
+                    "priority": priority,
+                    "description": f"Verify {name.lower()} ({variant.lower()})",
+                    "steps": [
+                        "Navigate to Recruter.ai homepage",
+                        f"Click '{name}'",
+                        "Enter valid details",
+                        f"Verify '{name}' completes",
+                    ],
+                    "expected_results": f"{name} works as expected",
+                })
+        return json.dumps({"metadata": {"total_cases": len(cases)}, "test_cases": cases}, indent=2)
+
+    if "extract all user flows" in prompt:
+        count = max(1, min(5, len(prompt) // 2000))
+        flows = [{
+            "name": f"{word} Flow",
+            "steps": [f"Open {word.lower()} page", f"Click '{word}'", f"Verify {word.lower()} saved"],
+            "expected_outcomes": [f"{word} is saved"],
+            "failure_points": ["Network failure", "Invalid input"],
+        } for word in dict.fromkeys(_seeded_words(prompt, count))]
+        return json.dumps(flows, indent=2)
+
+    return "OK"
+
+
+# Wire format
+
+def _completion_payload(body: Dict[str, Any], content: str, mock: MockLLM) -> Dict[str, Any]:
+    return {
+        "id": "chatcmpl-mock",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "mock"),
+        "choices": [{"index": 0, "finish_reason": "stop",
+                     "message": {"role": "assistant", "content": content}}],
+        "usage": {"prompt_tokens": 0, "completion_tokens": mock.token_count(content),
+                  "total_tokens": mock.token_count(content)},
+    }
+
+
+def _sse_event(body: Dict[str, Any], piece: Optional[str]) -> bytes:
+    delta = {"content": piece} if piece is not None else {}
+    event = {
+        "id": "chatcmpl-mock",
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": body.get("model", "mock"),
+        "choices": [{"index": 0, "delta": delta, "finish_reason": None if piece is not None else "stop"}],
+    }
+    return f"data: {json.dumps(event)}\n\n".encode("utf-8")
+
+
+SSE_DONE = b"data: [DONE]\n\n"
+
+
+class MockTransport(httpx.BaseTransport):
+    """In-process httpx transport serving chat completions from a MockLLM"""
+
+    def __init__(self, mock: MockLLM):
+        self.mock = mock
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.read() or b"{}")
+        status, headers, content = self.mock.respond(body)
+        time.sleep(self.mock.latency)
+        if status != 200:
+            return httpx.Response(status, headers=headers, json=content)
+        if body.get("stream"):
+            def events():
+                for piece, delay in self.mock.stream_pieces(content):
+                    time.sleep(delay)
+                    yield _sse_event(body, piece)
+                yield _sse_event(body, None)
+                yield SSE_DONE
+            return httpx.Response(200, headers={"content-type": "text/event-stream"},
+                                  stream=_SyncStream(events()))
+        time.sleep(self.mock.generation_time(content))
+        return httpx.Response(200, json=_completion_payload(body, content, self.mock))
+
+
+class AsyncMockTransport(httpx.AsyncBaseTransport):
+    """Async counterpart of MockTransport; delays use asyncio.sleep"""
+
+    def __init__(self, mock: MockLLM):
+        self.mock = mock
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(await request.aread() or b"{}")
+        status, headers, content = self.mock.respond(body)
+        await asyncio.sleep(self.mock.latency)
+        if status != 200:
+            return httpx.Response(status, headers=headers, json=content)
+        if body.get("stream"):
+            async def events():
+                for piece, delay in self.mock.stream_pieces(content):
+                    await asyncio.sleep(delay)
+                    yield _sse_event(body, piece)
+                yield _sse_event(body, None)
+                yield SSE_DONE
+            return httpx.Response(200, headers={"content-type": "text/event-stream"},
+                                  stream=_AsyncStream(events()))
+        await asyncio.sleep(self.mock.generation_time(content))
+        return httpx.Response(200, json=_completion_payload(body, content, self.mock))
+
+
+class _SyncStream(httpx.SyncByteStream):
+    def __init__(self, chunks):
+        self._chunks = chunks
+
+    def __iter__(self):
+        yield from self._chunks
+
+
+class _AsyncStream(httpx.AsyncByteStream):
+    def __init__(self, chunks):
+        self._chunks = chunks
+
+    async def __aiter__(self):
+        async for chunk in self._chunks:
+            yield chunk
+
+
+def mock_transports(mock: MockLLM) -> Dict[str, Any]:
+    """QAGenie keyword arguments that route every request to `mock`"""
+    return {"transport": MockTransport(mock), "async_transport": AsyncMockTransport(mock), "api_key": "mock"}
+
+
+def mock_from_env() -> MockLLM:
+    """Build a MockLLM from QAGENIE_MOCK_* environment variables"""
+    recording_path = os.getenv("QAGENIE_MOCK_RECORDING")
+    tokens_per_second = float(os.getenv("QAGENIE_MOCK_TOKENS_PER_SECOND", "0"))
+    return MockLLM(
+        recording=MockLLM.load_recording(recording_path) if recording_path else None,
+        latency=float(os.getenv("QAGENIE_MOCK_LATENCY", "0")),
+        tokens_per_second=tokens_per_second or None,
+        failure_rate=float(os.getenv("QAGENIE_MOCK_FAILURE_RATE", "0")),
+        rate_limit_rate=float(os.getenv("QAGENIE_MOCK_RATE_LIMIT_RATE", "0")),
+        seed=int(os.getenv("QAGENIE_MOCK_SEED", "0")),
+    )
+
+
+# Local HTTP server
+
+def make_server(mock: MockLLM, host: str = "127.0.0.1", port: int = 8001) -> ThreadingHTTPServer:
+    """OpenAI-compatible HTTP server; point clients at http://host:port/v1"""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send_json(self, status: int, payload: Dict[str, Any], headers: Dict[str, str]):
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _send_chunk(self, data: bytes):
+            self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+            self.wfile.flush()
+
+        def do_POST(self):
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}}, {})
+                return
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            status, headers, content = mock.respond(body)
+            time.sleep(mock.latency)
+            if status != 200:
+                self._send_json(status, content, headers)
+                return
+            if not body.get("stream"):
+                time.sleep(mock.generation_time(content))
+                self._send_json(200, _completion_payload(body, content, mock), {})
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for piece, delay in mock.stream_pieces(content):
+                time.sleep(delay)
+                self._send_chunk(_sse_event(body, piece))
+            self._send_chunk(_sse_event(body, None))
+            self._send_chunk(SSE_DONE)
+            self.wfile.write(b"0\r\n\r\n")
+
+    return ThreadingHTTPServer((host, port), Handler)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mock OpenAI backend for offline QAgenie runs")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    serve = sub.add_parser("serve", help="run an OpenAI-compatible mock server")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8001)
+    serve.add_argument("--recording", help="recording JSON file or LLM cache directory to replay")
+    serve.add_argument("--latency", type=float, default=0.0, help="seconds before the first token")
+    serve.add_argument("--tokens-per-second", type=float, default=0.0, help="generation speed (0 = instant)")
+    serve.add_argument("--failure-rate", type=float, default=0.0, help="fraction of requests answered with 500")
+    serve.add_argument("--rate-limit-rate", type=float, default=0.0, help="fraction of requests answered with 429")
+    serve.add_argument("--seed", type=int, default=0)
+
+    record = sub.add_parser("record", help="snapshot the LLM cache into a portable recording file")
+    record.add_argument("--cache-dir", default=os.getenv("QAGENIE_CACHE_DIR", DEFAULT_CACHE_DIR))
+    record.add_argument("--output", default="testcases/llm_recording.json")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        if not os.path.isdir(args.cache_dir):
+            print(f"❌ No LLM cache found at {args.cache_dir}")
+            return
+        recording = MockLLM.load_recording(args.cache_dir)
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(recording, f, indent=2)
+        print(f"✅ Recorded {len(recording)} responses to {args.output}")
+        return
+
+    mock = MockLLM(
+        recording=MockLLM.load_recording(args.recording) if args.recording else None,
+        latency=args.latency,
+        tokens_per_second=args.tokens_per_second or None,
+        failure_rate=args.failure_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        seed=args.seed,
+    )
+    server = make_server(mock, args.host, args.port)
+    print(f"🧪 Mock LLM listening on http://{args.host}:{args.port}/v1 ({len(mock.recording)} recorded responses)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 Mock LLM stopped")
+        print(json.dumps(mock.stats, indent=2))
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
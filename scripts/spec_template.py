@@ -0,0 +1,101 @@
+"""
+Spec Templates
+Compile-once, join-rendered templates for generated Playwright spec files
+"""
+
+import re
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+from step_rules import js_string
+
+# {{name}} inserts a value as-is, {{name|js}} escapes it for a single-quoted JS string
+_PLACEHOLDER = re.compile(r"\{\{\s*(\w+)\s*(?:\|\s*(\w+)\s*)?\}\}")
+_FILTERS: Dict[str, Callable[[str], str]] = {
+    "js": js_string,
+    "raw": lambda value: value,
+}
+
+
+class SpecTemplate:
+    """Template compiled once into literal chunks and slots.
+
+    Rendering fills a preallocated list and joins it, so cost is linear
+    in the output size and the skeleton is never re-parsed. Placeholders
+    use ``{{name}}`` so JavaScript braces and ``${...}`` need no escaping.
+    """
+
+    def __init__(self, source: str):
+        self.source = source
+        self._parts: List[str] = []
+        self._slots: List[Tuple[int, str, Callable[[str], str]]] = []
+        position = 0
+        for match in _PLACEHOLDER.finditer(source):
+            self._parts.append(source[position:match.start()])
+            name, filter_name = match.group(1), match.group(2) or "raw"
+            if filter_name not in _FILTERS:
+                raise ValueError(f"Unknown template filter '{filter_name}' for '{name}'")
+            self._slots.append((len(self._parts), name, _FILTERS[filter_name]))
+            self._parts.append("")
+            position = match.end()
+        self._parts.append(source[position:])
+        self.fields = sorted({name for _, name, _ in self._slots})
+
+    def render(self, values: Dict[str, Any]) -> str:
+        """Render one file; missing values raise KeyError"""
+        parts = self._parts.copy()
+        for index, name, apply in self._slots:
+            parts[index] = apply(str(values[name]))
+        return "".join(parts)
+
+    def render_many(self, rows: Iterable[Dict[str, Any]]) -> List[str]:
+        """Render a batch of files with the same compiled skeleton"""
+        render = self.render
+        return [render(values) for values in rows]
+
+
+FALLBACK_SPEC = SpecTemplate("""import { test, expect } from '@playwright/test';
+import { AxeBuilder } from '@axe-core/playwright';
+
+test('{{test_id|js}}: {{title|js}}', async ({ page }) => {
+    // Test metadata
+    const testId = '{{test_id|js}}';
+    const category = '{{category|js}}';
+    const priority = '{{priority|js}}';
+
+    console.log(`Running test: ${testId} - ${category} (${priority})`);
+
+    try {
+        // Navigate to Recruter.ai
+        await page.goto('https://www.recruter.ai');
+
+        // Test steps
+{{steps}}
+
+        // Accessibility check
+        const accessibilityScanResults = await new AxeBuilder({ page }).analyze();
+        expect(accessibilityScanResults.violations).toEqual([]);
+
+        // Performance metrics
+        const performanceMetrics = await page.evaluate(() => {
+            const navigation = performance.getEntriesByType('navigation')[0];
+            return {
+                loadTime: navigation.loadEventEnd - navigation.loadEventStart,
+                domContentLoaded: navigation.domContentLoadedEventEnd - navigation.domContentLoadedEventStart
+            };
+        });
+
+        console.log('Performance metrics:', performanceMetrics);
+
+        // Take screenshot
+        await page.screenshot({ path: `report/${testId}_success.png` });
+
+    } catch (error) {
+        // Take screenshot on failure
+        await page.screenshot({
+            path: `report/${testId}_failure_${Date.now()}.png`,
+            fullPage: true
+        });
+        throw error;
+    }
+});
+""")
@@ -0,0 +1,256 @@
+"""
+Step Rules
+Translates plain-English test steps into Playwright actions with keyword-dispatched regex rules
+"""
+
+import os
+import re
+import json
+from typing import Any, Dict, List, Optional
+
+DEFAULT_BASE_URL = "https://www.recruter.ai"
+DEFAULT_FILL_VALUE = "test data"
+MEMO_SIZE = 4096
+
+# Rules are tried in order; the first whose pattern occurs anywhere in the step wins.
+# "keywords" lists words every match of the pattern contains; a rule is only tried
+# when one of them is a word of the step (rules without keywords are always tried).
+# Templates are str.format strings over the named groups with these format specs:
+#   {g}           JS-escaped captured text
+#   {g:selector}  Playwright selector for a clickable element
+#   {g:field}     Playwright selector for a text input
+#   {g:url}       absolute URL (paths are joined to the base URL)
+#   {g:pattern}   JS regex source matching the text in a URL
+#   {g:key}       Playwright key name, e.g. 'enter' -> Enter
+#   {g:raw}       text as captured
+DEFAULT_RULES: List[Dict[str, Any]] = [
+    {
+        "name": "navigate",
+        "pattern": r"\b(?:navigate|go(?:es)? to|open|visit)\b(?:\s+to)?(?:\s+(?P<target>\S.*?))?\s*$",
+        "template": "await page.goto('{target:url}');",
+        "keywords": ["navigate", "go", "goes", "open", "visit"],
+    },
+    {
+        "name": "press",
+        "pattern": (r"\b(?:press|hit)(?:es)?\s+(?:the\s+)?(?P<key>enter|return|esc(?:ape)?|tab|space(?:bar)?|"
+                    r"backspace|delete|home|end|page\s*(?:up|down)|(?:arrow\s*)?(?:up|down|left|right))"
+                    r"(?:\s+key)?\b(?!\s+(?:button|link|tab|icon|option|menu))"),
+        "template": "await page.keyboard.press('{key:key}');",
+        "keywords": ["press", "presses", "hit", "hites"],
+    },
+    {
+        "name": "click",
+        "pattern": r"\b(?:click|tap|press)(?:s|ed)?\b(?:\s+on)?\s+(?P<target>\S.*?)\s*$",
+        "template": "await page.click('{target:selector}');",
+        "keywords": [verb + suffix for verb in ("click", "tap", "press") for suffix in ("", "s", "ed")],
+    },
+    {
+        "name": "fill",
+        # "input" is also a noun ("invalid input data"), so it only counts as the step's first word
+        "pattern": (r"(?:\b(?:enter|type|fill(?:\s+in)?)|^\s*input)\b\s*"
+                    r"(?:(?P<value>\"[^\"]*\"|'[^']*'|\S.*?)\s+(?:in|into)\s+)?(?P<target>\S.*?)\s*$"),
+        "template": "await page.fill('{target:field}', '{value}');",
+        "defaults": {"value": DEFAULT_FILL_VALUE},
+        "keywords": ["enter", "type", "fill", "input"],
+    },
+    {
+        "name": "verify_redirect",
+        "pattern": r"\b(?:redirect(?:s|ed)?|navigates?|taken|lands?)\s+(?:back\s+)?(?:to|on)\s+(?P<target>\S.*?)\s*$",
+        "template": "await expect(page).toHaveURL(/{target:pattern}/i);",
+        "keywords": ["redirect", "redirects", "redirected", "navigate", "navigates", "taken", "land", "lands"],
+    },
+    {
+        "name": "verify",
+        "pattern": (r"\b(?:verify|check|ensure|confirm|assert|expect)\b(?:\s+that)?\s+(?P<target>\S.*?)"
+                    r"(?:\s+(?:(?:is|are)\s+)?(?:visible|displayed|shown|present|appears?))?\s*$"),
+        "template": "await expect(page.locator('{target:selector}').first()).toBeVisible();",
+        "keywords": ["verify", "check", "ensure", "confirm", "assert", "expect"],
+    },
+    {
+        "name": "wait",
+        "pattern": r"\bwait\b",
+        "template": "await page.waitForLoadState('networkidle');",
+        "keywords": ["wait"],
+    },
+]
+
+_QUOTED = re.compile(r"[\"'\u201c\u2018]([^\"'\u201d\u2019]+)[\"'\u201d\u2019]")
+_LEADING = re.compile(r"^(?:(?:the|a|an|for|on|in|into|to|that|user|users)\s+)+", re.IGNORECASE)
+_TRAILING = re.compile(r"[\s.,;:!]+$|\s+(?:(?:is|are)\s+)?(?:visible|displayed|shown|present|appears?)$", re.IGNORECASE)
+_ELEMENT = re.compile(
+    r"^(?P<name>.+?)\s+(?P<kind>button|link|tab|checkbox|radio(?:\s+button)?|dropdown|menu|option|icon|"
+    r"field|input|textbox|text\s+box|box|heading|title)s?$",
+    re.IGNORECASE,
+)
+_ROLES = {
+    "button": "button", "link": "link", "tab": "tab", "checkbox": "checkbox", "radio": "radio",
+    "dropdown": "combobox", "menu": "menu", "option": "option", "heading": "heading", "title": "heading",
+    "field": "textbox", "input": "textbox", "textbox": "textbox", "box": "textbox",
+}
+_KEYS = {
+    "enter": "Enter", "return": "Enter", "esc": "Escape", "escape": "Escape", "tab": "Tab", "space": "Space",
+    "spacebar": "Space", "backspace": "Backspace", "delete": "Delete", "home": "Home", "end": "End",
+    "pageup": "PageUp", "pagedown": "PageDown",
+    **{f"{prefix}{direction}": f"Arrow{direction.capitalize()}"
+       for prefix in ("", "arrow") for direction in ("up", "down", "left", "right")},
+}
+_PAGE_SUFFIX = re.compile(r"\s+(?:page|screen|section|view)$", re.IGNORECASE)
+_JS_REGEX_SPECIAL = re.compile(r"[.*+?^${}()|\[\]\\/]")
+
+
+def js_string(text: str) -> str:
+    """Escape text for a single-quoted JavaScript string literal"""
+    return text.replace("\\", "\\\\").replace("'", "\\'").replace("\n", "\\n").replace("\r", "")
+
+
+def _css_string(text: str) -> str:
+    return text.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def _label(text: str) -> str:
+    """Strip quotes, articles and trailing punctuation from captured text"""
+    quoted = _QUOTED.search(text)
+    if quoted:
+        return quoted.group(1).strip()
+    return _LEADING.sub("", _TRAILING.sub("", text.strip())).strip()
+
+
+def element_selector(text: str, default_role: Optional[str] = None) -> str:
+    """Playwright selector for a described element, e.g. 'the Sign Up button'"""
+    quoted = _QUOTED.search(text)
+    label = _label(text)
+    match = _ELEMENT.match(_LEADING.sub("", text.strip()))
+    role = default_role
+    if match:
+        role = _ROLES.get(match.group("kind").split()[0].lower(), role)
+        if not quoted:
+            label = _label(match.group("name"))
+    if role:
+        return f'role={role}[name="{_css_string(label)}" i]'
+    return f'text={label}' if quoted is None else f'text="{_css_string(label)}"'
+
+
+class _Capture(str):
+    """Captured group text whose format specs render it for a template slot"""
+
+    base_url = DEFAULT_BASE_URL
+
+    def __format__(self, spec: str) -> str:
+        text = str(self)
+        if spec == "raw":
+            return text
+        if spec == "selector":
+            return js_string(element_selector(text))
+        if spec == "field":
+            return js_string(element_selector(text, default_role="textbox"))
+        if spec == "url":
+            target = _label(text)
+            if target.startswith(("http://", "https://")):
+                return js_string(target)
+            if target.startswith("/"):
+                return js_string(self.base_url.rstrip("/") + target)
+            return js_string(self.base_url)
+        if spec == "key":
+            return js_string(_KEYS.get("".join(_label(text).lower().split()), _label(text)))
+        if spec == "pattern":
+            words = _PAGE_SUFFIX.sub("", _label(text)).split()
+            return ".*".join(_JS_REGEX_SPECIAL.sub(lambda m: "\\" + m.group(0), w) for w in words) or ".*"
+        return js_string(_label(text) if _QUOTED.search(text) else text)
+
+
+class StepRules:
+    """Compiled rule table mapping test steps to Playwright statements.
+
+    Each rule has its own compiled regex. One keyword regex scans the step
+    once to select the rules whose keywords occur in it, and only those are
+    searched, in rule order; a typical step runs one or two rule regexes
+    instead of every rule. Translations are memoized because fallback
+    cases repeat the same steps.
+    """
+
+    def __init__(self, rules: Optional[List[Dict[str, Any]]] = None, base_url: str = DEFAULT_BASE_URL):
+        self.rules = list(rules if rules is not None else DEFAULT_RULES)
+        self.base_url = base_url
+        self._capture = type("_Capture", (_Capture,), {"base_url": base_url})
+        self._memo: Dict[str, str] = {}
+        self._compile()
+
+    @classmethod
+    def from_config(cls, path: Optional[str] = None, base_url: str = DEFAULT_BASE_URL) -> "StepRules":
+        """Default rules with user rules from a JSON file prepended.
+
+        The file (or ``QAGENIE_STEP_RULES``) holds a list of rules, or an
+        object with a ``rules`` list, each ``{"name", "pattern", "template"}``
+        plus optional ``defaults`` and ``keywords``. User rules take priority
+        over built-ins.
+        """
+        path = path or os.getenv("QAGENIE_STEP_RULES")
+        if not path:
+            return cls(base_url=base_url)
+        with open(path, "r", encoding="utf-8") as f:
+            config = json.load(f)
+        user_rules = config.get("rules", []) if isinstance(config, dict) else config
+        return cls(user_rules + DEFAULT_RULES, base_url=base_url)
+
+    def _compile(self):
+        self._patterns = []
+        self._always: List[int] = []
+        self._by_word: Dict[str, List[int]] = {}
+        for index, rule in enumerate(self.rules):
+            try:
+                self._patterns.append(re.compile(rule["pattern"], re.IGNORECASE | re.DOTALL))
+            except re.error as e:
+                raise ValueError(f"Invalid pattern in step rule '{rule.get('name', index)}': {e}") from e
+            keywords = rule.get("keywords")
+            if not keywords:
+                self._always.append(index)
+            for word in keywords or ():
+                self._by_word.setdefault(word.lower(), []).append(index)
+        # Longest first, so the alternation never stops at a keyword's prefix
+        words = sorted(self._by_word, key=len, reverse=True)
+        self._keywords = re.compile(r"\b(?:" + "|".join(map(re.escape, words)) + r")\b", re.IGNORECASE) if words else None
+
+    def match(self, step: str) -> Optional[Dict[str, Any]]:
+        """Return the winning rule and its captured arguments, or None"""
+        candidates = set(self._always)
+        if self._keywords is not None:
+            for word in self._keywords.findall(step):
+                candidates.update(self._by_word[word.lower()])
+        for index in sorted(candidates):
+            found = self._patterns[index].search(step)
+            if found:
+                rule = self.rules[index]
+                args = dict(rule.get("defaults", {}))
+                args.update((name, value) for name, value in found.groupdict().items() if value is not None)
+                return {"rule": rule, "args": args}
+        return None
+
+    def translate(self, step: str) -> str:
+        """Playwright statement for a step; unmatched steps become comments"""
+        line = self._memo.get(step)
+        if line is not None:
+            return line
+        found = self.match(step)
+        if found is None:
+            line = "// " + " ".join(step.split())
+        else:
+            args = {name: self._capture(value) for name, value in found["args"].items()}
+            line = found["rule"]["template"].format_map(_Missing(args, self._capture))
+        if len(self._memo) >= MEMO_SIZE:
+            self._memo.clear()
+        self._memo[step] = line
+        return line
+
+    def translate_all(self, steps: List[str]) -> List[str]:
+        return [self.translate(step) for step in steps]
+
+
+class _Missing(dict):
+    """format_map mapping that renders absent groups as empty captures"""
+
+    def __init__(self, args: Dict[str, Any], capture: type):
+        super().__init__(args)
+        self._capture_type = capture
+
+    def __missing__(self, key: str):
+        return self._capture_type("")
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Test Case Store
+Indexed SQLite store for generated test case corpora, versioned by run
+"""
+
+import os
+import sys
+import json
+import zlib
+import glob
+import sqlite3
+import hashlib
+import argparse
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+DEFAULT_STORE_PATH = "testcases/testcases.db"
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at TEXT NOT NULL,
+    source TEXT,
+    total INTEGER NOT NULL,
+    metadata TEXT
+);
+CREATE TABLE IF NOT EXISTS cases (
+    hash TEXT PRIMARY KEY,
+    case_id TEXT,
+    title TEXT,
+    category TEXT COLLATE NOCASE,
+    priority TEXT COLLATE NOCASE,
+    body BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS run_cases (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    case_hash TEXT NOT NULL REFERENCES cases(hash),
+    PRIMARY KEY (run_id, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_cases_case_id ON cases(case_id);
+CREATE INDEX IF NOT EXISTS idx_cases_category ON cases(category, priority);
+CREATE INDEX IF NOT EXISTS idx_cases_priority ON cases(priority);
+CREATE INDEX IF NOT EXISTS idx_run_cases_hash ON run_cases(case_hash);
+"""
+
+# Lightweight columns returned when full=False; the compressed body is never read
+SUMMARY_FIELDS = ["case_id", "title", "category", "priority"]
+
+
+def case_hash(case: Dict[str, Any]) -> str:
+    """Content hash of a test case, independent of key order"""
+    canonical = json.dumps(case, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class TestCaseStore:
+    """Append-only store of generation runs over deduplicated test cases.
+
+    Each generation run is a row in ``runs`` plus an ordered list of case
+    hashes; identical cases produced by different runs are stored once,
+    compressed. Id, title, category and priority live in indexed columns
+    so listing and filtering never decompress the full case bodies.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv("QAGENIE_STORE", DEFAULT_STORE_PATH)
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+        self.conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self) -> "TestCaseStore":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def add_run(self, test_cases: Dict[str, Any], source: Optional[str] = None,
+                created_at: Optional[str] = None) -> Dict[str, int]:
+        """Record one generation run; returns run_id, cases and new_cases"""
+        metadata = test_cases.get("metadata", {})
+        cases = test_cases.get("test_cases", [])
+        rows = []
+        for case in cases:
+            rows.append((
+                case_hash(case),
+                case.get("id"),
+                case.get("title"),
+                case.get("category"),
+                case.get("priority"),
+                zlib.compress(json.dumps(case, ensure_ascii=False).encode("utf-8")),
+            ))
+        with self.conn:
+            before = self.conn.total_changes
+            self.conn.executemany("INSERT OR IGNORE INTO cases VALUES (?, ?, ?, ?, ?, ?)", rows)
+            new_cases = self.conn.total_changes - before
+            run_id = self.conn.execute(
+                "INSERT INTO runs (created_at, source, total, metadata) VALUES (?, ?, ?, ?)",
+                (created_at or metadata.get("generated_at") or datetime.now().isoformat(),
+                 source, len(rows), json.dumps(metadata)),
+            ).lastrowid
+            self.conn.executemany(
+                "INSERT INTO run_cases VALUES (?, ?, ?)",
+                [(run_id, position, row[0]) for position, row in enumerate(rows)],
+            )
+        return {"run_id": run_id, "cases": len(rows), "new_cases": new_cases}
+
+    def latest_run_id(self) -> Optional[int]:
+        row = self.conn.execute("SELECT MAX(id) FROM runs").fetchone()
+        return row[0]
+
+    def runs(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Most recent runs first"""
+        rows = self.conn.execute(
+            "SELECT id, created_at, source, total FROM runs ORDER BY id DESC LIMIT ?", (limit,)
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def query(self, run_id: Optional[int] = None, case_id: Optional[str] = None,
+              category: Optional[str] = None, priority: Optional[str] = None,
+              limit: Optional[int] = None, offset: int = 0, full: bool = True) -> List[Dict[str, Any]]:
+        """Cases of a run (latest by default) in generation order.
+
+        Filters use the indexed columns; with ``full=False`` only the
+        summary fields are read and the case bodies stay compressed on disk.
+        """
+        if run_id is None:
+            run_id = self.latest_run_id()
+            if run_id is None:
+                return []
+        columns = "c.body" if full else ", ".join(f"c.{field}" for field in SUMMARY_FIELDS)
+        sql = [f"SELECT {columns} FROM run_cases rc JOIN cases c ON c.hash = rc.case_hash WHERE rc.run_id = ?"]
+        params: List[Any] = [run_id]
+        for column, value in (("case_id", case_id), ("category", category), ("priority", priority)):
+            if value is not None:
+                sql.append(f"AND c.{column} = ?")
+                params.append(value)
+        sql.append("ORDER BY rc.position LIMIT ? OFFSET ?")
+        params.extend([limit if limit is not None else -1, offset])
+        rows = self.conn.execute(" ".join(sql), params)
+        if not full:
+            return [{("id" if key == "case_id" else key): row[key] for key in SUMMARY_FIELDS} for row in rows]
+        return [json.loads(zlib.decompress(row["body"])) for row in rows]
+
+    def get(self, case_id: str, run_id: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """A single case by id from a run (latest by default)"""
+        found = self.query(run_id=run_id, case_id=case_id, limit=1)
+        return found[0] if found else None
+
+    def counts(self, run_id: Optional[int] = None, by: str = "category") -> Dict[str, int]:
+        """Number of cases per category (or priority) in a run"""
+        if by not in ("category", "priority"):
+            raise ValueError(f"Cannot count by '{by}'")
+        run_id = run_id if run_id is not None else self.latest_run_id()
+        rows = self.conn.execute(
+            f"SELECT c.{by}, COUNT(*) FROM run_cases rc JOIN cases c ON c.hash = rc.case_hash "
+            f"WHERE rc.run_id = ? GROUP BY c.{by} ORDER BY COUNT(*) DESC",
+            (run_id,),
+        ).fetchall()
+        return {row[0] or "Unknown": row[1] for row in rows}
+
+    def history(self, case_id: str) -> List[Dict[str, Any]]:
+        """Each distinct version of a case id with the first and last run that produced it"""
+        rows = self.conn.execute(
+            "SELECT c.hash, c.title, MIN(rc.run_id) AS first_run, MAX(rc.run_id) AS last_run "
+            "FROM cases c JOIN run_cases rc ON rc.case_hash = c.hash "
+            "WHERE c.case_id = ? GROUP BY c.hash ORDER BY first_run",
+            (case_id,),
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def import_json(self, paths: Iterable[str]) -> List[Dict[str, int]]:
+        """Import existing testcases_<timestamp>.json files, oldest first"""
+        results = []
+        for path in sorted(paths, key=os.path.getmtime):
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if not isinstance(data, dict) or not isinstance(data.get("test_cases"), list):
+                continue
+            created_at = datetime.fromtimestamp(os.path.getmtime(path)).isoformat()
+            results.append(self.add_run(data, source=path, created_at=created_at))
+        return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query or import QAgenie test case runs")
+    parser.add_argument("--store", default=None, help=f"database path (default {DEFAULT_STORE_PATH})")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_cmd = commands.add_parser("import", help="import testcases_<timestamp>.json files")
+    import_cmd.add_argument("paths", nargs="*", help="files to import (default testcases/testcases_*.json)")
+
+    commands.add_parser("runs", help="list recent runs")
+
+    query_cmd = commands.add_parser("query", help="list cases of a run")
+    query_cmd.add_argument("--run", type=int, help="run id (default latest)")
+    query_cmd.add_argument("--id", dest="case_id")
+    query_cmd.add_argument("--category")
+    query_cmd.add_argument("--priority")
+    query_cmd.add_argument("--limit", type=int, default=20)
+    query_cmd.add_argument("--full", action="store_true", help="print complete cases as JSON")
+
+    args = parser.parse_args(argv)
+    with TestCaseStore(args.store) as store:
+        if args.command == "import":
+            paths = args.paths or glob.glob("testcases/testcases_*.json")
+            results = store.import_json(paths)
+            new_cases = sum(result["new_cases"] for result in results)
+            print(f"✅ Imported {len(results)} runs ({new_cases} new cases) into {store.path}")
+        elif args.command == "runs":
+            for run in store.runs():
+                print(f"#{run['id']:<5} {run['created_at']}  {run['total']:>5} cases  {run['source'] or ''}")
+        else:
+            cases = store.query(run_id=args.run, case_id=args.case_id, category=args.category,
+                                priority=args.priority, limit=args.limit, full=args.full)
+            if args.full:
+                print(json.dumps(cases, indent=2))
+            else:
+                for case in cases:
+                    print(f"{case['id']}: {case['title']} [{case['category']}, {case['priority']}]")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
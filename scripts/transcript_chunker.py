@@ -0,0 +1,133 @@
+"""
+Transcript Chunking
+Token-aware splitting of long transcripts and merging of per-chunk user flows
+"""
+
+import re
+import json
+from typing import List, Dict, Any, Optional
+
+try:
+    import tiktoken
+except ImportError:  # optional - fall back to a character-based estimate
+    tiktoken = None
+
+CHARS_PER_TOKEN = 4
+_encoders = {}
+
+
+def count_tokens(text: str, model: str = "gpt-3.5-turbo") -> int:
+    """Count tokens with tiktoken when available, else estimate from length"""
+    if tiktoken is None:
+        return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+    encoder = _encoders.get(model)
+    if encoder is None:
+        try:
+            encoder = tiktoken.encoding_for_model(model)
+        except KeyError:
+            encoder = tiktoken.get_encoding("cl100k_base")
+        _encoders[model] = encoder
+    return len(encoder.encode(text))
+
+
+def _split_units(text: str, max_tokens: int, model: str) -> List[str]:
+    """Split text into lines, breaking any line longer than max_tokens on words"""
+    units = []
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        if count_tokens(line, model) <= max_tokens:
+            units.append(line)
+            continue
+        current = []
+        current_tokens = 0
+        for word in line.split():
+            word_tokens = count_tokens(word + " ", model)
+            if current and current_tokens + word_tokens > max_tokens:
+                units.append(" ".join(current))
+                current, current_tokens = [], 0
+            current.append(word)
+            current_tokens += word_tokens
+        if current:
+            units.append(" ".join(current))
+    return units
+
+
+def chunk_transcript(text: str, max_tokens: int = 3000, overlap_tokens: int = 200,
+                     model: str = "gpt-3.5-turbo") -> List[str]:
+    """Split a transcript into chunks of at most max_tokens
+
+    Chunks break on line boundaries (caption lines in video transcripts) and
+    each one repeats roughly overlap_tokens from the end of the previous
+    chunk, so a flow that straddles a boundary is seen whole at least once.
+    """
+    overlap_tokens = min(overlap_tokens, max_tokens // 2)
+    units = _split_units(text, max_tokens, model)
+    sizes = [count_tokens(unit + "\n", model) for unit in units]
+
+    chunks = []
+    start = 0
+    while start < len(units):
+        end = start
+        total = 0
+        while end < len(units) and (end == start or total + sizes[end] <= max_tokens):
+            total += sizes[end]
+            end += 1
+        chunks.append("\n".join(units[start:end]))
+        if end >= len(units):
+            break
+
+        # Step back over trailing units to build the overlap for the next chunk
+        next_start = end
+        carried = 0
+        while next_start - 1 > start and carried + sizes[next_start - 1] <= overlap_tokens:
+            next_start -= 1
+            carried += sizes[next_start]
+        start = next_start
+    return chunks
+
+
+def _flow_name(flow: Dict[str, Any]) -> Optional[str]:
+    for key in ("name", "flow_name", "flowName", "Flow name", "title"):
+        if flow.get(key):
+            return str(flow[key])
+    return None
+
+
+def flow_key(flow: Dict[str, Any]) -> str:
+    """Normalized identity of a flow, used to detect duplicates across chunks"""
+    name = _flow_name(flow)
+    if name is None:
+        return json.dumps(flow, sort_keys=True)
+    return re.sub(r"[^a-z0-9]+", " ", name.lower()).strip()
+
+
+def merge_flows(flow_lists: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Reduce per-chunk flow lists into one deduplicated list
+
+    Flows with the same normalized name are merged: list fields such as
+    steps are unioned in first-seen order, other fields keep the first
+    non-empty value. Output order follows first appearance in the transcript.
+    """
+    merged: Dict[str, Dict[str, Any]] = {}
+    for flows in flow_lists:
+        for flow in flows:
+            if not isinstance(flow, dict):
+                continue
+            key = flow_key(flow)
+            if key not in merged:
+                merged[key] = {k: (list(v) if isinstance(v, list) else v) for k, v in flow.items()}
+                continue
+            target = merged[key]
+            for field, value in flow.items():
+                current = target.get(field)
+                if isinstance(current, list) and isinstance(value, list):
+                    seen = {json.dumps(item, sort_keys=True) for item in current}
+                    for item in value:
+                        marker = json.dumps(item, sort_keys=True)
+                        if marker not in seen:
+                            seen.add(marker)
+                            current.append(item)
+                elif not current and value:
+                    target[field] = value
+    return list(merged.values())
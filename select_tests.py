@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Budgeted Test Selection
+Picks the most valuable subset of generated test cases that fits a time budget
+"""
+
+import os
+import re
+import sys
+import json
+import math
+import glob
+import argparse
+from typing import Any, Dict, Iterable, List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts"))
+from testcase_store import TestCaseStore, DEFAULT_STORE_PATH
+from results_db import ResultsDB, DEFAULT_DB_PATH, PASSING_STATUSES, SKIPPED_STATUSES, parse_results, test_key
+
+DEFAULT_HISTORY = "report/test-results.json"
+DEFAULT_OUTPUT = "testcases/selected-tests.json"  # kept out of report/, which holds run results
+
+PRIORITY_WEIGHTS = {"critical": 8.0, "high": 5.0, "medium": 3.0, "low": 1.0}
+CATEGORY_WEIGHTS = {"functional": 1.0, "security": 1.0, "accessibility": 0.8, "performance": 0.6}
+# Seconds assumed for a test that has never run, by category
+DEFAULT_DURATIONS = {"functional": 20.0, "security": 20.0, "accessibility": 30.0, "performance": 45.0}
+FALLBACK_DURATION = 20.0
+# Floor for estimated durations; keeps value per second finite for sub-millisecond tests
+MIN_DURATION = 0.001
+# Upper bound on knapsack table cells (items x capacity units, one byte each);
+# the duration resolution is the finest one that fits, but never below MIN_DURATION
+KNAPSACK_CELLS = 2_000_000
+
+
+def load_history(paths: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """Per-test runs, failures and durations (seconds) from result files"""
+    history: Dict[str, Dict[str, Any]] = {}
+    for path in paths:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            continue
+        for result in parse_results(data):
+            status = str(result["status"]).lower()
+            if status in SKIPPED_STATUSES:
+                continue
+            entry = history.setdefault(test_key(result["name"]), {"runs": 0, "failures": 0, "durations": []})
+            entry["runs"] += 1
+            if status not in PASSING_STATUSES:
+                entry["failures"] += 1
+            if result["duration_ms"] is not None:
+                entry["durations"].append(float(result["duration_ms"]) / 1000)
+    return history
+
+
+def estimate(case: Dict[str, Any], history: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Expected duration, failure probability and value of running a case"""
+    category = str(case.get("category", "functional")).lower()
+    priority = str(case.get("priority", "medium")).lower()
+    past = history.get(test_key(case.get("id") or case.get("title", "")))
+    runs = past["runs"] if past else 0
+    failures = past["failures"] if past else 0
+    if past and past.get("mean_duration_s") is not None:
+        duration = past["mean_duration_s"]
+    elif past and past.get("durations"):
+        duration = sum(past["durations"]) / len(past["durations"])
+    else:
+        duration = DEFAULT_DURATIONS.get(category, FALLBACK_DURATION)
+    # Beta(1, 1) prior: unseen tests count as coin flips, stable ones decay toward 0
+    failure_rate = (failures + 1) / (runs + 2)
+    weight = PRIORITY_WEIGHTS.get(priority, PRIORITY_WEIGHTS["medium"]) * CATEGORY_WEIGHTS.get(category, 1.0)
+    return {
+        "id": case.get("id"),
+        "title": case.get("title"),
+        "category": case.get("category"),
+        "priority": case.get("priority"),
+        "duration_s": round(max(duration, MIN_DURATION), 3),
+        "failure_rate": round(failure_rate, 3),
+        "runs": runs,
+        "value": round(weight * failure_rate, 4),
+    }
+
+
+def knapsack(items: List[Dict[str, Any]], capacity_s: float) -> List[int]:
+    """Indices of items maximizing total value with total duration <= capacity.
+
+    Classic 0/1 dynamic program over durations rounded up to a resolution
+    derived from the budget, so at most KNAPSACK_CELLS cells are used;
+    O(items x capacity) time, one byte per cell to reconstruct the choice.
+    """
+    resolution = max(MIN_DURATION, capacity_s / max(1, KNAPSACK_CELLS // max(1, len(items))))
+    capacity = int(capacity_s / resolution)
+    weights = [max(1, math.ceil(item["duration_s"] / resolution)) for item in items]
+    best = [0.0] * (capacity + 1)
+    taken: List[bytearray] = []
+    for weight, item in zip(weights, items):
+        choice = bytearray(capacity + 1)
+        value = item["value"]
+        if weight <= capacity:
+            for c in range(capacity, weight - 1, -1):
+                candidate = best[c - weight] + value
+                if candidate > best[c]:
+                    best[c] = candidate
+                    choice[c] = 1
+        taken.append(choice)
+    selected = []
+    c = capacity
+    for index in range(len(items) - 1, -1, -1):
+        if taken[index][c]:
+            selected.append(index)
+            c -= weights[index]
+    return sorted(selected)
+
+
+def select(cases: List[Dict[str, Any]], history: Dict[str, Dict[str, Any]],
+           budget_s: Optional[float] = None, workers: int = 1) -> Dict[str, Any]:
+    """Choose the cases to run within budget_s seconds of wall time on workers"""
+    items = [estimate(case, history) for case in cases]
+    total = sum(item["duration_s"] for item in items)
+    capacity = None if budget_s is None else budget_s * max(1, workers)
+    if capacity is None or total <= capacity:
+        chosen = list(range(len(items)))
+    else:
+        chosen = knapsack(items, capacity)
+    selected = sorted((items[i] for i in chosen), key=lambda item: item["value"] / item["duration_s"], reverse=True)
+    chosen_set = set(chosen)
+    return {
+        "budget_s": budget_s,
+        "workers": workers,
+        "selected": selected,
+        "skipped": [item for i, item in enumerate(items) if i not in chosen_set],
+        "expected_duration_s": round(sum(item["duration_s"] for item in selected) / max(1, workers), 1),
+        "value_covered": round(sum(item["value"] for item in selected) / max(1e-9, sum(i["value"] for i in items)), 3),
+    }
+
+
+def parse_duration(text: str) -> float:
+    """Parse '300', '300s', '5m' or '1h' into seconds"""
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([smh]?)\s*", text.lower())
+    if not match:
+        raise argparse.ArgumentTypeError(f"invalid duration: {text}")
+    return float(match.group(1)) * {"": 1, "s": 1, "m": 60, "h": 3600}[match.group(2)]
+
+
+def load_cases(path: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Cases from a JSON file, else the test case store, else the newest testcases_*.json"""
+    if path is None and os.path.exists(os.getenv("QAGENIE_STORE", DEFAULT_STORE_PATH)):
+        with TestCaseStore() as store:
+            cases = store.query()
+        if cases:
+            return cases
+    if path is None:
+        files = glob.glob("testcases/testcases_*.json")
+        if not files:
+            return []
+        path = max(files, key=os.path.getmtime)
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f).get("test_cases", [])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Select the most valuable tests that fit a time budget")
+    parser.add_argument("--budget", type=parse_duration, help="wall time budget, e.g. 300, 5m, 1h (omit for all)")
+    parser.add_argument("--workers", type=int, default=1, help="parallel Playwright workers sharing the budget")
+    parser.add_argument("--testcases", help="test case JSON (default: latest run in the test case store)")
+    parser.add_argument("--history", nargs="*",
+                        help=f"result files with past durations (default: {DEFAULT_DB_PATH}, else {DEFAULT_HISTORY})")
+    parser.add_argument("--window", type=int, default=50, help="past runs to learn from in the results history")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--grep", action="store_true", help="print only a Playwright --grep pattern")
+    args = parser.parse_args(argv)
+
+    cases = load_cases(args.testcases)
+    if not cases:
+        print("❌ No test cases found. Generate some first!")
+        return 1
+    if args.history is None and os.path.exists(os.getenv("QAGENIE_RESULTS_DB", DEFAULT_DB_PATH)):
+        with ResultsDB() as db:
+            history = db.selection_history(args.window)
+    else:
+        history = load_history(args.history or [DEFAULT_HISTORY])
+    selection = select(cases, history, args.budget, args.workers)
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(selection, f, indent=2)
+
+    # Word boundaries keep TC01-10 from also matching TC01-100
+    pattern = "|".join(rf"\b{re.escape(str(item['id']))}\b" for item in selection["selected"] if item["id"])
+    if args.grep:
+        print(pattern)
+        return 0
+
+    print("🎯 Budgeted Test Selection")
+    print("=" * 50)
+    budget = f"{args.budget:.0f}s x {args.workers} workers" if args.budget is not None else "unlimited"
+    print(f"⏱️ Budget: {budget}")
+    print(f"✅ Selected {len(selection['selected'])}/{len(cases)} tests "
+          f"(~{selection['expected_duration_s']}s, {selection['value_covered'] * 100:.0f}% of expected value)")
+    for item in selection["selected"]:
+        print(f"   {item['id']}: {item['title']} [{item['priority']}] "
+              f"{item['duration_s']}s, p(fail)={item['failure_rate']}")
+    print(f"\n📁 Selection saved to: {args.output}")
+    if pattern:
+        print(f'▶️ npx playwright test --grep "{pattern}"')
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
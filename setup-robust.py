@@ -9,6 +9,7 @@ import sys
 import subprocess
 import json
 from pathlib import Path
+from toolchain import DEFAULT_CACHE_PATH, probe_all
 
 class RobustQAGenieSetup:
     def __init__(self):
@@ -58,31 +59,18 @@ class RobustQAGenieSetup:
             raise Exception("Python 3.8 or higher is required")
         print(f"✅ Python: {sys.version.split()[0]}")
         
+        # Probe node, npm and npx at once (cached between runs)
+        tools = probe_all(("node", "npm", "npx"), cache_path=str(self.project_root / DEFAULT_CACHE_PATH))
+        
         # Check Node.js
-        try:
-            result = subprocess.run(["node", "--version"], capture_output=True, text=True, timeout=10)
-            if result.returncode != 0:
-                raise Exception("Node.js is not installed or not accessible")
-            print(f"✅ Node.js: {result.stdout.strip()}")
-        except (FileNotFoundError, subprocess.TimeoutExpired):
-            raise Exception("Node.js is not installed or not in PATH")
+        if not tools["node"]["found"]:
+            raise Exception(f"Node.js is not installed or not in PATH ({tools['node']['error']})")
+        print(f"✅ Node.js: {tools['node']['version']}")
         
         # Check npm
-        npm_commands = ["npm", "npm.cmd", "npm.exe"]
-        npm_found = False
-        
-        for npm_cmd in npm_commands:
-            try:
-                result = subprocess.run([npm_cmd, "--version"], capture_output=True, text=True, timeout=10)
-                if result.returncode == 0:
-                    print(f"✅ npm: {result.stdout.strip()}")
-                    npm_found = True
-                    break
-            except (FileNotFoundError, subprocess.TimeoutExpired):
-                continue
-        
-        if not npm_found:
+        if not tools["npm"]["found"]:
             raise Exception("npm is not installed or not accessible")
+        print(f"✅ npm: {tools['npm']['version']}")
         
         print("✅ All prerequisites met!")
     
@@ -116,7 +104,7 @@ class RobustQAGenieSetup:
         core_packages = [
             "openai>=1.3.0",
             "python-dotenv>=1.0.0", 
-            "streamlit>=1.28.0",
+            "streamlit>=1.37.0",
             "pandas>=2.1.0",
             "requests>=2.31.0",
             "beautifulsoup4>=4.12.0",
@@ -9,6 +9,7 @@ import sys
 import subprocess
 import json
 from pathlib import Path
+from toolchain import DEFAULT_CACHE_PATH, probe_all
 
 class QAGenieSetup:
     def __init__(self):
@@ -57,43 +58,21 @@ class QAGenieSetup:
             raise Exception("Python 3.8 or higher is required")
         print(f"✅ Python: {sys.version.split()[0]}")
         
-        # Check Node.js
-        try:
-            result = subprocess.run(["node", "--version"], capture_output=True, text=True, timeout=10)
-            if result.returncode != 0:
-                raise Exception("Node.js is not installed or not accessible")
-            print(f"✅ Node.js: {result.stdout.strip()}")
-        except (FileNotFoundError, subprocess.TimeoutExpired):
-            raise Exception("Node.js is not installed or not in PATH")
-        
-        # Check npm - try multiple approaches
-        npm_found = False
-        npm_commands = ["npm", "npm.cmd", "npm.exe"]
+        # Probe node, npm and npx at once (cached between runs)
+        tools = probe_all(("node", "npm", "npx"), cache_path=str(self.project_root / DEFAULT_CACHE_PATH))
         
-        for npm_cmd in npm_commands:
-            try:
-                result = subprocess.run([npm_cmd, "--version"], capture_output=True, text=True, timeout=10)
-                if result.returncode == 0:
-                    print(f"✅ npm: {result.stdout.strip()}")
-                    npm_found = True
-                    break
-            except (FileNotFoundError, subprocess.TimeoutExpired):
-                continue
-        
-        if not npm_found:
-            # Try alternative approach - check if npm is available via npx
-            try:
-                result = subprocess.run(["npx", "--version"], capture_output=True, text=True, timeout=10)
-                if result.returncode == 0:
-                    print(f"✅ npx available: {result.stdout.strip()}")
-                    npm_found = True
-                else:
-                    raise Exception("npm/npx is not installed or not accessible")
-            except (FileNotFoundError, subprocess.TimeoutExpired):
-                raise Exception("npm/npx is not installed or not in PATH")
-        
-        if not npm_found:
-            raise Exception("npm is not installed or not accessible")
+        # Check Node.js
+        if not tools["node"]["found"]:
+            raise Exception(f"Node.js is not installed or not in PATH ({tools['node']['error']})")
+        print(f"✅ Node.js: {tools['node']['version']}")
+        
+        # Check npm, falling back to npx
+        if tools["npm"]["found"]:
+            print(f"✅ npm: {tools['npm']['version']}")
+        elif tools["npx"]["found"]:
+            print(f"✅ npx available: {tools['npx']['version']}")
+        else:
+            raise Exception("npm/npx is not installed or not in PATH")
         
         print("✅ All prerequisites met!")
     
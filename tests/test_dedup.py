@@ -0,0 +1,26 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+from dedup import case_text, deduplicate
+
+STEPS = ["Open the login page", "Enter valid credentials", "Submit the form", "Verify the dashboard is shown"]
+
+
+def test_cases_without_text_are_kept():
+    cases = [{"id": "TC001", "title": None}, {"id": "TC002"}, {"id": "TC003", "steps": []}]
+    kept, clusters = deduplicate(cases)
+    assert [case["id"] for case in kept] == ["TC001", "TC002", "TC003"]
+    assert clusters == []
+
+
+def test_name_and_test_steps_are_compared():
+    cases = [
+        {"id": "TC001", "name": "Login with valid credentials", "test_steps": STEPS},
+        {"id": "TC002", "name": "Login with valid credentials", "test_steps": STEPS},
+        {"id": "TC003", "name": "Reset a forgotten password", "test_steps": ["Open the reset page"]},
+    ]
+    kept, clusters = deduplicate(cases)
+    assert [case["id"] for case in kept] == ["TC001", "TC003"]
+    assert clusters[0]["merged"] == ["TC002"]
+    assert case_text({"title": None, "steps": None}) == ""
@@ -0,0 +1,28 @@
+import os
+import sys
+import json
+import shutil
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "scripts"))
+import generate_testcases
+
+
+def test_failed_extraction_keeps_existing_scripts(tmp_path, monkeypatch):
+    shutil.copy(os.path.join(ROOT, "recruter_transcript.txt"), tmp_path / "transcript.txt")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("QAGENIE_NO_CACHE", "1")
+    args = ["--backend", "mock", "--incremental", "--transcript", "transcript.txt", "--max-retries", "0"]
+    generate_testcases.main(args)
+    specs = set(os.listdir("test"))
+    with open("testcases/manifest.json", "r", encoding="utf-8") as f:
+        flows = json.load(f)["flows"]
+    assert specs and flows
+
+    # Every request fails: the fallback must not prune flows it never saw
+    monkeypatch.setenv("QAGENIE_MOCK_FAILURE_RATE", "1")
+    monkeypatch.setattr(generate_testcases, "RETRY_MAX_ATTEMPTS", 1)
+    generate_testcases.main(args)
+    assert specs <= set(os.listdir("test"))
+    with open("testcases/manifest.json", "r", encoding="utf-8") as f:
+        assert json.load(f)["flows"].keys() == flows.keys()
@@ -0,0 +1,23 @@
+import os
+import sys
+import json
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+from generation_manifest import GenerationManifest
+
+
+def test_outdated_manifest_keeps_slots_and_prunes_old_scripts(tmp_path):
+    path = tmp_path / "manifest.json"
+    path.write_text(json.dumps({
+        "version": 1,
+        "slots": {"login": 3},
+        "flows": {"abc": {"slot": 3, "flow": {"name": "Login"}, "cases": [{"id": "TC0301"}],
+                          "scripts": [{"filename": "TC0301_Login.spec.ts"}]}},
+    }))
+    manifest = GenerationManifest(str(path)).load()
+    # Cases with old-style ids are not reused...
+    assert manifest.lookup("abc") is None
+    # ...but the flow keeps its slot, and its old script is reported for removal
+    assert manifest.slot_for({"name": "Login"}) == 3
+    manifest.complete = True
+    assert manifest.prune() == {"TC0301_Login.spec.ts"}
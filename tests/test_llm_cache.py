@@ -0,0 +1,50 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+import llm_cache
+from llm_cache import LLMCache
+
+
+def test_hits_do_not_extend_ttl(tmp_path):
+    cache = LLMCache(str(tmp_path), ttl_seconds=60)
+    cache.set("a", "answer")
+    path = tmp_path / "a.json"
+    written = time.time() - 30
+    os.utime(path, (written, written))
+
+    assert cache.get("a") == "answer"
+    assert abs(path.stat().st_mtime - written) < 1
+
+    old = time.time() - 120
+    os.utime(path, (time.time(), old))
+    cache.evict()
+    assert not path.exists()
+    assert cache.get("a") is None
+
+
+def test_writes_evict_least_recently_used_without_rescanning(tmp_path, monkeypatch):
+    cache = LLMCache(str(tmp_path), max_bytes=10_000)
+    scans = []
+    evict = cache.evict
+    monkeypatch.setattr(cache, "evict", lambda: (scans.append(1), evict()))
+    for index in range(5):
+        cache.set(f"k{index}", "x" * 10)
+    assert len(scans) == 1
+
+    now = time.time()
+    for index in range(5):
+        os.utime(tmp_path / f"k{index}.json", (now - 100 + index, now))
+    os.utime(tmp_path / "k0.json", (now, now))
+    cache.max_bytes = sum(path.stat().st_size for path in tmp_path.glob("*.json")) + 10
+    cache.set("big", "y" * 40)
+    assert len(scans) == 2
+    assert (tmp_path / "k0.json").exists() and (tmp_path / "big.json").exists()
+    assert not (tmp_path / "k1.json").exists()
+
+    monkeypatch.setattr(llm_cache, "EVICT_INTERVAL", 3)
+    cache.max_bytes = 10_000
+    for index in range(3):
+        cache.set(f"n{index}", "z")
+    assert len(scans) == 3
@@ -0,0 +1,82 @@
+import os
+import sys
+import sqlite3
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from results_db import ResultsDB, test_key as key_for
+
+
+def playwright_run(outcomes, start_time):
+    """Playwright JSON reporter output with one spec run under several projects"""
+    return {
+        "stats": {"startTime": start_time},
+        "suites": [{
+            "title": "suite",
+            "specs": [{
+                "title": "TC001: Login",
+                "tests": [
+                    {"projectName": project, "results": [{"status": status, "duration": 100}]}
+                    for project, status in outcomes.items()
+                ],
+            }],
+        }],
+    }
+
+
+def ingest_runs(db, count=6):
+    for i in range(count):
+        db.ingest(playwright_run({"chromium": "passed", "webkit": "failed"}, f"2026-01-0{i + 1}T00:00:00"))
+
+
+def test_projects_are_separate_series(tmp_path):
+    with ResultsDB(str(tmp_path / "history.db")) as db:
+        ingest_runs(db)
+        for window in (0, 50):
+            # Consistently failing on one browser is broken, not flaky
+            assert db.flaky_tests(window, min_runs=2) == []
+            rates = {row["project"]: row for row in db.pass_rates(window)}
+            assert rates["chromium"]["runs"] == 6 and rates["chromium"]["pass_rate"] == 100.0
+            assert rates["webkit"]["runs"] == 6 and rates["webkit"]["pass_rate"] == 0.0
+        assert [row["project"] for row in db.test_history("TC001")][:2] == ["chromium", "webkit"]
+
+
+def test_selection_history_combines_projects_per_run(tmp_path):
+    with ResultsDB(str(tmp_path / "history.db")) as db:
+        ingest_runs(db)
+        for window in (0, 50):
+            history = db.selection_history(window)["TC001"]
+            assert history["runs"] == 6
+            assert history["failures"] == 6
+            assert history["mean_duration_s"] == 0.2
+
+
+def test_flaky_project_is_detected(tmp_path):
+    with ResultsDB(str(tmp_path / "history.db")) as db:
+        for i in range(6):
+            status = "passed" if i % 2 else "failed"
+            db.ingest(playwright_run({"chromium": "passed", "webkit": status}, f"2026-01-0{i + 1}T00:00:00"))
+        flaky = db.flaky_tests(0, min_runs=2)
+        assert [(row["project"], row["runs"], row["flips"]) for row in flaky] == [("webkit", 6, 5)]
+
+
+def test_old_database_is_migrated(tmp_path):
+    path = str(tmp_path / "history.db")
+    with ResultsDB(path) as db:
+        ingest_runs(db, 2)
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        "DROP TABLE test_stats;"
+        "CREATE TABLE test_stats (test_key TEXT PRIMARY KEY, name TEXT NOT NULL, runs INTEGER NOT NULL,"
+        " passes INTEGER NOT NULL, flips INTEGER NOT NULL, last_passed INTEGER, n_d INTEGER NOT NULL,"
+        " sum_d REAL NOT NULL, sum_x REAL NOT NULL, sum_xx REAL NOT NULL, sum_xd REAL NOT NULL) WITHOUT ROWID;"
+    )
+    conn.close()
+    with ResultsDB(path) as db:
+        rates = {row["project"]: row["runs"] for row in db.pass_rates(0)}
+        assert rates == {"chromium": 2, "webkit": 2}
+
+
+def test_flow_scoped_case_ids_are_keys():
+    assert key_for("TC01-02: Login") == "TC01-02"
+    assert key_for("suite › tc12-100 Signup") == "TC12-100"
+    assert key_for("TC001: Login") == "TC001"
@@ -0,0 +1,45 @@
+import os
+import sys
+import time
+import signal
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from runner_core import Check, execute
+
+requires_itimer = pytest.mark.skipif(not hasattr(signal, "setitimer"), reason="needs POSIX interval timers")
+
+
+def stubborn_check():
+    """Swallows every Exception, so only a BaseException can stop it"""
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        try:
+            time.sleep(0.01)
+        except Exception:
+            pass
+    return True
+
+
+@requires_itimer
+def test_timeout_is_not_swallowed_by_the_check():
+    previous = signal.getsignal(signal.SIGALRM)
+    result = execute(Check("stubborn", stubborn_check), timeout=0.1)
+    assert result["status"] == "TIMEOUT"
+    assert result["duration"] < 1000
+    # The timer is disarmed and the previous handler restored
+    assert signal.getitimer(signal.ITIMER_REAL) == (0.0, 0.0)
+    assert signal.getsignal(signal.SIGALRM) is previous
+
+
+@requires_itimer
+def test_timer_is_disarmed_after_an_error():
+    def broken():
+        raise ValueError("boom")
+
+    previous = signal.getsignal(signal.SIGALRM)
+    result = execute(Check("broken", broken), timeout=5)
+    assert result["status"] == "ERROR" and "ValueError: boom" in result["error"]
+    assert signal.getitimer(signal.ITIMER_REAL) == (0.0, 0.0)
+    assert signal.getsignal(signal.SIGALRM) is previous
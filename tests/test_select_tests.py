@@ -0,0 +1,22 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from select_tests import MIN_DURATION, select
+
+
+def test_sub_millisecond_durations_are_clamped():
+    history = {
+        "TC001": {"runs": 4, "failures": 0, "mean_duration_s": 0.0002},
+        "TC002": {"runs": 4, "failures": 1, "mean_duration_s": 0.0},
+    }
+    result = select([{"id": "TC001"}, {"id": "TC002"}], history, budget_s=1)
+    assert [item["id"] for item in result["selected"]] == ["TC002", "TC001"]
+    assert all(item["duration_s"] == MIN_DURATION for item in result["selected"])
+
+
+def test_short_tests_are_not_rounded_up_to_whole_seconds():
+    history = {f"TC{i:03d}": {"runs": 4, "failures": 1, "mean_duration_s": 0.1} for i in range(50)}
+    result = select([{"id": f"TC{i:03d}"} for i in range(50)], history, budget_s=2)
+    # With one-second units only 2 tests would fit
+    assert len(result["selected"]) == 20
@@ -0,0 +1,60 @@
+import os
+import re
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+from step_rules import StepRules
+
+
+def test_input_as_a_noun_is_not_a_fill():
+    rules = StepRules()
+    assert rules.translate("Test with invalid input data") == "// Test with invalid input data"
+    assert rules.translate("Verify input validation") == (
+        "await expect(page.locator('text=input validation').first()).toBeVisible();"
+    )
+
+
+def test_input_as_a_verb_is_a_fill():
+    rules = StepRules()
+    assert rules.translate("Input 'bob' into the Username field") == (
+        "await page.fill('role=textbox[name=\"Username\" i]', 'bob');"
+    )
+
+
+def test_press_key():
+    rules = StepRules()
+    assert rules.translate("Press Enter") == "await page.keyboard.press('Enter');"
+    assert rules.translate("User presses the Escape key") == "await page.keyboard.press('Escape');"
+    assert rules.translate("Press arrow down") == "await page.keyboard.press('ArrowDown');"
+    # A button is still clicked, even when it is named like a key
+    assert rules.translate("Press the Submit button") == "await page.click('role=button[name=\"Submit\" i]');"
+    assert rules.translate("Press Delete button") == "await page.click('role=button[name=\"Delete\" i]');"
+
+
+def test_leading_prepositions_are_stripped_from_targets():
+    rules = StepRules()
+    assert rules.translate("Type for search term") == "await page.fill('role=textbox[name=\"search term\" i]', 'test data');"
+    assert rules.translate("Click on the Login button") == "await page.click('role=button[name=\"Login\" i]');"
+    assert rules.translate("Enter 'qa' in the Search box") == "await page.fill('role=textbox[name=\"Search\" i]', 'qa');"
+
+
+def test_keyword_dispatch_matches_trying_every_rule():
+    rules = StepRules()
+    steps = [
+        "Navigate to /login", "User goes to the pricing page", "Open https://example.com", "Press Enter",
+        "Hit the Escape key", "Tap the Menu icon", "Clicked on Save", "Input 'x' into the Name field",
+        "Fill in the Email field", "User is redirected to the dashboard", "Lands on the home page",
+        "Check that the Profile heading is shown", "Wait for the page to load", "Observe the spinner",
+        "Test with invalid input data", "Verify user can enter email",
+    ]
+    patterns = [re.compile(rule["pattern"], re.IGNORECASE | re.DOTALL) for rule in rules.rules]
+    for step in steps:
+        expected = next((rule["name"] for rule, pattern in zip(rules.rules, patterns) if pattern.search(step)), None)
+        found = rules.match(step)
+        assert (found["rule"]["name"] if found else None) == expected, step
+
+
+def test_rules_without_keywords_are_always_tried():
+    custom = {"name": "upload", "pattern": r"\bupload\s+(?P<file>\S+)", "template": "// upload {file:raw}"}
+    rules = StepRules([custom])
+    assert rules.translate("Then upload resume.pdf") == "// upload resume.pdf"
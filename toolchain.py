@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Toolchain Probe
+Finds node, npm and npx concurrently, caching versions between invocations
+"""
+
+import os
+import sys
+import json
+import shutil
+import hashlib
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Sequence
+
+DEFAULT_CACHE_PATH = ".qagenie_cache/toolchain.json"
+DEFAULT_TOOLS = ("node", "npm", "npx")
+PROBE_TIMEOUT = 10
+
+
+def resolve(command: str) -> Optional[str]:
+    """Absolute path of a command via PATH lookup (PATHEXT-aware on Windows), or None"""
+    for variant in (command, f"{command}.cmd", f"{command}.exe"):
+        path = shutil.which(variant)
+        if path:
+            return path
+    return None
+
+
+def _binary_key(path: str) -> Optional[str]:
+    """Identity of the resolved binary: changes when it is upgraded or replaced"""
+    try:
+        stat = os.stat(path)  # follows symlinks, e.g. npm -> npm-cli.js
+    except OSError:
+        return None
+    return hashlib.sha256(f"{path}:{os.path.realpath(path)}:{stat.st_mtime_ns}:{stat.st_size}".encode()).hexdigest()
+
+
+def probe(command: str, timeout: float = PROBE_TIMEOUT) -> Dict[str, Any]:
+    """Run `<command> --version` if the command is on PATH; never spawns for a missing binary"""
+    path = resolve(command)
+    if path is None:
+        return {"found": False, "path": None, "version": None, "error": "not found in PATH"}
+    try:
+        result = subprocess.run([path, "--version"], capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return {"found": False, "path": path, "version": None, "error": f"timed out after {timeout}s"}
+    except OSError as e:
+        return {"found": False, "path": path, "version": None, "error": str(e)}
+    if result.returncode != 0:
+        return {"found": False, "path": path, "version": None,
+                "error": (result.stderr or result.stdout).strip() or f"exit code {result.returncode}"}
+    return {"found": True, "path": path, "version": result.stdout.strip(), "error": None}
+
+
+def probe_all(commands: Sequence[str] = DEFAULT_TOOLS, cache_path: str = DEFAULT_CACHE_PATH,
+              refresh: bool = False, timeout: float = PROBE_TIMEOUT) -> Dict[str, Dict[str, Any]]:
+    """Probe every command at once; a cold check costs the slowest probe, not the sum.
+
+    Successful probes are cached per command and reused while PATH resolves
+    the command to the same, unmodified binary, so a warm check only does
+    PATH lookups and stats. Failures are never cached.
+    """
+    cache: Dict[str, Any] = {}
+    if not refresh:
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            cache = {}
+
+    results: Dict[str, Dict[str, Any]] = {}
+    stale = []
+    for command in commands:
+        path = resolve(command)
+        entry = cache.get(command)
+        if path is not None and entry and entry.get("path") == path and entry.get("key") == _binary_key(path):
+            results[command] = entry["result"]
+        else:
+            stale.append(command)
+
+    if stale:
+        with ThreadPoolExecutor(max_workers=len(stale)) as pool:
+            for command, result in zip(stale, pool.map(lambda c: probe(c, timeout), stale)):
+                results[command] = result
+                if result["found"]:
+                    cache[command] = {"path": result["path"], "key": _binary_key(result["path"]), "result": result}
+                else:
+                    cache.pop(command, None)
+        try:
+            os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+            tmp_path = f"{cache_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(cache, f, indent=2)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass  # Results are still correct, just not cached
+    return {command: results[command] for command in commands}
+
+
+if __name__ == "__main__":
+    refresh = "--refresh" in sys.argv[1:]
+    tools = [arg for arg in sys.argv[1:] if not arg.startswith("--")] or DEFAULT_TOOLS
+    found = probe_all(tools, refresh=refresh)
+    for name, info in found.items():
+        print(f"✅ {name} {info['version']} ({info['path']})" if info["found"] else f"❌ {name}: {info['error']}")
+    sys.exit(0 if all(info["found"] for info in found.values()) else 1)